@@ -67,6 +67,20 @@ class Config:
             return config_url
         return DEFAULT_BASE_URL
 
+    def api_url_for(self, base_url: str) -> str:
+        """Resolve the REST API root for the site the tests actually run against.
+
+        Priority: API_URL env > config api_url (only when base_url is the configured
+        one) > ``{base_url}/services/bank``.
+        """
+        url = os.environ.get("API_URL")
+        if url:
+            return url
+        config_url = self.config.get("api_url")
+        if isinstance(config_url, str) and config_url and base_url == self.config.get("base_url"):
+            return config_url
+        return f"{base_url.rstrip('/')}/services/bank"
+
     def __getattr__(self, name: str) -> Any:
         """Allow accessing config values as attributes."""
         if name == "base_url":
@@ -90,8 +104,8 @@ def pytest_addoption(parser: Any) -> None:
         "--env",
         action="store",
         default="dev",
-        choices=["dev", "stage", "prod"],
-        help="Environment to run tests against (dev, stage, prod)",
+        choices=["dev", "stage", "prod", "local"],
+        help="Environment to run tests against (dev, stage, prod, local emulator)",
     )
 
 
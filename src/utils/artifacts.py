@@ -0,0 +1,299 @@
+"""Failure artifact capture policy: video, Playwright traces and screenshots.
+
+Recording full-viewport video for every context costs browser CPU and fills
+``test-results`` with clips nobody watches. ``--artifact-policy`` decides per
+test attempt what is captured and what is kept:
+
+* ``off``: nothing is captured.
+* ``on-failure``: everything is recorded; artifacts are kept only when the test
+  failed. Videos of passing tests are recorded to a scratch directory and
+  deleted, traces are stopped without being written.
+* ``on-first-retry``: nothing is captured on the first attempt; the first
+  pytest-rerunfailures retry is recorded and kept. Passing tests never pay the
+  recording cost.
+* ``always``: everything is recorded and kept.
+
+Screenshots are taken when the page closes, so they cost nothing up front: every
+policy but ``off`` takes one for a failed attempt, and ``always`` for every test.
+
+The terminal summary reports the disk and browser CPU time the policy saved.
+CPU is measured per test over the browser process tree, comparing tests that
+recorded against tests that did not, so it needs both kinds in one run.
+"""
+import logging
+import re
+import shutil
+import tempfile
+import time
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Any, Dict, Generator, Optional, Tuple
+
+import psutil
+import pytest
+from _pytest.config import Config as PytestConfig
+from _pytest.config.argparsing import Parser
+from _pytest.nodes import Item, Node
+from _pytest.terminal import TerminalReporter
+from playwright.sync_api import BrowserContext, Page
+
+from src.utils.browser_server import tree_cpu_seconds
+from src.utils.context_pool import node_failed
+from src.utils.xdist_stats import collect, publish, summary_section
+
+logger = logging.getLogger("parabank")
+
+ARTIFACT_POLICIES = ["off", "on-failure", "on-first-retry", "always"]
+DEFAULT_ARTIFACT_POLICY = "on-failure"
+
+
+@dataclass
+class CaptureStats:
+    """What this process recorded, kept and threw away."""
+
+    recorded_tests: int = 0
+    unrecorded_tests: int = 0
+    kept_artifacts: int = 0
+    discarded_videos: int = 0
+    discarded_traces: int = 0
+    discarded_bytes: int = 0
+    # Browser CPU seconds and wall seconds, split by whether the test recorded
+    recorded_cpu: float = 0.0
+    recorded_wall: float = 0.0
+    unrecorded_cpu: float = 0.0
+    unrecorded_wall: float = 0.0
+
+    def merge(self, data: Dict[str, Any]) -> None:
+        for item in fields(self):
+            setattr(self, item.name, getattr(self, item.name) + data.get(item.name, 0))
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    def cpu_saved(self) -> Optional[float]:
+        """Estimated browser CPU seconds saved by the tests that did not record."""
+        if not (self.recorded_wall and self.unrecorded_wall):
+            return None
+        extra_rate = self.recorded_cpu / self.recorded_wall - (
+            self.unrecorded_cpu / self.unrecorded_wall
+        )
+        return max(extra_rate, 0.0) * self.unrecorded_wall
+
+
+CAPTURE_STATS = CaptureStats()
+_scratch_dir: Optional[Path] = None
+# (records, browser CPU seconds, monotonic time) at the start of the running attempt
+_attempt_started: Optional[Tuple[bool, float, float]] = None
+
+
+def artifact_policy(config: PytestConfig) -> str:
+    """Return the active ``--artifact-policy``."""
+    return str(config.getoption("--artifact-policy", DEFAULT_ARTIFACT_POLICY))
+
+
+def _attempt(item: Node) -> int:
+    # pytest-rerunfailures counts attempts on the item (1 = first run)
+    return int(getattr(item, "execution_count", 1) or 1)
+
+
+def should_record(item: Node) -> bool:
+    """Return True if this attempt of ``item`` records video and a trace."""
+    policy = artifact_policy(item.config)
+    if policy == "on-first-retry":
+        return _attempt(item) == 2
+    return policy != "off"
+
+
+def should_keep(item: Node, failed: Optional[bool] = None) -> bool:
+    """Return True if this attempt's artifacts are worth keeping.
+
+    ``failed`` stands in for the test reports of a node that has none, such as the
+    class of a class-scoped fixture.
+    """
+    if not should_record(item):
+        return False
+    policy = artifact_policy(item.config)
+    if policy == "on-failure":
+        return node_failed(item) if failed is None else failed
+    return True
+
+
+def artifact_name(item: Node) -> str:
+    """File-name stem for ``item``'s artifacts; retries get their own files."""
+    name = re.sub(r"[^\w.-]+", "_", item.name).strip("_")
+    attempt = _attempt(item)
+    return f"{name}-retry{attempt - 1}" if attempt > 1 else name
+
+
+def _scratch() -> Path:
+    """Per-process directory outside test-results where videos are recorded."""
+    global _scratch_dir  # pylint: disable=global-statement
+    if _scratch_dir is None:
+        _scratch_dir = Path(tempfile.mkdtemp(prefix="parabank-video-"))
+    return _scratch_dir
+
+
+def video_context_args(item: Node, size: Dict[str, int]) -> Dict[str, Any]:
+    """``new_context`` arguments that record video for this attempt, if it records."""
+    if not should_record(item):
+        return {}
+    return {"record_video_dir": str(_scratch()), "record_video_size": size}
+
+
+def start_trace(context: BrowserContext, item: Node) -> bool:
+    """Start a Playwright trace on ``context`` if this attempt records."""
+    if not should_record(item):
+        return False
+    try:
+        context.tracing.start(screenshots=True, snapshots=True)
+    except Exception as e:
+        logger.debug(f"Could not start tracing: {e}")
+        return False
+    return True
+
+
+def finish_trace(
+    context: BrowserContext, item: Node, results_dir: Path, failed: Optional[bool] = None
+) -> None:
+    """Write the trace to ``results_dir/traces`` or drop it unwritten."""
+    try:
+        if should_keep(item, failed):
+            trace_dir = results_dir / "traces"
+            trace_dir.mkdir(parents=True, exist_ok=True)
+            trace_path = trace_dir / f"{artifact_name(item)}.zip"
+            context.tracing.stop(path=str(trace_path))
+            CAPTURE_STATS.kept_artifacts += 1
+            logger.info(f"Trace saved to: {trace_path}")
+        else:
+            context.tracing.stop()
+            CAPTURE_STATS.discarded_traces += 1
+    except Exception as e:
+        logger.debug(f"Could not stop tracing: {e}")
+
+
+def save_screenshot(
+    page: Page, item: Node, results_dir: Path, failed: Optional[bool] = None
+) -> None:
+    """Screenshot ``page`` before it closes: failed attempts, or every test with ``always``."""
+    policy = artifact_policy(item.config)
+    if failed is None:
+        failed = node_failed(item)
+    wanted = policy == "always" or (policy != "off" and failed)
+    if not wanted:
+        return
+    screenshot_dir = results_dir / "screenshots"
+    screenshot_dir.mkdir(parents=True, exist_ok=True)
+    screenshot_path = screenshot_dir / f"{artifact_name(item)}.png"
+    try:
+        page.screenshot(path=str(screenshot_path))
+    except Exception as e:
+        logger.debug(f"Could not take screenshot: {e}")
+        return
+    CAPTURE_STATS.kept_artifacts += 1
+    logger.info(f"Screenshot saved to: {screenshot_path}")
+
+
+def finish_video(page: Page, item: Node, results_dir: Path, failed: Optional[bool] = None) -> None:
+    """After ``page`` is closed, move its video to ``results_dir/videos`` or delete it."""
+    video = page.video
+    if video is None:
+        return
+    try:
+        if should_keep(item, failed):
+            video_dir = results_dir / "videos"
+            video_dir.mkdir(parents=True, exist_ok=True)
+            video_path = video_dir / f"{artifact_name(item)}.webm"
+            video.save_as(str(video_path))
+            CAPTURE_STATS.kept_artifacts += 1
+            logger.info(f"Video saved to: {video_path}")
+        else:
+            path = Path(video.path())
+            CAPTURE_STATS.discarded_bytes += path.stat().st_size if path.exists() else 0
+            CAPTURE_STATS.discarded_videos += 1
+        video.delete()
+    except Exception as e:
+        logger.debug(f"Could not finish video: {e}")
+
+
+def _browser_cpu_seconds() -> float:
+    """CPU time used so far by this process's children (Playwright driver and browsers)."""
+    return tree_cpu_seconds(psutil.Process(), include_self=False)
+
+
+def pytest_addoption(parser: Parser) -> None:
+    """Register the artifact capture option."""
+    group = parser.getgroup("parabank-artifacts", "Failure artifacts")
+    group.addoption(
+        "--artifact-policy",
+        action="store",
+        default=DEFAULT_ARTIFACT_POLICY,
+        choices=ARTIFACT_POLICIES,
+        help="When to capture video, traces and screenshots "
+        f"(default: {DEFAULT_ARTIFACT_POLICY})",
+    )
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_setup(item: Item) -> None:
+    """Start measuring this attempt's browser CPU.
+
+    pytest-rerunfailures runs every attempt inside one ``pytest_runtest_protocol``
+    and counts it up before the attempt's setup, so this is where it is known.
+    """
+    global _attempt_started  # pylint: disable=global-statement
+    _attempt_started = (should_record(item), _browser_cpu_seconds(), time.monotonic())
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_teardown(item: Item, nextitem: Optional[Item]) -> Generator[None, None, None]:
+    """Charge the attempt's browser CPU, fixture teardown included, by whether it recorded."""
+    global _attempt_started  # pylint: disable=global-statement
+    yield
+    if _attempt_started is None:
+        return
+    recording, cpu_before, started = _attempt_started
+    _attempt_started = None
+    cpu = max(_browser_cpu_seconds() - cpu_before, 0.0)
+    wall = time.monotonic() - started
+    if recording:
+        CAPTURE_STATS.recorded_tests += 1
+        CAPTURE_STATS.recorded_cpu += cpu
+        CAPTURE_STATS.recorded_wall += wall
+    else:
+        CAPTURE_STATS.unrecorded_tests += 1
+        CAPTURE_STATS.unrecorded_cpu += cpu
+        CAPTURE_STATS.unrecorded_wall += wall
+
+
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    """Remove the scratch video directory and hand the counters to the controller."""
+    if _scratch_dir is not None:
+        shutil.rmtree(_scratch_dir, ignore_errors=True)
+    publish(session.config, "artifacts", CAPTURE_STATS.as_dict())
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node: Any, error: Any) -> None:
+    """Merge a finished worker's capture counters (controller side)."""
+    data = collect(node, "artifacts")
+    if data:
+        CAPTURE_STATS.merge(data)
+
+
+def pytest_terminal_summary(terminalreporter: TerminalReporter, config: PytestConfig) -> None:
+    """Report what the capture policy recorded, kept and saved."""
+    stats = CAPTURE_STATS
+    if not (stats.recorded_tests or stats.unrecorded_tests):
+        return
+    if not summary_section(terminalreporter, config, "failure artifacts"):
+        return
+    cpu_saved = stats.cpu_saved()
+    cpu_text = f"~{cpu_saved:.0f}s browser CPU" if cpu_saved is not None else "CPU n/a"
+    terminalreporter.write_line(
+        f"policy {artifact_policy(config)}: {stats.recorded_tests} attempt(s) recorded, "
+        f"{stats.unrecorded_tests} not recorded; {stats.kept_artifacts} artifact(s) kept"
+    )
+    terminalreporter.write_line(
+        f"saved: {stats.discarded_bytes / 1e6:.1f} MB of video ({stats.discarded_videos} "
+        f"discarded), {stats.discarded_traces} trace(s) never written, {cpu_text}"
+    )
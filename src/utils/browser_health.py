@@ -0,0 +1,192 @@
+"""Per-worker browser health watchdog.
+
+Chromium's memory grows over a long run, and ``MEMORY_USAGE`` in
+``metrics_pusher`` only covers the Python process. After every test that used
+the browser, the watchdog samples the worker's browser process tree (Playwright
+driver and browser) with psutil. It exports the tree's RSS and CPU as
+``browser_tree_rss_bytes`` and ``browser_tree_cpu_percent``, one series per
+worker, and relaunches the browser when:
+
+* it has served ``--browser-recycle-tests`` tests,
+* the tree's RSS is above ``--browser-max-rss`` MB,
+* it crashed or lost its connection.
+
+Relaunches happen between tests, never inside a test class whose class-scoped
+fixtures may still hold contexts of the current browser. The context pool drops
+pooled contexts of the old browser on their next lease. With
+``--shared-browser`` the browser belongs to the controller's server, which has
+its own crash watchdog; workers then only export metrics for their driver.
+"""
+import logging
+import os
+import time
+from typing import Any, Dict, Generator, Optional
+
+import psutil
+import pytest
+from _pytest.config import Config as PytestConfig
+from _pytest.config.argparsing import Parser
+from _pytest.nodes import Item
+from _pytest.terminal import TerminalReporter
+
+from src.utils.browser_server import ManagedBrowser, active_browser, tree_cpu_seconds, tree_rss
+from src.utils.metrics_pusher import BROWSER_RELAUNCHES, BROWSER_TREE_CPU, BROWSER_TREE_RSS
+from src.utils.xdist_stats import collect, publish, summary_section
+
+logger = logging.getLogger("parabank")
+
+DEFAULT_RECYCLE_TESTS = int(os.environ.get("BROWSER_RECYCLE_TESTS", "0"))
+DEFAULT_MAX_RSS_MB = int(os.environ.get("BROWSER_MAX_RSS_MB", "0"))
+RELAUNCH_REASONS = ("tests", "rss", "crash")
+
+
+class BrowserWatchdog:
+    """Samples the browser tree between tests and decides when to relaunch it."""
+
+    def __init__(self, recycle_tests: int = 0, max_rss_mb: int = 0) -> None:
+        self.recycle_tests = recycle_tests
+        self.max_rss = max_rss_mb * 1024 * 1024
+        self.process = psutil.Process()
+        self.tests = 0
+        self.generation = 0
+        self.relaunches: Dict[str, int] = {reason: 0 for reason in RELAUNCH_REASONS}
+        self.peak_rss = 0
+        self._cpu = tree_cpu_seconds(self.process, include_self=False)
+        self._sampled_at = time.monotonic()
+
+    def sample(self) -> int:
+        """Export RSS and CPU of the browser tree; returns the RSS in bytes."""
+        rss = tree_rss(self.process, include_self=False)
+        cpu = tree_cpu_seconds(self.process, include_self=False)
+        now = time.monotonic()
+        elapsed = now - self._sampled_at
+        # A relaunched tree starts from zero CPU; skip that interval
+        if elapsed > 0 and cpu >= self._cpu:
+            BROWSER_TREE_CPU.set(100 * (cpu - self._cpu) / elapsed)
+        BROWSER_TREE_RSS.set(rss)
+        self._cpu, self._sampled_at = cpu, now
+        self.peak_rss = max(self.peak_rss, rss)
+        return rss
+
+    def due(self, managed: ManagedBrowser, rss: int) -> Optional[str]:
+        """The reason the browser needs a relaunch now, or None."""
+        if managed.crashed:
+            return "crash"
+        if managed.shared:
+            return None
+        if self.recycle_tests and self.tests >= self.recycle_tests:
+            return "tests"
+        if self.max_rss and rss > self.max_rss:
+            return "rss"
+        return None
+
+    def check(self, managed: ManagedBrowser, item: Item, nextitem: Optional[Item]) -> None:
+        """Sample after ``item`` and relaunch if a limit was hit and it is safe to."""
+        if managed.generation != self.generation:
+            self.generation, self.tests = managed.generation, 0
+        if "browser" in getattr(item, "fixturenames", ()):
+            self.tests += 1
+        rss = self.sample()
+        reason = self.due(managed, rss)
+        if reason is None or nextitem is None or _shares_class(item, nextitem):
+            return
+        logger.info(
+            f"Browser health: {reason} limit hit after {self.tests} test(s) "
+            f"at {rss / 1e6:.0f} MB"
+        )
+        managed.relaunch(reason)
+        self.relaunches[reason] += 1
+        BROWSER_RELAUNCHES.labels(reason=reason).inc()
+        self.generation, self.tests = managed.generation, 0
+        self.sample()
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"relaunches": self.relaunches, "peak_rss": self.peak_rss}
+
+
+_watchdog: Optional[BrowserWatchdog] = None
+# Controller-side totals merged from the workers
+_relaunch_totals: Dict[str, int] = {reason: 0 for reason in RELAUNCH_REASONS}
+_peak_rss = 0
+
+
+def _shares_class(item: Item, nextitem: Item) -> bool:
+    """True if both tests run in the same class, whose fixtures may hold browser contexts."""
+    cls = item.getparent(pytest.Class)
+    return cls is not None and nextitem.getparent(pytest.Class) is cls
+
+
+def pytest_addoption(parser: Parser) -> None:
+    """Register the browser recycling options."""
+    group = parser.getgroup("parabank-browser-health", "browser health watchdog")
+    group.addoption(
+        "--browser-recycle-tests",
+        action="store",
+        type=int,
+        default=DEFAULT_RECYCLE_TESTS,
+        help="Relaunch a worker's browser after this many tests (default: 0, never)",
+    )
+    group.addoption(
+        "--browser-max-rss",
+        action="store",
+        type=int,
+        default=DEFAULT_MAX_RSS_MB,
+        help="Relaunch a worker's browser once its process tree exceeds this many MB "
+        "(default: 0, no limit)",
+    )
+
+
+def pytest_configure(config: PytestConfig) -> None:
+    """Create the watchdog in every process that runs tests."""
+    global _watchdog  # pylint: disable=global-statement
+    _watchdog = BrowserWatchdog(
+        config.getoption("--browser-recycle-tests"), config.getoption("--browser-max-rss")
+    )
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_teardown(item: Item, nextitem: Optional[Item]) -> Generator[None, None, None]:
+    """Check the browser once the test's fixtures are torn down."""
+    yield
+    managed = active_browser()
+    if _watchdog is None or managed is None:
+        return
+    try:
+        _watchdog.check(managed, item, nextitem)
+    except Exception as e:
+        logger.warning(f"Browser health check failed: {e}")
+
+
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    """Hand the relaunch counters to the controller."""
+    global _peak_rss  # pylint: disable=global-statement
+    if _watchdog is None:
+        return
+    if publish(session.config, "browser_health", _watchdog.as_dict()):
+        return
+    for reason, count in _watchdog.relaunches.items():
+        _relaunch_totals[reason] += count
+    _peak_rss = max(_peak_rss, _watchdog.peak_rss)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node: Any, error: Any) -> None:
+    """Merge a finished worker's relaunch counters (controller side)."""
+    global _peak_rss  # pylint: disable=global-statement
+    data = collect(node, "browser_health")
+    if not data:
+        return
+    for reason, count in data["relaunches"].items():
+        _relaunch_totals[reason] = _relaunch_totals.get(reason, 0) + count
+    _peak_rss = max(_peak_rss, data["peak_rss"])
+
+
+def pytest_terminal_summary(terminalreporter: TerminalReporter, config: PytestConfig) -> None:
+    """Report browser relaunches and the largest browser tree seen."""
+    if not _peak_rss or not summary_section(terminalreporter, config, "browser health"):
+        return
+    reasons = ", ".join(f"{count} {reason}" for reason, count in _relaunch_totals.items())
+    terminalreporter.write_line(
+        f"{sum(_relaunch_totals.values())} relaunch(es) ({reasons}); "
+        f"peak browser tree RSS per worker {_peak_rss / 1e6:.0f} MB"
+    )
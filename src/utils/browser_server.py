@@ -0,0 +1,503 @@
+"""One browser server shared by every xdist worker.
+
+pytest-playwright's ``browser`` fixture launches a browser in every worker: one
+to two seconds of startup and a few hundred MB of RSS each. With
+``--shared-browser`` the controller launches a single browser server before the
+workers start and every worker connects to its websocket endpoint instead.
+Contexts are still created per test on the worker's own connection, so cookies,
+storage and pages stay isolated between tests and between workers.
+
+Python Playwright has no ``BrowserType.launch_server``; the server is started
+through the bundled Node driver's ``launch-server`` command, which is the same
+API. A watchdog thread on the controller relaunches the server when the driver
+process exits or the browser under it is gone, and publishes the new endpoint
+in a small state file. Workers reconnect to it the next time they use the
+browser.
+
+The terminal summary reports startup time and browser memory for both modes, so
+a run with and without the option can be compared.
+"""
+import json
+import logging
+import os
+import subprocess  # nosec B404
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Any, Callable, Dict, Generator, List, Optional
+
+import psutil
+import pytest
+from _pytest.config import Config as PytestConfig
+from _pytest.config.argparsing import Parser
+from _pytest.terminal import TerminalReporter
+from playwright._impl._driver import compute_driver_executable
+from playwright.sync_api import Browser, BrowserType
+
+from config import Config
+from src.utils.xdist_stats import collect, publish, summary_section
+
+logger = logging.getLogger("parabank")
+
+SERVER_START_TIMEOUT = 60.0
+RECONNECT_TIMEOUT = 60.0
+WATCHDOG_INTERVAL = 1.0
+
+
+class BrowserServerError(Exception):
+    """Raised when the shared browser server cannot be started or reached."""
+
+
+@dataclass
+class StartupStats:
+    """Browser startup cost and memory of this process (merged on the controller)."""
+
+    launches: int = 0
+    launch_seconds: float = 0.0
+    connects: int = 0
+    connect_seconds: float = 0.0
+    crashes: int = 0
+    # Summed RSS of browser process trees and of the workers' Playwright drivers
+    browser_rss: int = 0
+    driver_rss: int = 0
+
+    def merge(self, data: Dict[str, Any]) -> None:
+        for item in fields(self):
+            setattr(self, item.name, getattr(self, item.name) + data.get(item.name, 0))
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+STARTUP_STATS = StartupStats()
+_server: Optional["BrowserServer"] = None
+_active: Optional["ManagedBrowser"] = None
+
+
+def tree_rss(process: psutil.Process, include_self: bool = True) -> int:
+    """Summed RSS in bytes of ``process`` and all of its descendants."""
+    members = process.children(recursive=True)
+    if include_self:
+        members.insert(0, process)
+    total = 0
+    for member in members:
+        try:
+            total += member.memory_info().rss
+        except psutil.Error:
+            continue
+    return total
+
+
+def tree_cpu_seconds(process: psutil.Process, include_self: bool = True) -> float:
+    """CPU seconds used so far by ``process`` and all of its descendants."""
+    members = process.children(recursive=True)
+    if include_self:
+        members.insert(0, process)
+    total = 0.0
+    for member in members:
+        try:
+            times = member.cpu_times()
+            total += times.user + times.system
+        except psutil.Error:
+            continue
+    return total
+
+
+def _driver_command() -> List[str]:
+    # (node executable, cli.js) of the driver bundled with the Playwright package
+    return [str(part) for part in compute_driver_executable()]
+
+
+def _write_state(path: Path, state: Dict[str, Any]) -> None:
+    """Replace the state file atomically so workers never read half a file."""
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(state), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _read_state(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        state: Dict[str, Any] = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return state
+
+
+class BrowserServer:
+    """Controller-side browser server with crash detection and relaunch."""
+
+    def __init__(self, browser_name: str, options: Dict[str, Any], workdir: Path) -> None:
+        self.browser_name = browser_name
+        self.options = options
+        self.workdir = workdir
+        self.state_path = workdir / "browser-server.json"
+        self.process: Optional[subprocess.Popen[str]] = None
+        self.generation = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watchdog: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Launch the server and start watching it."""
+        self._launch()
+        self._watchdog = threading.Thread(
+            target=self._watch, name="browser-server-watchdog", daemon=True
+        )
+        self._watchdog.start()
+
+    def _launch(self) -> None:
+        config_path = self.workdir / "launch-server.json"
+        config_path.write_text(json.dumps(self.options), encoding="utf-8")
+        stderr_path = self.workdir / "launch-server.log"
+        started = time.monotonic()
+        with open(stderr_path, "w", encoding="utf-8") as stderr:
+            process = subprocess.Popen(  # nosec B603
+                [
+                    *_driver_command(),
+                    "launch-server",
+                    "--browser",
+                    self.browser_name,
+                    "--config",
+                    str(config_path),
+                ],
+                stdout=subprocess.PIPE,
+                stderr=stderr,
+                text=True,
+            )
+        assert process.stdout is not None  # nosec B101
+        # readline() blocks; killing the process on timeout makes it return ""
+        timer = threading.Timer(SERVER_START_TIMEOUT, process.kill)
+        timer.start()
+        try:
+            endpoint = process.stdout.readline().strip()
+        finally:
+            timer.cancel()
+        if not endpoint.startswith("ws"):
+            self._kill(process)
+            output = stderr_path.read_text(encoding="utf-8").splitlines()
+            detail = next((line for line in output if line.startswith("Error")), "no output")
+            raise BrowserServerError(
+                f"{self.browser_name} server did not report an endpoint: {detail}"
+            )
+        elapsed = time.monotonic() - started
+        self.process = process
+        self.generation += 1
+        STARTUP_STATS.launches += 1
+        STARTUP_STATS.launch_seconds += elapsed
+        _write_state(self.state_path, {"ws_endpoint": endpoint, "generation": self.generation})
+        logger.info(
+            f"Shared {self.browser_name} server #{self.generation} up in {elapsed:.2f}s "
+            f"at {endpoint}"
+        )
+
+    def alive(self) -> bool:
+        """True while the driver runs and still has a browser under it."""
+        process = self.process
+        if process is None or process.poll() is not None:
+            return False
+        try:
+            children = psutil.Process(process.pid).children()
+            return any(child.status() != psutil.STATUS_ZOMBIE for child in children)
+        except psutil.Error:
+            return False
+
+    def rss(self) -> int:
+        """RSS of the driver and the browser process tree."""
+        if not self.alive() or self.process is None:
+            return 0
+        try:
+            return tree_rss(psutil.Process(self.process.pid))
+        except psutil.Error:
+            return 0
+
+    def _watch(self) -> None:
+        while not self._stop.wait(WATCHDOG_INTERVAL):
+            with self._lock:
+                if self._stop.is_set() or self.alive():
+                    continue
+                STARTUP_STATS.crashes += 1
+                logger.warning(
+                    f"Shared {self.browser_name} server #{self.generation} died; relaunching"
+                )
+                if self.process is not None:
+                    self._kill(self.process)
+                try:
+                    self._launch()
+                except (BrowserServerError, OSError) as e:
+                    logger.error(f"Could not relaunch the shared browser server: {e}")
+
+    def stop(self) -> None:
+        """Stop the watchdog and shut the server down."""
+        self._stop.set()
+        with self._lock:
+            if self.process is not None:
+                self._kill(self.process)
+                self.process = None
+        self.state_path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _kill(process: "subprocess.Popen[str]") -> None:
+        """Terminate the driver (it closes its browser), killing the tree if it hangs."""
+        try:
+            children = psutil.Process(process.pid).children(recursive=True)
+        except psutil.Error:
+            children = []
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+        for child in children:
+            try:
+                child.kill()
+            except psutil.Error:
+                continue
+
+
+def connect_shared(
+    browser_type: BrowserType,
+    state_path: Path,
+    connect_args: Dict[str, Any],
+    timeout: float = RECONNECT_TIMEOUT,
+) -> Browser:
+    """Connect to the endpoint in the state file, waiting for a relaunch if needed."""
+    started = time.monotonic()
+    deadline = started + timeout
+    last_error = "no endpoint published"
+    while True:
+        state = _read_state(state_path)
+        if state:
+            try:
+                connected = browser_type.connect(state["ws_endpoint"], **connect_args)
+                break
+            except Exception as e:
+                last_error = str(e)
+        if time.monotonic() >= deadline:
+            raise BrowserServerError(f"Could not connect to the shared browser: {last_error}")
+        time.sleep(0.5)
+    STARTUP_STATS.connects += 1
+    STARTUP_STATS.connect_seconds += time.monotonic() - started
+    logger.info(f"Connected to shared browser server #{state['generation']}")
+    return connected
+
+
+class ManagedBrowser:
+    """The worker's session browser, replaceable between tests.
+
+    Attribute access is forwarded to the current ``Browser``, so fixtures and
+    tests use it like the browser pytest-playwright would have launched.
+    ``opener`` launches a local browser or connects to the shared server; a
+    browser that crashed or lost its server is reopened on next use.
+    """
+
+    def __init__(self, opener: Callable[[], Browser], shared: bool) -> None:
+        self._opener = opener
+        self.shared = shared
+        self._browser: Optional[Browser] = None
+        self.generation = 0
+
+    @property
+    def browser(self) -> Browser:
+        """The live browser, reopened if it was lost."""
+        if self._browser is None or not self._browser.is_connected():
+            if self._browser is not None:
+                logger.warning(f"Lost browser #{self.generation}; reopening")
+            self.open()
+        assert self._browser is not None  # nosec B101
+        return self._browser
+
+    @property
+    def crashed(self) -> bool:
+        """True if the browser died or lost its server since it was opened."""
+        return self._browser is not None and not self._browser.is_connected()
+
+    def open(self) -> None:
+        """Launch or connect a new browser."""
+        self._browser = self._opener()
+        self.generation += 1
+
+    def relaunch(self, reason: str) -> None:
+        """Replace the browser; contexts of the old one are closed with it."""
+        logger.info(f"Relaunching browser #{self.generation} ({reason})")
+        self.close()
+        self.open()
+
+    def close(self) -> None:
+        """Close the browser; for a shared server this only disconnects."""
+        if self._browser is not None and self._browser.is_connected():
+            try:
+                self._browser.close()
+            except Exception as e:
+                logger.debug(f"Could not close browser #{self.generation}: {e}")
+        self._browser = None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.browser, name)
+
+
+def shared_browser_enabled(config: PytestConfig) -> bool:
+    """Return True if ``--shared-browser`` was requested."""
+    return bool(config.getoption("--shared-browser", False))
+
+
+def _state_path(config: PytestConfig) -> Optional[Path]:
+    """State file of the running server, as handed to this process."""
+    workerinput = getattr(config, "workerinput", None)
+    if workerinput is not None:
+        path = workerinput.get("browser_server_state")
+        return Path(path) if path else None
+    return _server.state_path if _server is not None else None
+
+
+def _server_options(config: PytestConfig) -> Dict[str, Any]:
+    headless = True
+    try:
+        headless = bool(Config(config.getoption("--env")).get("headless", True))
+    except FileNotFoundError:
+        pass
+    if config.getoption("--headed", False):
+        headless = False
+    return {"headless": headless}
+
+
+def pytest_addoption(parser: Parser) -> None:
+    """Register the shared browser option."""
+    group = parser.getgroup("parabank-browser-server", "shared browser server")
+    group.addoption(
+        "--shared-browser",
+        action="store_true",
+        default=False,
+        help="Launch one browser server on the controller and connect every worker to it",
+    )
+
+
+def pytest_configure(config: PytestConfig) -> None:
+    """Start the shared server on the controller before any worker needs it."""
+    global _server  # pylint: disable=global-statement
+    if hasattr(config, "workerinput") or not shared_browser_enabled(config):
+        return
+    if config.getoption("collectonly"):
+        return
+    browser_names = config.getoption("--browser", None) or ["chromium"]
+    server = BrowserServer(
+        browser_names[0],
+        _server_options(config),
+        Path(tempfile.mkdtemp(prefix="parabank-browser-server-")),
+    )
+    try:
+        server.start()
+    except (BrowserServerError, OSError) as e:
+        logger.warning(f"Shared browser server unavailable, workers launch their own: {e}")
+        return
+    _server = server
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node: Any) -> None:
+    """Hand the server's state file to each worker (controller side)."""
+    if _server is not None:
+        node.workerinput["browser_server_state"] = str(_server.state_path)
+
+
+def active_browser() -> Optional[ManagedBrowser]:
+    """This worker's session browser, once the ``browser`` fixture has opened it."""
+    return _active
+
+
+@pytest.fixture(scope="session")
+def browser(
+    browser_type: BrowserType,
+    launch_browser: Callable[..., Browser],
+    browser_type_launch_args: Dict[str, Any],
+    pytestconfig: PytestConfig,
+) -> Generator[Browser, None, None]:
+    """The worker's browser: a connection to the shared server, or its own launch."""
+    global _active  # pylint: disable=global-statement
+    state_path = _state_path(pytestconfig)
+    opener: Callable[[], Browser]
+    if state_path is None:
+
+        def opener() -> Browser:
+            started = time.monotonic()
+            launched = launch_browser()
+            STARTUP_STATS.launches += 1
+            STARTUP_STATS.launch_seconds += time.monotonic() - started
+            return launched
+
+    else:
+        connect_args = {
+            key: value
+            for key, value in browser_type_launch_args.items()
+            if key in ("slow_mo", "timeout")
+        }
+
+        def opener() -> Browser:
+            return connect_shared(browser_type, state_path, connect_args)
+
+    managed = ManagedBrowser(opener, shared=state_path is not None)
+    managed.open()
+    _active = managed
+    # ManagedBrowser forwards every Browser attribute to the current browser
+    yield managed  # type: ignore[misc]
+    _active = None
+    # Local mode: driver and browser live under this process; shared: only the driver
+    rss = tree_rss(psutil.Process(), include_self=False)
+    if managed.shared:
+        STARTUP_STATS.driver_rss += rss
+    else:
+        STARTUP_STATS.browser_rss += rss
+    managed.close()
+
+
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    """Sample the server's memory (controller) or hand counters over (worker)."""
+    published = publish(session.config, "browser_server", STARTUP_STATS.as_dict())
+    if not published and _server is not None:
+        STARTUP_STATS.browser_rss += _server.rss()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node: Any, error: Any) -> None:
+    """Merge a finished worker's startup counters (controller side)."""
+    data = collect(node, "browser_server")
+    if data:
+        STARTUP_STATS.merge(data)
+
+
+def pytest_unconfigure(config: PytestConfig) -> None:
+    """Shut the shared server down at the end of the run."""
+    global _server  # pylint: disable=global-statement
+    if _server is not None and not hasattr(config, "workerinput"):
+        _server.stop()
+        _server = None
+
+
+def pytest_terminal_summary(terminalreporter: TerminalReporter, config: PytestConfig) -> None:
+    """Report browser startup time and memory for the mode that ran."""
+    stats = STARTUP_STATS
+    if not (stats.launches or stats.connects):
+        return
+    if not summary_section(terminalreporter, config, "browser startup"):
+        return
+    if stats.connects:
+        terminalreporter.write_line(
+            f"shared server: {stats.launches} launch(es) in {stats.launch_seconds:.1f}s, "
+            f"{stats.crashes} crash(es); {stats.connects} worker connection(s) in "
+            f"{stats.connect_seconds:.1f}s"
+        )
+        terminalreporter.write_line(
+            f"memory: {stats.browser_rss / 1e6:.0f} MB browser server, "
+            f"{stats.driver_rss / 1e6:.0f} MB worker drivers"
+        )
+    else:
+        average = stats.launch_seconds / stats.launches
+        terminalreporter.write_line(
+            f"per-worker browsers: {stats.launches} launch(es) in {stats.launch_seconds:.1f}s "
+            f"(avg {average:.2f}s)"
+        )
+        terminalreporter.write_line(
+            f"memory: {stats.browser_rss / 1e6:.0f} MB across worker browsers and drivers"
+        )
@@ -0,0 +1,338 @@
+"""Adaptive concurrency limit for parallel runs against ParaBank.
+
+A fixed ``-n`` either leaves throughput on the table or overloads the shared demo
+server. With ``--adaptive-concurrency`` every test takes a token from a limit
+shared by all xdist workers before it starts and returns it when it finishes.
+The limit follows AIMD (additive increase, multiplicative decrease), the same
+control loop TCP uses for its congestion window:
+
+* every ``ADJUST_EVERY`` healthy responses, if the p95 time to first byte stays
+  under ``--concurrency-p95-ms`` and errors stay rare, the limit grows by one;
+* a 500/429 (or any other 5xx) halves it immediately, and a p95 above target
+  trims it by a fifth. Cuts are at most one per ``DECREASE_HOLDOFF_SECONDS`` so
+  a single burst of errors is not counted several times.
+
+The responses are the ones ``attach_circuit_breaker`` already observes, so any
+page fixture feeds the controller. The live limit is exported as the
+``test_concurrency_limit`` gauge.
+"""
+import logging
+import math
+import os
+import struct
+import time
+from pathlib import Path
+from typing import Any, Dict, Generator, Optional, Tuple
+
+import pytest
+from _pytest.config import Config as PytestConfig
+from _pytest.config.argparsing import Parser
+from _pytest.nodes import Item
+from _pytest.terminal import TerminalReporter
+
+from src.utils.metrics_pusher import CONCURRENCY_LIMIT, CONCURRENCY_WAIT
+from src.utils.shared_state import SharedRecord
+from src.utils.stability import add_response_listener
+from src.utils.xdist_stats import summary_section
+
+logger = logging.getLogger("parabank")
+
+DEFAULT_STATE_PATH = "test-results/concurrency.state"
+DEFAULT_P95_TARGET_MS = 2000.0
+
+_SAMPLE = struct.Struct("<f")
+_HOLDER = struct.Struct("<id")
+
+
+class AdaptiveConcurrency:
+    """AIMD concurrency limit whose tokens are shared by all workers on the host.
+
+    Latency samples and token holders live in the payload of a ``SharedRecord``:
+    a ring of ``WINDOW`` float32 latencies (negative for failed responses)
+    followed by ``MAX_HOLDERS`` ``(pid, acquired_at)`` slots.
+    """
+
+    FIELDS = (
+        ("version", "i"),
+        ("window_pos", "i"),
+        ("window_len", "i"),
+        ("since_adjust", "i"),
+        ("increases", "i"),
+        ("decreases", "i"),
+        ("limit", "d"),
+        ("peak", "d"),
+        ("lowest", "d"),
+        ("last_decrease", "d"),
+        ("waited", "d"),
+    )
+    VERSION = 1
+
+    WINDOW = 100
+    ADJUST_EVERY = 20
+    MAX_ERROR_RATE = 0.02
+    ERROR_DECREASE = 0.5
+    LATENCY_DECREASE = 0.8
+    DECREASE_HOLDOFF_SECONDS = 5.0
+    MAX_HOLDERS = 64
+    POLL_SECONDS = 0.1
+    RECLAIM_EVERY_SECONDS = 5.0
+    # Tokens held longer than this belong to a hung or killed worker and are reclaimed
+    LEASE_SECONDS = 900.0
+
+    def __init__(
+        self,
+        max_limit: int,
+        min_limit: int = 1,
+        p95_target_ms: float = DEFAULT_P95_TARGET_MS,
+        state_path: Optional[Path] = None,
+        fresh: bool = False,
+    ) -> None:
+        self.max_limit = max(1, min(max_limit, self.MAX_HOLDERS))
+        self.min_limit = max(1, min(min_limit, self.max_limit))
+        self.p95_target_ms = p95_target_ms
+        self._shared = SharedRecord(
+            self.FIELDS,
+            self.WINDOW * _SAMPLE.size + self.MAX_HOLDERS * _HOLDER.size,
+            state_path,
+            fresh,
+        )
+        with self._shared.locked() as shared:
+            if shared["version"] != self.VERSION:
+                # Start halfway and let additive increase find the ceiling
+                initial = float(max(self.min_limit, math.ceil(self.max_limit / 2)))
+                shared.update(dict.fromkeys(self._shared.names, 0), version=self.VERSION)
+                shared.update(limit=initial, peak=initial, lowest=initial)
+                shared["payload"] = bytearray(self._shared.payload_size)
+            CONCURRENCY_LIMIT.set(int(shared["limit"]))
+
+    @property
+    def limit(self) -> int:
+        """Number of tests currently allowed to run at once."""
+        with self._shared.locked() as shared:
+            return int(shared["limit"])
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the limit history and the total time tests waited for a token."""
+        with self._shared.locked() as shared:
+            return {
+                "limit": int(shared["limit"]),
+                "peak": int(shared["peak"]),
+                "lowest": int(shared["lowest"]),
+                "increases": shared["increases"],
+                "decreases": shared["decreases"],
+                "waited_seconds": shared["waited"],
+            }
+
+    # --- tokens ---
+
+    def _holder_offset(self, slot: int) -> int:
+        return self.WINDOW * _SAMPLE.size + slot * _HOLDER.size
+
+    def _holders(self, shared: Dict[str, Any]) -> Dict[int, Tuple[int, float]]:
+        """Return ``{slot: (pid, acquired_at)}`` for every held token."""
+        holders: Dict[int, Tuple[int, float]] = {}
+        for slot in range(self.MAX_HOLDERS):
+            pid, since = _HOLDER.unpack_from(shared["payload"], self._holder_offset(slot))
+            if pid:
+                holders[slot] = (pid, since)
+        return holders
+
+    def _reclaim(self, shared: Dict[str, Any], holders: Dict[int, Tuple[int, float]]) -> None:
+        """Free tokens whose worker process is gone or whose lease has expired."""
+        now = time.time()
+        for slot, (pid, since) in list(holders.items()):
+            alive = True
+            try:
+                os.kill(pid, 0)
+            except ProcessLookupError:
+                alive = False
+            except OSError:  # nosec B110 - exists but not ours to signal
+                pass
+            if not alive or now - since > self.LEASE_SECONDS:
+                logger.warning(f"Reclaiming concurrency token held by pid {pid}")
+                _HOLDER.pack_into(shared["payload"], self._holder_offset(slot), 0, 0.0)
+                del holders[slot]
+
+    def acquire(self) -> float:
+        """Block until a token is free, take it and return the seconds waited."""
+        pid = os.getpid()
+        started = time.monotonic()
+        next_reclaim = started
+        while True:
+            with self._shared.locked() as shared:
+                holders = self._holders(shared)
+                if any(holder_pid == pid for holder_pid, _ in holders.values()):
+                    return 0.0
+                if len(holders) >= int(shared["limit"]) and time.monotonic() >= next_reclaim:
+                    self._reclaim(shared, holders)
+                    next_reclaim = time.monotonic() + self.RECLAIM_EVERY_SECONDS
+                if len(holders) < int(shared["limit"]):
+                    slot = next(s for s in range(self.MAX_HOLDERS) if s not in holders)
+                    _HOLDER.pack_into(
+                        shared["payload"], self._holder_offset(slot), pid, time.time()
+                    )
+                    waited = time.monotonic() - started
+                    shared["waited"] += waited
+                    CONCURRENCY_LIMIT.set(int(shared["limit"]))
+                    break
+            time.sleep(self.POLL_SECONDS)
+        if waited > 0.01:
+            CONCURRENCY_WAIT.inc(waited)
+            logger.debug(f"Waited {waited:.2f}s for a concurrency token")
+        return waited
+
+    def release(self) -> None:
+        """Return this process's token, if it holds one."""
+        pid = os.getpid()
+        with self._shared.locked() as shared:
+            for slot, (holder_pid, _) in self._holders(shared).items():
+                if holder_pid == pid:
+                    _HOLDER.pack_into(shared["payload"], self._holder_offset(slot), 0, 0.0)
+
+    # --- feedback ---
+
+    def observe(self, url: str, status: int, latency_ms: float) -> None:
+        """Feed one app response into the window and adjust the limit."""
+        failed = status >= 500 or status == 429
+        with self._shared.locked() as shared:
+            sample = -(latency_ms + 1.0) if failed else latency_ms
+            _SAMPLE.pack_into(shared["payload"], shared["window_pos"] * _SAMPLE.size, sample)
+            shared["window_pos"] = (shared["window_pos"] + 1) % self.WINDOW
+            shared["window_len"] = min(shared["window_len"] + 1, self.WINDOW)
+            if failed:
+                self._decrease(shared, self.ERROR_DECREASE, f"{status} from {url}")
+                return
+            shared["since_adjust"] += 1
+            if shared["since_adjust"] < self.ADJUST_EVERY:
+                return
+            shared["since_adjust"] = 0
+            p95, error_rate = self._window_stats(shared)
+            if error_rate > self.MAX_ERROR_RATE:
+                self._decrease(shared, self.ERROR_DECREASE, f"error rate {error_rate:.0%}")
+            elif p95 > self.p95_target_ms:
+                self._decrease(shared, self.LATENCY_DECREASE, f"p95 {p95:.0f}ms")
+            elif shared["limit"] < self.max_limit:
+                shared["limit"] = min(float(self.max_limit), shared["limit"] + 1.0)
+                shared["peak"] = max(shared["peak"], shared["limit"])
+                shared["increases"] += 1
+                CONCURRENCY_LIMIT.set(int(shared["limit"]))
+                logger.info(f"Concurrency limit raised to {int(shared['limit'])} (p95 {p95:.0f}ms)")
+
+    def _window_stats(self, shared: Dict[str, Any]) -> Tuple[float, float]:
+        samples = [
+            _SAMPLE.unpack_from(shared["payload"], i * _SAMPLE.size)[0]
+            for i in range(shared["window_len"])
+        ]
+        latencies = sorted(abs(sample) for sample in samples)
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        errors = sum(1 for sample in samples if sample < 0)
+        return p95, errors / len(samples)
+
+    def _decrease(self, shared: Dict[str, Any], factor: float, reason: str) -> None:
+        now = time.time()
+        shared["since_adjust"] = 0
+        if now - shared["last_decrease"] < self.DECREASE_HOLDOFF_SECONDS:
+            return
+        previous = int(shared["limit"])
+        shared["limit"] = max(float(self.min_limit), shared["limit"] * factor)
+        shared["lowest"] = min(shared["lowest"], shared["limit"])
+        shared["last_decrease"] = now
+        shared["decreases"] += 1
+        CONCURRENCY_LIMIT.set(int(shared["limit"]))
+        logger.warning(
+            f"Concurrency limit cut from {previous} to {int(shared['limit'])} ({reason})"
+        )
+
+
+_controller: Optional[AdaptiveConcurrency] = None
+
+
+def get_concurrency_controller() -> Optional[AdaptiveConcurrency]:
+    """Return the session's controller, or None when adaptive concurrency is off."""
+    return _controller
+
+
+def _worker_count(config: PytestConfig) -> int:
+    workerinput = getattr(config, "workerinput", None)
+    if workerinput is not None:
+        return int(workerinput.get("workercount", 1))
+    try:
+        return int(config.getoption("numprocesses", 0) or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def pytest_addoption(parser: Parser) -> None:
+    """Register adaptive concurrency command line options."""
+    group = parser.getgroup("parabank-concurrency", "Adaptive concurrency")
+    group.addoption(
+        "--adaptive-concurrency",
+        action="store_true",
+        default=False,
+        help="Gate tests on an AIMD limit driven by ParaBank latency and 500/429 responses",
+    )
+    group.addoption(
+        "--concurrency-min",
+        action="store",
+        type=int,
+        default=1,
+        help="Lowest number of tests allowed to run at once (default: 1)",
+    )
+    group.addoption(
+        "--concurrency-p95-ms",
+        action="store",
+        type=float,
+        default=DEFAULT_P95_TARGET_MS,
+        help=f"p95 time to first byte above which the limit shrinks (default: "
+        f"{DEFAULT_P95_TARGET_MS:.0f})",
+    )
+    group.addoption(
+        "--concurrency-state",
+        action="store",
+        default=DEFAULT_STATE_PATH,
+        help=f"File shared by all workers that holds the limit (default: {DEFAULT_STATE_PATH})",
+    )
+
+
+def pytest_configure(config: PytestConfig) -> None:
+    """Set up the shared controller; the xdist controller process starts it fresh."""
+    global _controller  # pylint: disable=global-statement
+    workers = _worker_count(config)
+    if not config.getoption("--adaptive-concurrency", False) or workers < 2:
+        return
+    _controller = AdaptiveConcurrency(
+        max_limit=workers,
+        min_limit=config.getoption("--concurrency-min"),
+        p95_target_ms=config.getoption("--concurrency-p95-ms"),
+        state_path=Path(config.getoption("--concurrency-state")),
+        fresh=not hasattr(config, "workerinput"),
+    )
+    if hasattr(config, "workerinput"):
+        add_response_listener(_controller.observe)
+
+
+# tryfirst: wait outside the per-test metrics so queueing does not count as test time
+@pytest.hookimpl(tryfirst=True, hookwrapper=True)
+def pytest_runtest_protocol(item: Item, nextitem: Optional[Item]) -> Generator[None, None, None]:
+    """Hold a concurrency token for the whole setup/call/teardown of a test."""
+    controller = _controller
+    if controller is None or not hasattr(item.config, "workerinput"):
+        yield
+        return
+    controller.acquire()
+    try:
+        yield
+    finally:
+        controller.release()
+
+
+def pytest_terminal_summary(terminalreporter: TerminalReporter, config: PytestConfig) -> None:
+    """Report how the limit moved over the run and how long tests queued for tokens."""
+    if _controller is None or not summary_section(terminalreporter, config, "adaptive concurrency"):
+        return
+    stats = _controller.stats()
+    terminalreporter.write_line(
+        f"limit: final {stats['limit']}, peak {stats['peak']}, lowest {stats['lowest']} "
+        f"(max {_controller.max_limit}); {stats['increases']} increase(s), "
+        f"{stats['decreases']} cut(s); tests waited {stats['waited_seconds']:.0f}s for tokens"
+    )
@@ -0,0 +1,228 @@
+"""Worker-scoped pool of warm, pre-authenticated browser contexts.
+
+Creating a context from a storage-state file and then navigating around to prove
+the session is still alive costs several seconds per test. The pool keeps the
+authenticated storage state in memory, hands out contexts that were already
+validated by an earlier test and resets them (pages closed, cookies trimmed to
+the session ones, web storage back to the session's) when the lease is returned.
+A context whose test failed is closed instead of being pooled again.
+"""
+import json
+import logging
+import time
+from typing import Any, Dict, Generator, List, Optional, Set
+from urllib.parse import urlparse
+
+import pytest
+from _pytest.config.argparsing import Parser
+from _pytest.nodes import Item
+from _pytest.runner import CallInfo
+from playwright.sync_api import Browser, BrowserContext, Request, Route
+
+logger = logging.getLogger("parabank")
+
+DEFAULT_MAX_IDLE = 2
+
+# Resets an origin's web storage to the given localStorage items
+_RESET_STORAGE_SCRIPT = """
+(items) => {
+  localStorage.clear();
+  sessionStorage.clear();
+  for (const { name, value } of items) localStorage.setItem(name, value);
+}
+"""
+
+
+def _args_key(context_args: Dict[str, Any]) -> str:
+    """Build a stable key for context args so only compatible contexts are reused."""
+    return json.dumps(
+        {k: v for k, v in context_args.items() if k != "storage_state"},
+        sort_keys=True,
+        default=str,
+    )
+
+
+def _connected(context: BrowserContext) -> bool:
+    browser = context.browser
+    return browser is None or browser.is_connected()
+
+
+class ContextPool:
+    """Leases pre-authenticated ``BrowserContext`` objects to tests of one worker."""
+
+    def __init__(self, browser: Browser, max_idle: int = DEFAULT_MAX_IDLE) -> None:
+        self.browser = browser
+        self.max_idle = max_idle
+        self._idle: Dict[str, List[BrowserContext]] = {}
+        self._keys: Dict[BrowserContext, str] = {}
+        self._dirty: Set[BrowserContext] = set()
+        self._session_cookie_domains: Set[str] = set()
+        # origin -> localStorage items of the session's storage state
+        self._session_storage: Dict[str, List[Dict[str, str]]] = {}
+        self.stats = {"leases": 0, "reused": 0, "created": 0, "discarded": 0}
+        self.lease_seconds = 0.0
+
+    def acquire(self, context_args: Dict[str, Any]) -> BrowserContext:
+        """Return an idle compatible context, creating a new one if none is available."""
+        started = time.perf_counter()
+        key = _args_key(context_args)
+        self.stats["leases"] += 1
+        idle = self._idle.get(key, [])
+        while idle and not _connected(idle[-1]):
+            # The browser was relaunched (or reconnected) since this context was pooled
+            self._close(idle.pop())
+        if idle:
+            context = idle.pop()
+            self.stats["reused"] += 1
+        else:
+            context = self.browser.new_context(**context_args)
+            self._keys[context] = key
+            self._remember_session_cookies(context_args.get("storage_state"))
+            self._watch_logout(context)
+            self.stats["created"] += 1
+        self.lease_seconds += time.perf_counter() - started
+        return context
+
+    def release(self, context: BrowserContext, discard: bool = False) -> None:
+        """Return a leased context, resetting it for the next test or closing it."""
+        key = self._keys.get(context)
+        idle = self._idle.setdefault(key, []) if key else []
+        if discard or key is None or context in self._dirty or len(idle) >= self.max_idle:
+            self._close(context)
+            return
+        try:
+            for page in context.pages:
+                page.close()
+            context.clear_permissions()
+            self._trim_cookies(context)
+            self._reset_storage(context)
+        except Exception as e:
+            logger.debug(f"Context reset failed, discarding pooled context: {e}")
+            self._close(context)
+            return
+        idle.append(context)
+
+    def mark_dirty(self, context: BrowserContext) -> None:
+        """Discard the context on release instead of returning it to the pool."""
+        if context in self._keys:
+            self._dirty.add(context)
+
+    def close(self) -> None:
+        """Close every pooled context and log the pool statistics."""
+        for contexts in self._idle.values():
+            for context in contexts:
+                self._close(context, count=False)
+        self._idle.clear()
+        stats = self.stats
+        logger.info(
+            f"Context pool: {stats['leases']} leases, {stats['reused']} reused, "
+            f"{stats['created']} created, {stats['discarded']} discarded, "
+            f"{self.lease_seconds * 1000:.0f}ms spent leasing"
+        )
+
+    def _close(self, context: BrowserContext, count: bool = True) -> None:
+        self._keys.pop(context, None)
+        self._dirty.discard(context)
+        if count:
+            self.stats["discarded"] += 1
+        try:
+            context.close()
+        except Exception:  # nosec B110
+            pass
+
+    def _watch_logout(self, context: BrowserContext) -> None:
+        """Flag the context once a test ends its server-side session."""
+
+        def _on_request(request: Request) -> None:
+            if urlparse(request.url).path.endswith("/logout.htm"):
+                self._dirty.add(context)
+
+        context.on("request", _on_request)
+
+    def _remember_session_cookies(self, storage_state: Any) -> None:
+        if isinstance(storage_state, dict):
+            for cookie in storage_state.get("cookies", []):
+                self._session_cookie_domains.add(cookie.get("domain", ""))
+            for origin in storage_state.get("origins", []):
+                self._session_storage[origin["origin"]] = list(origin.get("localStorage", []))
+
+    def _trim_cookies(self, context: BrowserContext) -> None:
+        """Drop cookies a test picked up from other domains, keeping the session ones."""
+        if not self._session_cookie_domains:
+            return
+        cookies = context.cookies()
+        kept = [c for c in cookies if c.get("domain") in self._session_cookie_domains]
+        if len(kept) != len(cookies):
+            context.clear_cookies()
+            context.add_cookies(kept)  # type: ignore[arg-type]
+
+    def _reset_storage(self, context: BrowserContext) -> None:
+        """Put every origin's localStorage back to the session's, clearing what tests added.
+
+        sessionStorage lives in the closed pages. Origins are loaded from a stubbed
+        blank document, so the reset never reaches the server.
+        """
+        current = {
+            origin["origin"]: origin.get("localStorage", [])
+            for origin in context.storage_state().get("origins", [])
+        }
+        stale = [
+            origin
+            for origin in set(current) | set(self._session_storage)
+            if current.get(origin, []) != self._session_storage.get(origin, [])
+        ]
+        if not stale:
+            return
+
+        def _blank(route: Route) -> None:
+            route.fulfill(status=200, body="", content_type="text/html")
+
+        page = context.new_page()
+        try:
+            page.route("**/*", _blank)
+            for origin in stale:
+                page.goto(origin)
+                page.evaluate(_RESET_STORAGE_SCRIPT, self._session_storage.get(origin, []))
+        finally:
+            page.close()
+
+
+def pytest_addoption(parser: Parser) -> None:
+    """Register context pool command line options."""
+    group = parser.getgroup("parabank-context-pool", "pre-authenticated context pool")
+    group.addoption(
+        "--no-context-pool",
+        action="store_true",
+        default=False,
+        help="Create a fresh browser context for every test instead of leasing pooled ones",
+    )
+
+
+@pytest.fixture(scope="session")
+def context_pool(
+    browser: Browser, pytestconfig: Any
+) -> Generator[Optional[ContextPool], None, None]:
+    """Worker-scoped context pool; ``None`` when pooling is disabled."""
+    if pytestconfig.getoption("--no-context-pool"):
+        yield None
+        return
+    pool = ContextPool(browser)
+    yield pool
+    pool.close()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item: Item, call: CallInfo[None]) -> Generator[Any, None, None]:
+    """Keep each phase's report on the item (``rep_setup``/``rep_call``) for fixtures."""
+    outcome: Any = yield
+    report = outcome.get_result()
+    setattr(item, f"rep_{report.when}", report)
+
+
+def node_failed(node: Any) -> bool:
+    """Return True if the setup or call phase of ``node`` failed."""
+    for when in ("setup", "call"):
+        report: Optional[Any] = getattr(node, f"rep_{when}", None)
+        if report is not None and report.failed:
+            return True
+    return False
@@ -0,0 +1,188 @@
+"""Batched DOM assertions for read-only UI checks.
+
+Each ``expect(locator).to_be_visible()`` is at least one protocol round trip, and
+a test class that checks twenty static elements usually loads the page twenty
+times as well. ``DomAssertionBatch`` collects the facts for a whole list of
+``DomExpectation`` objects (visibility, enabled/editable state, text, attribute
+values, title and URL) in a single ``page.evaluate`` call and judges them in
+Python. Like ``expect``, it retries the failing ones until ``timeout`` so a page
+that is still settling does not produce false failures.
+
+Selectors are CSS. ``has_text`` mirrors ``Locator.filter(has_text=...)``
+(case-insensitive substring of the text content) and ``first`` mirrors
+``.first``; without it a selector must match exactly one element, as
+Playwright's strict mode requires.
+"""
+import logging
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+from playwright.sync_api import Page
+
+logger = logging.getLogger("parabank")
+
+CHECKS = (
+    "visible",
+    "enabled",
+    "editable",
+    "text",
+    "contains_text",
+    "attribute",
+    "not_empty",
+    "title",
+    "url",
+)
+
+_FACTS_SCRIPT = """
+(specs) => specs.map(({ selector, hasText, attribute }) => {
+  if (!selector) {
+    return { count: 1, title: document.title, url: location.href };
+  }
+  let elements = Array.from(document.querySelectorAll(selector));
+  if (hasText) {
+    const needle = hasText.toLowerCase();
+    elements = elements.filter((e) => (e.textContent || "").toLowerCase().includes(needle));
+  }
+  const el = elements[0];
+  if (!el) {
+    return { count: 0 };
+  }
+  const rect = el.getBoundingClientRect();
+  const style = getComputedStyle(el);
+  const disabled = el.disabled === true || el.getAttribute("aria-disabled") === "true";
+  const isField = ["INPUT", "TEXTAREA", "SELECT"].includes(el.tagName);
+  return {
+    count: elements.length,
+    visible: rect.width > 0 && rect.height > 0 && style.visibility !== "hidden",
+    enabled: !disabled,
+    editable: !disabled && ((isField && !el.readOnly) || el.isContentEditable),
+    text: el.innerText !== undefined ? el.innerText : el.textContent,
+    empty: isField ? !el.value : el.childElementCount === 0 && !(el.textContent || "").trim(),
+    attribute: attribute ? el.getAttribute(attribute) : null,
+  };
+})
+"""
+
+
+def _normalize(text: Optional[str]) -> str:
+    """Collapse whitespace the way Playwright's text assertions do."""
+    return re.sub(r"\s+", " ", text or "").strip()
+
+
+@dataclass(frozen=True)
+class DomExpectation:
+    """One read-only check against the loaded page.
+
+    ``selector`` is None for page-level checks (``title``, ``url``). For ``url``
+    the expected value is a regular expression, in which ``{base_url}`` is
+    replaced by the escaped base URL passed to ``DomAssertionBatch.run``.
+    """
+
+    name: str
+    check: str
+    selector: Optional[str] = None
+    expected: Optional[str] = None
+    attribute: Optional[str] = None
+    has_text: Optional[str] = None
+    first: bool = False
+
+    def __post_init__(self) -> None:
+        if self.check not in CHECKS:
+            raise ValueError(f"Unknown DOM check '{self.check}' for {self.name}")
+
+    def judge(self, facts: Dict[str, Any], base_url: str = "") -> Optional[str]:
+        """Return a failure message, or None if ``facts`` satisfy the expectation."""
+        target = self.selector or "page"
+        count = facts.get("count", 0)
+        if count == 0:
+            return f"{target}: no element matches"
+        if count > 1 and not self.first:
+            return f"{target}: strict mode violation, {count} elements match"
+        if self.check in ("visible", "enabled", "editable"):
+            return None if facts.get(self.check) else f"{target}: not {self.check}"
+        if self.check == "not_empty":
+            return None if not facts.get("empty") else f"{target}: is empty"
+        if self.check == "title":
+            actual = facts.get("title")
+            return None if actual == self.expected else f"title is {actual!r}"
+        if self.check == "url":
+            pattern = (self.expected or "").replace("{base_url}", re.escape(base_url))
+            actual = facts.get("url", "")
+            return None if re.search(pattern, actual) else f"url {actual!r} !~ {pattern!r}"
+        if self.check == "attribute":
+            actual = facts.get("attribute")
+            if actual == self.expected:
+                return None
+            return f"{target}: [{self.attribute}] is {actual!r}, expected {self.expected!r}"
+        actual = _normalize(facts.get("text"))
+        expected = _normalize(self.expected)
+        ok = actual == expected if self.check == "text" else expected in actual
+        return None if ok else f"{target}: text {actual!r}, expected {self.check} {expected!r}"
+
+
+@dataclass
+class DomResult:
+    """Outcome of one expectation after the batch has settled."""
+
+    name: str
+    passed: bool
+    message: str = ""
+
+
+class DomAssertionBatch:
+    """Runs a list of ``DomExpectation`` objects against a page in bulk."""
+
+    def __init__(self, expectations: Sequence[DomExpectation]) -> None:
+        names = [e.name for e in expectations]
+        if len(set(names)) != len(names):
+            raise ValueError("DOM expectation names must be unique")
+        self.expectations = list(expectations)
+        self.results: Dict[str, DomResult] = {}
+        self.round_trips = 0
+
+    def run(
+        self, page: Page, base_url: str = "", timeout: float = 5000, interval: float = 100
+    ) -> Dict[str, DomResult]:
+        """Evaluate every expectation, re-checking the failing ones until ``timeout`` ms."""
+        started = time.monotonic()
+        deadline = started + timeout / 1000
+        pending: List[DomExpectation] = list(self.expectations)
+        failures: Dict[str, str] = {}
+        while pending:
+            specs = [
+                {"selector": e.selector, "hasText": e.has_text, "attribute": e.attribute}
+                for e in pending
+            ]
+            facts: List[Dict[str, Any]] = page.evaluate(_FACTS_SCRIPT, specs)
+            self.round_trips += 1
+            still_failing = []
+            for expectation, fact in zip(pending, facts):
+                message = expectation.judge(fact, base_url)
+                if message is None:
+                    failures.pop(expectation.name, None)
+                else:
+                    failures[expectation.name] = message
+                    still_failing.append(expectation)
+            pending = still_failing
+            if not pending or time.monotonic() >= deadline:
+                break
+            time.sleep(interval / 1000)
+        self.results = {
+            e.name: DomResult(e.name, e.name not in failures, failures.get(e.name, ""))
+            for e in self.expectations
+        }
+        logger.info(
+            f"DOM batch: {len(self.expectations)} expectations, {len(failures)} failed, "
+            f"{self.round_trips} round trip(s) in {(time.monotonic() - started) * 1000:.0f}ms"
+        )
+        return self.results
+
+    def assert_passed(self, name: str) -> None:
+        """Raise ``AssertionError`` with the failure message if ``name`` failed."""
+        result = self.results.get(name)
+        if result is None:
+            raise AssertionError(f"DOM expectation {name!r} was not run")
+        if not result.passed:
+            raise AssertionError(f"{name}: {result.message}")
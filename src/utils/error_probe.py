@@ -0,0 +1,180 @@
+"""Cheap, cached detection of ParaBank's error pages.
+
+``handle_internal_error`` used to make two ``is_visible`` calls and then pull
+the whole serialized DOM with ``page.content()``. It runs after most
+navigations, and failed-test handling and ``user_login`` repeated the same
+scan. ``detect_error_page`` does it in one ``page.evaluate`` that returns an
+``ErrorVerdict``:
+
+* ``internal_error``: a visible error header or ``p.error`` mentions an
+  internal error, or the visible page text says one has occurred.
+* ``error_page``: an ``Error!`` header or title without that text.
+* ``ok``: neither. ``unknown`` means the page could not be evaluated, e.g. it
+  was navigating; it is not cached.
+
+Only visible text counts. ParaBank's form pages ship hidden error templates
+that a scan of the raw HTML matched as well.
+
+The verdict is cached per page until its main frame navigates again, so any
+further checks of the same document are free. Pass ``fresh=True`` when the page
+may have shown an error without navigating (e.g. a failed AJAX form post);
+``handle_internal_error`` always does, since tests call it after such posts. Each
+test's probe time is in the report properties as ``error_probe_ms`` and is
+summarised at the end of the run.
+"""
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Generator, Optional
+
+import pytest
+from _pytest.config import Config as PytestConfig
+from _pytest.nodes import Item
+from _pytest.terminal import TerminalReporter
+from playwright.sync_api import Frame, Page
+
+from src.utils.metrics_pusher import ERROR_PROBE_SECONDS
+from src.utils.xdist_stats import collect, publish, summary_section
+
+logger = logging.getLogger("parabank")
+
+OK = "ok"
+INTERNAL_ERROR = "internal_error"
+ERROR_PAGE = "error_page"
+UNKNOWN = "unknown"
+
+_ERROR_SCRIPT = """
+() => {
+  const visible = (el) => !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+  const texts = (selector) => Array.from(document.querySelectorAll(selector))
+    .filter(visible)
+    .map((el) => (el.innerText || "").trim());
+  const headers = texts("h1.title").filter((text) => text.includes("Error!"));
+  const errors = texts("p.error").filter(Boolean);
+  const panel = [...headers, ...errors].join(" ");
+  const body = document.body ? document.body.innerText.toLowerCase() : "";
+  let kind = "ok";
+  if (
+    panel.toLowerCase().includes("internal error")
+    || body.includes("internal error has occurred")
+    || body.includes("internal error has occured")
+  ) {
+    kind = "internal_error";
+  } else if (headers.length || document.title.toLowerCase().includes("error!")) {
+    kind = "error_page";
+  }
+  return { kind, message: panel || (kind === "internal_error" ? "internal error text" : "") };
+}
+"""
+
+
+@dataclass(frozen=True)
+class ErrorVerdict:
+    """What the error probe found on a page."""
+
+    kind: str
+    message: str = ""
+    url: str = ""
+
+    @property
+    def internal_error(self) -> bool:
+        return self.kind == INTERNAL_ERROR
+
+    @property
+    def is_error(self) -> bool:
+        return self.kind in (INTERNAL_ERROR, ERROR_PAGE)
+
+
+class _PageState:
+    """Navigation counter of one page and the verdict for its current document."""
+
+    def __init__(self, page: Page) -> None:
+        self.navigations = 0
+        self.verdict: Optional[ErrorVerdict] = None
+        self.verdict_navigation = -1
+
+        def _on_navigated(frame: Frame) -> None:
+            if frame is page.main_frame:
+                self.navigations += 1
+
+        def _on_close(_: Page) -> None:
+            _PAGES.pop(page, None)
+
+        page.on("framenavigated", _on_navigated)
+        page.once("close", _on_close)
+
+
+_PAGES: Dict[Page, _PageState] = {}
+# Probe cost of the running test and of the whole process
+_test_stats = {"calls": 0, "cached": 0, "seconds": 0.0}
+_run_stats = {"calls": 0, "cached": 0, "seconds": 0.0, "tests": 0}
+
+
+def detect_error_page(page: Page, fresh: bool = False) -> ErrorVerdict:
+    """Return the error verdict for ``page``'s current document."""
+    started = time.perf_counter()
+    state = _PAGES.get(page)
+    if state is None:
+        state = _PAGES[page] = _PageState(page)
+    verdict = state.verdict
+    cached = not fresh and state.verdict_navigation == state.navigations
+    if verdict is None or not cached:
+        cached = False
+        navigation = state.navigations
+        try:
+            facts: Dict[str, Any] = page.evaluate(_ERROR_SCRIPT)
+            verdict = ErrorVerdict(facts["kind"], facts["message"], page.url)
+            state.verdict, state.verdict_navigation = verdict, navigation
+        except Exception as e:
+            logger.debug(f"Error probe could not evaluate {page.url}: {e}")
+            verdict = ErrorVerdict(UNKNOWN, str(e), page.url)
+    elapsed = time.perf_counter() - started
+    ERROR_PROBE_SECONDS.labels(cached=str(cached).lower()).observe(elapsed)
+    _test_stats["calls"] += 1
+    _test_stats["cached"] += int(cached)
+    _test_stats["seconds"] += elapsed
+    return verdict
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item: Item, nextitem: Optional[Item]) -> Generator[None, None, None]:
+    """Start each test with empty probe counters."""
+    _test_stats.update(calls=0, cached=0, seconds=0.0)
+    yield
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_teardown(item: Item, nextitem: Optional[Item]) -> Generator[None, None, None]:
+    """Expose the test's probe cost in the report properties."""
+    yield
+    if not _test_stats["calls"]:
+        return
+    item.user_properties.append(("error_probe_ms", round(_test_stats["seconds"] * 1000, 1)))
+    _run_stats["tests"] += 1
+    for key in ("calls", "cached", "seconds"):
+        _run_stats[key] += _test_stats[key]
+
+
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    """Hand the probe totals to the controller."""
+    publish(session.config, "error_probe", dict(_run_stats))
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node: Any, error: Any) -> None:
+    """Merge a finished worker's probe totals (controller side)."""
+    data = collect(node, "error_probe")
+    if data:
+        for key, value in data.items():
+            _run_stats[key] += value
+
+
+def pytest_terminal_summary(terminalreporter: TerminalReporter, config: PytestConfig) -> None:
+    """Report how much the error probe cost the run."""
+    if not _run_stats["calls"] or not summary_section(terminalreporter, config, "error probe"):
+        return
+    per_test = _run_stats["seconds"] * 1000 / _run_stats["tests"]
+    terminalreporter.write_line(
+        f"{_run_stats['calls']} check(s), {_run_stats['cached']} cached; "
+        f"{_run_stats['seconds'] * 1000:.0f}ms in total, {per_test:.1f}ms per checking test"
+    )
@@ -0,0 +1,194 @@
+"""Fixture setup and teardown profiling.
+
+``ExecutionMetrics`` times the whole runtest protocol, so logging in, creating
+contexts, finishing videos and taking screenshots all blur into one duration.
+This plugin times every fixture's setup and teardown separately:
+
+* Setup is the fixture function up to its ``yield`` or ``return``. pytest
+  resolves the fixtures it requests first, each through its own
+  ``pytest_fixture_setup`` call nested inside this one, so their time is
+  subtracted: every fixture gets its own time only.
+* Teardown is the code after the ``yield`` and any finalizers. It runs after the
+  fixtures that depend on it are torn down, which are not counted.
+
+Each phase is observed in ``fixture_duration_seconds{fixture,phase}``. Each test
+reports ``fixture_setup_s``, ``fixture_teardown_s`` and a per-fixture breakdown,
+``fixtures_ms``, in its JUnit/HTML properties. At the end of the run, the
+``--fixture-top`` slowest fixtures are listed by total time. Fixtures of a wider
+scope are counted for the test that set them up or tore them down.
+"""
+import logging
+import time
+from typing import Any, Dict, Generator, List, Optional, Tuple
+
+import pytest
+from _pytest.config import Config as PytestConfig
+from _pytest.config.argparsing import Parser
+from _pytest.fixtures import FixtureDef, SubRequest
+from _pytest.nodes import Item
+from _pytest.terminal import TerminalReporter
+
+from src.utils.metrics_pusher import FIXTURE_DURATION
+from src.utils.xdist_stats import collect, publish, summary_section
+
+logger = logging.getLogger("parabank")
+
+DEFAULT_TOP = 10
+SETUP, TEARDOWN = "setup", "teardown"
+
+
+class FixtureProfile:
+    """Setup and teardown totals per fixture for this process."""
+
+    def __init__(self) -> None:
+        # fixture -> {"scope": str, "setup": [calls, seconds, max], "teardown": [...]}
+        self.fixtures: Dict[str, Dict[str, Any]] = {}
+        # (fixture, phase, seconds) of the running test
+        self.test: List[Tuple[str, str, float]] = []
+
+    def record(self, name: str, scope: str, phase: str, seconds: float) -> None:
+        entry = self.fixtures.setdefault(
+            name, {"scope": scope, SETUP: [0, 0.0, 0.0], TEARDOWN: [0, 0.0, 0.0]}
+        )
+        totals = entry[phase]
+        totals[0] += 1
+        totals[1] += seconds
+        totals[2] = max(totals[2], seconds)
+        self.test.append((name, phase, seconds))
+        FIXTURE_DURATION.labels(fixture=name, phase=phase).observe(seconds)
+
+    def test_properties(self) -> List[Tuple[str, Any]]:
+        """JUnit properties of the running test."""
+        per_fixture: Dict[str, List[float]] = {}
+        for name, phase, seconds in self.test:
+            per_fixture.setdefault(name, [0.0, 0.0])[phase == TEARDOWN] += seconds
+        ranked = sorted(per_fixture.items(), key=lambda entry: sum(entry[1]), reverse=True)
+        breakdown = ", ".join(
+            f"{name}={setup * 1000:.0f}/{teardown * 1000:.0f}"
+            for name, (setup, teardown) in ranked
+            if setup + teardown >= 0.001
+        )
+        return [
+            ("fixture_setup_s", round(sum(times[0] for times in per_fixture.values()), 3)),
+            ("fixture_teardown_s", round(sum(times[1] for times in per_fixture.values()), 3)),
+            ("fixtures_ms", breakdown),
+        ]
+
+    def merge(self, data: Dict[str, Dict[str, Any]]) -> None:
+        for name, theirs in data.items():
+            entry = self.fixtures.setdefault(
+                name, {"scope": theirs["scope"], SETUP: [0, 0.0, 0.0], TEARDOWN: [0, 0.0, 0.0]}
+            )
+            for phase in (SETUP, TEARDOWN):
+                calls, seconds, longest = theirs[phase]
+                entry[phase][0] += calls
+                entry[phase][1] += seconds
+                entry[phase][2] = max(entry[phase][2], longest)
+
+    def ranked(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """Fixtures by total setup and teardown time, slowest first."""
+        return sorted(
+            self.fixtures.items(),
+            key=lambda entry: entry[1][SETUP][1] + entry[1][TEARDOWN][1],
+            reverse=True,
+        )
+
+
+_profile = FixtureProfile()
+# Fixtures being set up, innermost last: [started, seconds spent in nested setups]
+_setup_stack: List[List[float]] = []
+# Start of each fixture's teardown, set by the finalizer that runs just before it
+_teardown_started: Dict[FixtureDef[Any], float] = {}
+
+
+def pytest_addoption(parser: Parser) -> None:
+    """Register the fixture profile option."""
+    group = parser.getgroup("parabank-fixture-profile", "fixture setup/teardown profiling")
+    group.addoption(
+        "--fixture-top",
+        action="store",
+        type=int,
+        default=DEFAULT_TOP,
+        help=f"Slowest fixtures listed at the end of the run (default: {DEFAULT_TOP}; 0: none)",
+    )
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_fixture_setup(
+    fixturedef: FixtureDef[Any], request: SubRequest
+) -> Generator[None, None, None]:
+    """Time the fixture's own setup, without the fixtures it requests."""
+    frame = [time.perf_counter(), 0.0]
+    _setup_stack.append(frame)
+    try:
+        yield
+    finally:
+        _setup_stack.pop()
+        elapsed = time.perf_counter() - frame[0]
+        if _setup_stack:
+            _setup_stack[-1][1] += elapsed
+        _profile.record(fixturedef.argname, fixturedef.scope, SETUP, elapsed - frame[1])
+
+        def _teardown_starts() -> None:
+            _teardown_started[fixturedef] = time.perf_counter()
+
+        # Finalizers run last-in first-out: this one runs right before the fixture's own
+        fixturedef.addfinalizer(_teardown_starts)
+
+
+def pytest_fixture_post_finalizer(fixturedef: FixtureDef[Any], request: SubRequest) -> None:
+    """Close the teardown timing the fixture's last finalizer opened."""
+    started = _teardown_started.pop(fixturedef, None)
+    if started is not None:
+        elapsed = time.perf_counter() - started
+        _profile.record(fixturedef.argname, fixturedef.scope, TEARDOWN, elapsed)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item: Item, nextitem: Optional[Item]) -> Generator[None, None, None]:
+    """Start each test with an empty fixture breakdown."""
+    _profile.test = []
+    yield
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_teardown(item: Item, nextitem: Optional[Item]) -> Generator[None, None, None]:
+    """Expose the test's fixture times in the JUnit/HTML report properties."""
+    yield
+    if _profile.test:
+        item.user_properties.extend(_profile.test_properties())
+
+
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    """Hand the fixture totals to the controller."""
+    publish(session.config, "fixture_profile", _profile.fixtures)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node: Any, error: Any) -> None:
+    """Merge a finished worker's fixture totals (controller side)."""
+    data = collect(node, "fixture_profile")
+    if data:
+        _profile.merge(data)
+
+
+def pytest_terminal_summary(terminalreporter: TerminalReporter, config: PytestConfig) -> None:
+    """List the slowest fixtures by total setup and teardown time."""
+    top = config.getoption("--fixture-top")
+    if not top or not _profile.fixtures:
+        return
+    if not summary_section(terminalreporter, config, "slowest fixtures"):
+        return
+    terminalreporter.write_line(
+        f"  {'total':>8}  {'setup (n, mean, max)':>33}  {'teardown (n, mean, max)':>33}  fixture"
+    )
+    for name, entry in _profile.ranked()[:top]:
+        phases = []
+        for phase in (SETUP, TEARDOWN):
+            calls, seconds, longest = entry[phase]
+            mean = seconds / calls if calls else 0.0
+            phases.append(f"{seconds:7.2f}s ({calls:4d}, {mean:6.3f}s, {longest:6.3f}s)")
+        total = entry[SETUP][1] + entry[TEARDOWN][1]
+        terminalreporter.write_line(
+            f"  {total:7.2f}s  {phases[0]:>33}  {phases[1]:>33}  {name} [{entry['scope']}]"
+        )
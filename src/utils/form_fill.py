@@ -0,0 +1,65 @@
+"""Single-round-trip form filling for page objects.
+
+``Locator.fill`` is one protocol round trip per field, plus the ``slow_mo``
+delay configured in ``browser_type_launch_args``; an 11-field registration form
+pays that eleven times. ``fill_form`` sets a whole ``{css selector: value}``
+mapping in one page-side evaluation instead, using the native value setter and
+dispatching bubbling ``input`` and ``change`` events so page scripts and
+validation see the same events a user would trigger.
+
+``strict=True`` (or ``FORM_FILL_STRICT=1`` for the whole run) falls back to a
+``fill`` per field for flows where real keystrokes and actionability checks
+matter. Fields the fast path cannot set (missing, disabled or read-only) are
+filled with ``fill`` as well, which waits for them like any other locator call.
+"""
+import logging
+import os
+from typing import List, Mapping
+
+from playwright.sync_api import Page
+
+logger = logging.getLogger("parabank")
+
+_FILL_SCRIPT = """
+(fields) => {
+  const skipped = [];
+  for (const [selector, value] of fields) {
+    const el = document.querySelector(selector);
+    if (!el || el.disabled || el.readOnly) {
+      skipped.push(selector);
+      continue;
+    }
+    const proto = el instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype
+      : el instanceof HTMLSelectElement ? HTMLSelectElement.prototype
+      : HTMLInputElement.prototype;
+    el.focus();
+    Object.getOwnPropertyDescriptor(proto, "value").set.call(el, value);
+    el.dispatchEvent(new Event("input", { bubbles: true }));
+    el.dispatchEvent(new Event("change", { bubbles: true }));
+  }
+  return skipped;
+}
+"""
+
+
+def strict_fill_default() -> bool:
+    """Return True if ``FORM_FILL_STRICT`` forces per-field ``fill`` for the whole run."""
+    return os.environ.get("FORM_FILL_STRICT", "").lower() in ("1", "true", "yes")
+
+
+def fill_form(page: Page, values: Mapping[str, str], strict: bool = False) -> None:
+    """Set every ``selector: value`` pair of ``values`` on ``page``.
+
+    Args:
+        page: The Playwright page holding the form
+        values: CSS selector to value, filled in mapping order
+        strict: Use one ``Locator.fill`` per field instead of a single evaluation
+    """
+    if strict or strict_fill_default():
+        for selector, value in values.items():
+            page.locator(selector).fill(value)
+        return
+    skipped: List[str] = page.evaluate(_FILL_SCRIPT, [[s, v] for s, v in values.items()])
+    for selector in skipped:
+        logger.debug(f"Fast fill could not set {selector}; falling back to fill()")
+        page.locator(selector).fill(values[selector])
@@ -0,0 +1,231 @@
+"""HAR record-and-replay for the UI suite.
+
+``--har-mode=record`` makes every test's browser context write its traffic to a
+per-test HAR file. ``--har-mode=replay`` serves those recordings back through
+Playwright routing instead of talking to ParaBank, so selector, page-object and
+assertion changes can be checked in seconds without a backend.
+
+Entries are indexed by ``(method, path and query, body hash)`` for constant-time
+lookup. The host is left out of the key, so recordings made against one
+environment (e.g. the local emulator) replay against any other. Requests whose
+body differs from the recording (random registration data) fall back to a
+method + URL match. Hit/miss counts are reported at the end of the run so stale
+recordings show up.
+"""
+import base64
+import hashlib
+import json
+import logging
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import pytest
+from _pytest.config import Config as PytestConfig
+from _pytest.config.argparsing import Parser
+from _pytest.terminal import TerminalReporter
+from playwright.sync_api import BrowserContext, Route
+
+from src.utils.xdist_stats import collect, publish, summary_section
+
+
+logger = logging.getLogger("parabank")
+
+DEFAULT_HAR_DIR = "test-results/har"
+HAR_MODES = ["off", "record", "replay"]
+# Headers that describe the original transfer encoding, not the decoded HAR body.
+_SKIPPED_HEADERS = {"content-length", "content-encoding", "transfer-encoding"}
+
+HarKey = Tuple[str, str, str]
+
+
+def har_mode(config: PytestConfig) -> str:
+    """Return the active ``--har-mode`` (``off`` when the option is absent)."""
+    return str(config.getoption("--har-mode", "off"))
+
+
+def har_path_for(config: PytestConfig, nodeid: str) -> Path:
+    """Return the HAR file that belongs to the test ``nodeid``."""
+    safe_name = re.sub(r"[^\w.-]+", "_", nodeid).strip("_")
+    return Path(config.getoption("--har-dir")) / f"{safe_name}.har"
+
+
+def _body_hash(body: Optional[str]) -> str:
+    return hashlib.sha1((body or "").encode("utf-8"), usedforsecurity=False).hexdigest()
+
+
+def _relative(url: str) -> str:
+    """Drop scheme and host so recordings replay against any environment."""
+    parts = urlsplit(url)
+    return f"{parts.path}?{parts.query}" if parts.query else parts.path
+
+
+class HarIndex:
+    """Lookup table over the entries of one HAR file."""
+
+    def __init__(self, entries: List[Dict[str, Any]]) -> None:
+        self._exact: Dict[HarKey, List[Dict[str, Any]]] = defaultdict(list)
+        self._loose: Dict[Tuple[str, str], List[Dict[str, Any]]] = defaultdict(list)
+        self._served: Dict[Any, int] = defaultdict(int)
+        for entry in entries:
+            request = entry.get("request", {})
+            method = request.get("method", "GET")
+            url = _relative(request.get("url", ""))
+            body = (request.get("postData") or {}).get("text")
+            self._exact[(method, url, _body_hash(body))].append(entry)
+            self._loose[(method, url)].append(entry)
+
+    @classmethod
+    def load(cls, path: Path) -> "HarIndex":
+        with open(path, "r", encoding="utf-8") as f:
+            har = json.load(f)
+        return cls(har.get("log", {}).get("entries", []))
+
+    def lookup(self, method: str, url: str, body: Optional[str]) -> Tuple[Optional[Dict], bool]:
+        """Return ``(entry, exact)`` for a request; ``entry`` is None on a miss.
+
+        Repeated identical requests are answered in recorded order, and the last
+        recorded response keeps being served once the recording runs out.
+        """
+        relative = _relative(url)
+        exact_key: HarKey = (method, relative, _body_hash(body))
+        for key, candidates, exact in (
+            (exact_key, self._exact.get(exact_key), True),
+            ((method, relative), self._loose.get((method, relative)), False),
+        ):
+            if candidates:
+                served = self._served[key]
+                self._served[key] = served + 1
+                return candidates[min(served, len(candidates) - 1)], exact
+        return None, False
+
+
+@dataclass
+class HarReplayStats:
+    """Hit/miss counters for the replayed requests of this process."""
+
+    hits: int = 0
+    loose_hits: int = 0
+    misses: int = 0
+    missing_recordings: int = 0
+    stale_tests: Dict[str, int] = field(default_factory=dict)
+
+    def merge(self, data: Dict[str, Any]) -> None:
+        self.hits += int(data.get("hits", 0))
+        self.loose_hits += int(data.get("loose_hits", 0))
+        self.misses += int(data.get("misses", 0))
+        self.missing_recordings += int(data.get("missing_recordings", 0))
+        for nodeid, count in data.get("stale_tests", {}).items():
+            self.stale_tests[nodeid] = self.stale_tests.get(nodeid, 0) + int(count)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "loose_hits": self.loose_hits,
+            "misses": self.misses,
+            "missing_recordings": self.missing_recordings,
+            "stale_tests": dict(self.stale_tests),
+        }
+
+
+REPLAY_STATS = HarReplayStats()
+
+
+def har_context_args(config: PytestConfig, nodeid: str) -> Dict[str, Any]:
+    """Extra ``new_context`` arguments for the active HAR mode."""
+    if har_mode(config) != "record":
+        return {}
+    path = har_path_for(config, nodeid)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return {"record_har_path": str(path), "record_har_content": "embed"}
+
+
+def start_replay(context: BrowserContext, config: PytestConfig, nodeid: str) -> None:
+    """Route all of ``context``'s traffic to the recording of ``nodeid``.
+
+    Skips the test when no recording exists for it.
+    """
+    path = har_path_for(config, nodeid)
+    if not path.exists():
+        REPLAY_STATS.missing_recordings += 1
+        pytest.skip(f"No HAR recording for this test ({path}); run with --har-mode=record")
+    index = HarIndex.load(path)
+
+    def _handle(route: Route) -> None:
+        request = route.request
+        entry, exact = index.lookup(request.method, request.url, request.post_data)
+        if entry is None:
+            REPLAY_STATS.misses += 1
+            REPLAY_STATS.stale_tests[nodeid] = REPLAY_STATS.stale_tests.get(nodeid, 0) + 1
+            logger.debug(f"HAR miss: {request.method} {request.url}")
+            route.fulfill(status=404, body="Not in HAR recording")
+            return
+        if exact:
+            REPLAY_STATS.hits += 1
+        else:
+            REPLAY_STATS.loose_hits += 1
+        response = entry["response"]
+        content = response.get("content", {})
+        text = content.get("text", "")
+        body = base64.b64decode(text) if content.get("encoding") == "base64" else text.encode()
+        headers = {
+            h["name"]: h["value"]
+            for h in response.get("headers", [])
+            if h["name"].lower() not in _SKIPPED_HEADERS
+        }
+        route.fulfill(status=response.get("status", 200), headers=headers, body=body)
+
+    context.route("**/*", _handle)
+
+
+def pytest_addoption(parser: Parser) -> None:
+    """Register HAR record/replay command line options."""
+    group = parser.getgroup("parabank-har", "HAR record and replay")
+    group.addoption(
+        "--har-mode",
+        action="store",
+        default="off",
+        choices=HAR_MODES,
+        help="record: write a HAR per test; replay: serve tests from their HAR (default: off)",
+    )
+    group.addoption(
+        "--har-dir",
+        action="store",
+        default=DEFAULT_HAR_DIR,
+        help=f"Directory holding the per-test HAR files (default: {DEFAULT_HAR_DIR})",
+    )
+
+
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    """Hand this worker's replay counters to the controller."""
+    publish(session.config, "har_replay", REPLAY_STATS.as_dict())
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node: Any, error: Any) -> None:
+    """Merge a finished worker's replay counters (controller side)."""
+    data = collect(node, "har_replay")
+    if data:
+        REPLAY_STATS.merge(data)
+
+
+def pytest_terminal_summary(terminalreporter: TerminalReporter, config: PytestConfig) -> None:
+    """Report replay hit/miss counts and the tests whose recordings look stale."""
+    if har_mode(config) != "replay" or not summary_section(terminalreporter, config, "HAR replay"):
+        return
+    stats = REPLAY_STATS
+    total = stats.hits + stats.loose_hits + stats.misses
+    hit_rate = (stats.hits + stats.loose_hits) / total * 100 if total else 0.0
+    terminalreporter.write_line(
+        f"requests: {total}, hits: {stats.hits}, body-mismatch hits: {stats.loose_hits}, "
+        f"misses: {stats.misses} ({hit_rate:.1f}% served), "
+        f"tests without recording: {stats.missing_recordings}"
+    )
+    if stats.stale_tests:
+        terminalreporter.write_line("stale recordings (misses per test):")
+        ranked = sorted(stats.stale_tests.items(), key=lambda item: item[1], reverse=True)
+        for nodeid, misses in ranked[:10]:
+            terminalreporter.write_line(f"  {misses:4d}  {nodeid}")
@@ -0,0 +1,711 @@
+"""Browserless tier for tests that only read server-rendered HTML.
+
+A test that loads a page and checks its title, link texts, hrefs or headings
+does not need Chromium: the HTML the server sends already holds the answer.
+Tests marked ``browserless`` get a ``static_page`` that fetches pages over one
+pooled ``urllib3`` connection per worker and parses them into a small DOM with
+the subset of the Playwright ``Page``/``Locator`` API such tests use
+(``goto``, ``title``, ``url``, ``locator``, ``get_by_role``, ``filter``,
+``first``/``last``/``nth``, ``text_content``, ``get_attribute`` and ``click`` on
+plain links).
+
+Whenever the HTML alone cannot answer a query the way a browser would (no
+element or several for a single-element call, an unsupported selector, a click
+on something other than a plain link, anything that needs layout), the query
+raises ``AmbiguousQueryError`` and the test is rerun against a real Playwright
+``page``. The same test code runs in both tiers; ``assert_text`` and
+``assert_url`` compare directly on HTML and use ``expect`` in the browser.
+
+``--browserless=off`` runs every marked test in the browser, and
+``--browserless=compare`` runs each of them in both tiers and reports the
+per-test speedup. ``@pytest.mark.browserless(authenticated=True)`` sends the
+worker's saved session cookies, like the browser contexts that reuse them.
+"""
+import logging
+import re
+import time
+from html.parser import HTMLParser
+from http.cookies import SimpleCookie
+from typing import Any, Callable, Dict, Generator, List, Optional, Pattern, Tuple, Union
+from urllib.parse import urljoin, urlsplit
+
+import pytest
+import urllib3
+from _pytest.config import Config as PytestConfig
+from _pytest.config.argparsing import Parser
+from _pytest.fixtures import FixtureRequest
+from _pytest.terminal import TerminalReporter
+from playwright.sync_api import Page, expect
+from urllib3.util.retry import Retry
+
+from src.utils.har_replay import har_mode
+from src.utils.xdist_stats import collect, publish, summary_section
+
+logger = logging.getLogger("parabank")
+
+BROWSERLESS_MODES = ["on", "off", "compare"]
+MAX_REDIRECTS = 10
+# Elements without content or end tag
+_VOID_TAGS = {
+    "area",
+    "base",
+    "br",
+    "col",
+    "embed",
+    "hr",
+    "img",
+    "input",
+    "link",
+    "meta",
+    "source",
+    "track",
+    "wbr",
+}
+# Text that is not rendered, so never part of an element's visible text or name
+_RAW_TEXT_TAGS = {"script", "style", "template", "noscript"}
+_BUTTON_INPUT_TYPES = {"button", "submit", "reset", "image"}
+_TEXTBOX_INPUT_TYPES = {"", "text", "email", "tel", "url", "search", "password", "number"}
+
+
+class AmbiguousQueryError(Exception):
+    """Raised when static HTML cannot answer a query the way a browser would."""
+
+
+def _normalize(text: Optional[str]) -> str:
+    """Collapse whitespace the way Playwright's text matching does."""
+    return re.sub(r"\s+", " ", text or "").strip()
+
+
+class HtmlElement:
+    """One element of a parsed page."""
+
+    def __init__(self, tag: str, attrs: Dict[str, str], parent: Optional["HtmlElement"]) -> None:
+        self.tag = tag
+        self.attrs = attrs
+        self.parent = parent
+        self.children: List[Union["HtmlElement", str]] = []
+
+    @property
+    def elements(self) -> List["HtmlElement"]:
+        return [child for child in self.children if isinstance(child, HtmlElement)]
+
+    def iter_descendants(self) -> Generator["HtmlElement", None, None]:
+        for child in self.elements:
+            yield child
+            yield from child.iter_descendants()
+
+    def text(self, rendered: bool = False) -> str:
+        """``textContent``; with ``rendered``, without script and style text."""
+        if rendered and self.tag in _RAW_TEXT_TAGS:
+            return ""
+        return "".join(
+            child if isinstance(child, str) else child.text(rendered) for child in self.children
+        )
+
+    @property
+    def classes(self) -> List[str]:
+        return self.attrs.get("class", "").split()
+
+
+class _TreeBuilder(HTMLParser):
+    """Lenient parser: unclosed elements are closed by their ancestors' end tags."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.root = HtmlElement("#document", {}, None)
+        self._open: List[HtmlElement] = [self.root]
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        element = HtmlElement(tag, {k: v or "" for k, v in attrs}, self._open[-1])
+        self._open[-1].children.append(element)
+        if tag not in _VOID_TAGS:
+            self._open.append(element)
+
+    def handle_startendtag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        self._open[-1].children.append(
+            HtmlElement(tag, {k: v or "" for k, v in attrs}, self._open[-1])
+        )
+
+    def handle_endtag(self, tag: str) -> None:
+        for depth in range(len(self._open) - 1, 0, -1):
+            if self._open[depth].tag == tag:
+                del self._open[depth:]
+                return
+
+    def handle_data(self, data: str) -> None:
+        self._open[-1].children.append(data)
+
+
+def parse_html(html: str) -> HtmlElement:
+    """Parse ``html`` into a tree whose root is a ``#document`` node."""
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.root
+
+
+# --- CSS selectors: type, #id, .class, [attr op value], :nth-child, descendant and '>' ---
+
+_SIMPLE = re.compile(
+    r"""
+    (?P<tag>\*|[a-zA-Z][\w-]*)
+    |\#(?P<id>[\w-]+)
+    |\.(?P<cls>[\w-]+)
+    |\[\s*(?P<attr>[\w:-]+)\s*
+        (?:(?P<op>[*^$~]?=)\s*(?:"(?P<dq>[^"]*)"|'(?P<sq>[^']*)'|(?P<bare>[^\]\s]+))\s*)?\]
+    |:(?P<pseudo>first-child|last-child|nth-child\(\s*(?P<nth>\d+)\s*\))
+    """,
+    re.VERBOSE,
+)
+
+Condition = Callable[[HtmlElement], bool]
+# (combinator to the previous compound, conditions of this compound)
+Step = Tuple[str, List[Condition]]
+
+
+def _attribute_condition(name: str, op: Optional[str], value: str) -> Condition:
+    def matches(el: HtmlElement) -> bool:
+        actual = el.attrs.get(name)
+        if actual is None:
+            return False
+        if op is None:
+            return True
+        if op == "=":
+            return actual == value
+        if op == "*=":
+            return bool(value) and value in actual
+        if op == "^=":
+            return bool(value) and actual.startswith(value)
+        if op == "$=":
+            return bool(value) and actual.endswith(value)
+        return value in actual.split()  # ~=
+
+    return matches
+
+
+def _sibling_index(el: HtmlElement) -> Tuple[int, int]:
+    siblings = el.parent.elements if el.parent is not None else [el]
+    return siblings.index(el) + 1, len(siblings)
+
+
+def _condition(match: "re.Match[str]") -> Condition:
+    groups = match.groupdict()
+    if groups["tag"]:
+        tag = groups["tag"].lower()
+        return lambda el: tag == "*" or el.tag == tag
+    if groups["id"]:
+        element_id = groups["id"]
+        return lambda el: el.attrs.get("id") == element_id
+    if groups["cls"]:
+        cls = groups["cls"]
+        return lambda el: cls in el.classes
+    if groups["attr"]:
+        value = next((groups[k] for k in ("dq", "sq", "bare") if groups[k] is not None), "")
+        return _attribute_condition(groups["attr"].lower(), groups["op"], value)
+    pseudo = groups["pseudo"]
+    if pseudo == "first-child":
+        return lambda el: _sibling_index(el)[0] == 1
+    if pseudo == "last-child":
+        return lambda el: _sibling_index(el)[0] == _sibling_index(el)[1]
+    nth = int(groups["nth"])
+    return lambda el: _sibling_index(el)[0] == nth
+
+
+def parse_selector(selector: str) -> List[List[Step]]:
+    """Compile a CSS selector list; anything outside the supported subset is ambiguous."""
+    groups: List[List[Step]] = []
+    steps: List[Step] = []
+    compound: List[Condition] = []
+    combinator = " "
+    pos = 0
+    while pos < len(selector):
+        char = selector[pos]
+        if char.isspace() or char in ">,":
+            if compound:
+                steps.append((combinator, compound))
+                compound, combinator = [], " "
+            if char == ">":
+                if not steps:
+                    raise AmbiguousQueryError(f"Unsupported selector {selector!r}")
+                combinator = ">"
+            elif char == ",":
+                if not steps or combinator == ">":
+                    raise AmbiguousQueryError(f"Unsupported selector {selector!r}")
+                groups.append(steps)
+                steps = []
+            pos += 1
+            continue
+        match = _SIMPLE.match(selector, pos)
+        if match is None:
+            raise AmbiguousQueryError(f"Unsupported selector {selector!r}")
+        compound.append(_condition(match))
+        pos = match.end()
+    if compound:
+        steps.append((combinator, compound))
+    elif not steps or combinator == ">":
+        raise AmbiguousQueryError(f"Unsupported selector {selector!r}")
+    groups.append(steps)
+    return groups
+
+
+def _matches(el: HtmlElement, steps: List[Step], index: int) -> bool:
+    combinator, conditions = steps[index]
+    if el.parent is None or not all(condition(el) for condition in conditions):
+        return False
+    if index == 0:
+        return True
+    if combinator == ">":
+        return _matches(el.parent, steps, index - 1)
+    ancestor: Optional[HtmlElement] = el.parent
+    while ancestor is not None:
+        if _matches(ancestor, steps, index - 1):
+            return True
+        ancestor = ancestor.parent
+    return False
+
+
+def select(scope: HtmlElement, selector: str) -> List[HtmlElement]:
+    """``scope.querySelectorAll(selector)``: descendants in document order."""
+    groups = parse_selector(selector)
+    return [
+        el
+        for el in scope.iter_descendants()
+        if any(_matches(el, steps, len(steps) - 1) for steps in groups)
+    ]
+
+
+# --- roles ---
+
+
+def _role_of(el: HtmlElement) -> Optional[str]:
+    explicit = el.attrs.get("role")
+    if explicit:
+        return explicit.split()[0]
+    if el.tag == "a" and "href" in el.attrs:
+        return "link"
+    if el.tag == "button":
+        return "button"
+    if el.tag in ("h1", "h2", "h3", "h4", "h5", "h6"):
+        return "heading"
+    if el.tag == "textarea":
+        return "textbox"
+    if el.tag == "img":
+        return "img" if el.attrs.get("alt") != "" else None
+    if el.tag == "input":
+        input_type = el.attrs.get("type", "").lower()
+        if input_type in _BUTTON_INPUT_TYPES:
+            return "button"
+        if input_type in _TEXTBOX_INPUT_TYPES:
+            return "textbox"
+    return None
+
+
+def _name_from_content(el: HtmlElement) -> str:
+    parts: List[str] = []
+    for child in el.children:
+        if isinstance(child, str):
+            parts.append(child)
+        elif child.tag == "img":
+            parts.append(f" {child.attrs.get('alt', '')} ")
+        elif child.tag not in _RAW_TEXT_TAGS:
+            parts.append(_name_from_content(child))
+    return "".join(parts)
+
+
+def accessible_name(el: HtmlElement) -> str:
+    """Accessible name from ``aria-label``, content, ``alt``/``value`` or ``title``."""
+    name = el.attrs.get("aria-label", "")
+    if not name and el.tag == "input":
+        name = el.attrs.get("value", "") if el.attrs.get("type", "") in _BUTTON_INPUT_TYPES else ""
+    elif not name and el.tag == "img":
+        name = el.attrs.get("alt", "")
+    elif not name:
+        name = _name_from_content(el)
+    return _normalize(name) or _normalize(el.attrs.get("title"))
+
+
+def _name_matches(actual: str, expected: Union[str, Pattern[str]], exact: bool) -> bool:
+    if isinstance(expected, re.Pattern):
+        return expected.search(actual) is not None
+    if exact:
+        return actual == _normalize(expected)
+    return _normalize(expected).lower() in actual.lower()
+
+
+# --- page and locator ---
+
+Resolver = Callable[[], List[HtmlElement]]
+
+
+class HtmlLocator:
+    """Lazy query against the page's current document, like a Playwright ``Locator``."""
+
+    def __init__(self, page: "HtmlPage", resolve: Resolver, description: str) -> None:
+        self._page = page
+        self._resolve = resolve
+        self._description = description
+
+    def __repr__(self) -> str:
+        return f"<HtmlLocator {self._description}>"
+
+    def _derive(self, resolve: Resolver, suffix: str) -> "HtmlLocator":
+        return HtmlLocator(self._page, resolve, f"{self._description} >> {suffix}")
+
+    def _single(self) -> HtmlElement:
+        elements = self._resolve()
+        if len(elements) != 1:
+            # A browser would wait for the element or raise a strict mode violation
+            raise AmbiguousQueryError(f"{self._description} matches {len(elements)} elements")
+        return elements[0]
+
+    def locator(self, selector: str) -> "HtmlLocator":
+        return self._derive(
+            lambda: _unique([el for scope in self._resolve() for el in select(scope, selector)]),
+            selector,
+        )
+
+    def get_by_role(
+        self, role: str, name: Optional[Union[str, Pattern[str]]] = None, exact: bool = False
+    ) -> "HtmlLocator":
+        return self._derive(
+            lambda: _by_role(
+                [el for scope in self._resolve() for el in scope.iter_descendants()],
+                role,
+                name,
+                exact,
+            ),
+            f"role={role}[name={name!r}]",
+        )
+
+    def filter(self, has_text: Optional[Union[str, Pattern[str]]] = None) -> "HtmlLocator":
+        if has_text is None:
+            return self
+        return self._derive(
+            lambda: [
+                el
+                for el in self._resolve()
+                if _name_matches(_normalize(el.text(rendered=True)), has_text, exact=False)
+            ],
+            f"has_text={has_text!r}",
+        )
+
+    def nth(self, index: int) -> "HtmlLocator":
+        def resolve() -> List[HtmlElement]:
+            elements = self._resolve()
+            try:
+                return [elements[index]]
+            except IndexError:
+                return []
+
+        return self._derive(resolve, f"nth={index}")
+
+    @property
+    def first(self) -> "HtmlLocator":
+        return self.nth(0)
+
+    @property
+    def last(self) -> "HtmlLocator":
+        return self.nth(-1)
+
+    def count(self) -> int:
+        return len(self._resolve())
+
+    def all(self) -> List["HtmlLocator"]:
+        return [self.nth(index) for index in range(self.count())]
+
+    def text_content(self) -> str:
+        return self._single().text()
+
+    def inner_text(self) -> str:
+        """Rendered text without script/style; CSS-generated text is not known here."""
+        return _normalize(self._single().text(rendered=True))
+
+    def all_text_contents(self) -> List[str]:
+        return [el.text() for el in self._resolve()]
+
+    def get_attribute(self, name: str) -> Optional[str]:
+        return self._single().attrs.get(name)
+
+    def is_visible(self) -> bool:
+        raise AmbiguousQueryError(f"Visibility of {self._description} needs layout")
+
+    def click(self) -> None:
+        """Follow the plain link under the element; anything scripted is ambiguous."""
+        element: Optional[HtmlElement] = self._single()
+        while element is not None and element.tag != "a" and "onclick" not in element.attrs:
+            element = element.parent
+        if (
+            element is None
+            or element.tag != "a"
+            or "onclick" in element.attrs
+            or element.attrs.get("target", "_self") != "_self"
+            or not element.attrs.get("href")
+            or element.attrs["href"].startswith(("#", "javascript:"))
+        ):
+            raise AmbiguousQueryError(f"Clicking {self._description} is not a plain link")
+        href = element.attrs["href"]
+        self._page.goto(urljoin(self._page.url, href))
+
+
+def _unique(elements: List[HtmlElement]) -> List[HtmlElement]:
+    seen: Dict[int, HtmlElement] = {}
+    for el in elements:
+        seen.setdefault(id(el), el)
+    return list(seen.values())
+
+
+def _by_role(
+    candidates: List[HtmlElement],
+    role: str,
+    name: Optional[Union[str, Pattern[str]]],
+    exact: bool,
+) -> List[HtmlElement]:
+    if role not in ("link", "button", "heading", "textbox", "img"):
+        raise AmbiguousQueryError(f"Role {role!r} is not resolved without a browser")
+    return _unique(
+        [
+            el
+            for el in candidates
+            if _role_of(el) == role
+            and "hidden" not in el.attrs
+            and (name is None or _name_matches(accessible_name(el), name, exact))
+        ]
+    )
+
+
+class HtmlPage:
+    """A page fetched over HTTP, queried through a Playwright-like API."""
+
+    def __init__(self, http: urllib3.PoolManager, cookies: Optional[Dict[str, str]] = None) -> None:
+        self.http = http
+        self.cookies: Dict[str, str] = dict(cookies or {})
+        self.status = 0
+        self.requests = 0
+        self._url = "about:blank"
+        self._html = ""
+        self._root = parse_html("")
+
+    @property
+    def url(self) -> str:
+        return self._url
+
+    def goto(self, url: str, **_: Any) -> None:
+        """Fetch ``url`` (following redirects and keeping cookies) and parse it."""
+        url = urljoin(self._url, url) if self._url != "about:blank" else url
+        for _hop in range(MAX_REDIRECTS + 1):
+            headers = {"Accept": "text/html,application/xhtml+xml"}
+            if self.cookies:
+                headers["Cookie"] = "; ".join(f"{k}={v}" for k, v in self.cookies.items())
+            response = self.http.request("GET", url, headers=headers, redirect=False)
+            self.requests += 1
+            for header in response.headers.getlist("Set-Cookie"):
+                jar: SimpleCookie = SimpleCookie()
+                jar.load(header)
+                self.cookies.update({name: morsel.value for name, morsel in jar.items()})
+            location = response.headers.get("Location")
+            if response.status in (301, 302, 303, 307, 308) and location:
+                url = urljoin(url, location)
+                continue
+            self.status = response.status
+            self._url = url
+            self._html = response.data.decode("utf-8", errors="replace")
+            self._root = parse_html(self._html)
+            return
+        raise AmbiguousQueryError(f"Too many redirects loading {url}")
+
+    def content(self) -> str:
+        return self._html
+
+    def title(self) -> str:
+        titles = select(self._root, "title")
+        return _normalize(titles[0].text()) if titles else ""
+
+    def locator(self, selector: str) -> HtmlLocator:
+        return HtmlLocator(self, lambda: select(self._root, selector), selector)
+
+    def get_by_role(
+        self, role: str, name: Optional[Union[str, Pattern[str]]] = None, exact: bool = False
+    ) -> HtmlLocator:
+        return HtmlLocator(
+            self,
+            lambda: _by_role(list(self._root.iter_descendants()), role, name, exact),
+            f"role={role}[name={name!r}]",
+        )
+
+
+StaticPage = Union[HtmlPage, Page]
+
+
+def assert_text(
+    locator: Any, expected: str, contains: bool = False, timeout: float = 10000
+) -> None:
+    """``expect(locator).to_have_text``/``to_contain_text`` for either tier."""
+    if not isinstance(locator, HtmlLocator):
+        if contains:
+            expect(locator).to_contain_text(expected, timeout=timeout)
+        else:
+            expect(locator).to_have_text(expected, timeout=timeout)
+        return
+    actual = _normalize(locator.text_content())
+    ok = _normalize(expected) in actual if contains else actual == _normalize(expected)
+    verb = "contain" if contains else "be"
+    assert ok, f"{locator!r}: text {actual!r}, expected to {verb} {expected!r}"
+
+
+def assert_url(
+    page: StaticPage, expected: Union[str, Pattern[str]], timeout: float = 10000
+) -> None:
+    """``expect(page).to_have_url`` for either tier."""
+    if not isinstance(page, HtmlPage):
+        expect(page).to_have_url(expected, timeout=timeout)
+        return
+    if isinstance(expected, re.Pattern):
+        assert expected.search(page.url), f"url {page.url!r} does not match {expected.pattern!r}"
+    else:
+        assert page.url == expected, f"url {page.url!r}, expected {expected!r}"
+
+
+# --- pytest plugin ---
+
+# nodeid -> {"http": seconds or None, "browser": seconds or None, "fallback": reason}
+_timings: Dict[str, Dict[str, Any]] = {}
+
+
+def browserless_mode(config: PytestConfig) -> str:
+    """Return the active ``--browserless`` mode."""
+    mode = str(config.getoption("--browserless", "on"))
+    # Replayed runs must not reach the network; only the browser reads the HAR files
+    return "off" if mode != "off" and har_mode(config) == "replay" else mode
+
+
+def _cookies_from_state(state: Optional[Dict[str, Any]], base_url: str) -> Dict[str, str]:
+    host = urlsplit(base_url).hostname or ""
+    return {
+        cookie["name"]: cookie["value"]
+        for cookie in (state or {}).get("cookies", [])
+        if host.endswith(str(cookie.get("domain", "")).lstrip("."))
+    }
+
+
+def _browser_page(request: FixtureRequest) -> Page:
+    marker = request.node.get_closest_marker("browserless")
+    if marker is not None and marker.kwargs.get("authenticated"):
+        request.getfixturevalue("user_login")
+    page: Page = request.getfixturevalue("page")
+    return page
+
+
+def pytest_addoption(parser: Parser) -> None:
+    """Register the browserless tier option."""
+    group = parser.getgroup("parabank-browserless", "Browserless HTTP tier")
+    group.addoption(
+        "--browserless",
+        action="store",
+        default="on",
+        choices=BROWSERLESS_MODES,
+        help="Run tests marked browserless over HTTP (on), in the browser (off), or both "
+        "to report the speedup (compare); default: on",
+    )
+
+
+@pytest.fixture(scope="session")
+def http_tier_client() -> Generator[urllib3.PoolManager, None, None]:
+    """Keep-alive connection pool shared by this worker's browserless tests."""
+    http = urllib3.PoolManager(
+        num_pools=2,
+        maxsize=4,
+        timeout=urllib3.Timeout(connect=10.0, read=30.0),
+        retries=Retry(total=2, backoff_factor=0.5, status_forcelist=(502, 503, 504)),
+        headers={"User-Agent": "parabank-ui-automation (browserless)"},
+    )
+    yield http
+    http.clear()
+
+
+@pytest.fixture
+def static_page(request: FixtureRequest, base_url: str) -> StaticPage:
+    """``HtmlPage`` for tests marked ``browserless``, the Playwright ``page`` otherwise."""
+    marker = request.node.get_closest_marker("browserless")
+    if marker is None or browserless_mode(request.config) == "off":
+        return _browser_page(request)
+    cookies: Dict[str, str] = {}
+    if marker.kwargs.get("authenticated"):
+        cookies = _cookies_from_state(request.getfixturevalue("auth_storage_state"), base_url)
+    return HtmlPage(request.getfixturevalue("http_tier_client"), cookies)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_pyfunc_call(pyfuncitem: pytest.Function) -> Optional[bool]:
+    """Run a browserless test on HTML; rerun it in the browser if a query was ambiguous."""
+    if not isinstance(pyfuncitem.funcargs.get("static_page"), HtmlPage):
+        return None
+    argnames = pyfuncitem._fixtureinfo.argnames  # pylint: disable=protected-access
+    timing: Dict[str, Any] = {"http": None, "browser": None, "fallback": None}
+    _timings[pyfuncitem.nodeid] = timing
+
+    def run() -> None:
+        pyfuncitem.obj(**{name: pyfuncitem.funcargs[name] for name in argnames})
+
+    started = time.perf_counter()
+    try:
+        run()
+        timing["http"] = time.perf_counter() - started
+        pyfuncitem.user_properties.append(("browserless_ms", round(timing["http"] * 1000)))
+        if browserless_mode(pyfuncitem.config) != "compare":
+            return True
+    except AmbiguousQueryError as e:
+        timing["fallback"] = str(e)
+        logger.info(f"Browserless query ambiguous ({e}); rerunning in the browser")
+
+    started = time.perf_counter()
+    pyfuncitem.funcargs["static_page"] = _browser_page(
+        pyfuncitem._request  # pylint: disable=protected-access
+    )
+    run()
+    timing["browser"] = time.perf_counter() - started
+    if timing["http"]:
+        speedup = timing["browser"] / timing["http"]
+        pyfuncitem.user_properties.append(("browserless_speedup", round(speedup, 1)))
+    return True
+
+
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    """Hand this worker's timings to the controller."""
+    publish(session.config, "browserless", _timings)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node: Any, error: Any) -> None:
+    """Merge a finished worker's timings (controller side)."""
+    _timings.update(collect(node, "browserless") or {})
+
+
+def pytest_terminal_summary(terminalreporter: TerminalReporter, config: PytestConfig) -> None:
+    """Report tests served over HTTP, fallbacks, and the speedup when compared."""
+    if not _timings or not summary_section(terminalreporter, config, "browserless tier"):
+        return
+    served = {k: t for k, t in _timings.items() if t["http"] is not None}
+    fallbacks = {k: t for k, t in _timings.items() if t["fallback"] is not None}
+    http_total = sum(t["http"] for t in served.values())
+    terminalreporter.write_line(
+        f"{len(served)} test(s) answered from HTML in {http_total:.1f}s, "
+        f"{len(fallbacks)} fell back to the browser"
+    )
+    for nodeid, timing in sorted(fallbacks.items()):
+        terminalreporter.write_line(f"  fallback {nodeid}: {timing['fallback']}")
+    compared = {k: t for k, t in served.items() if t["browser"] is not None}
+    if not compared:
+        return
+    speedups = {k: t["browser"] / max(t["http"], 1e-6) for k, t in compared.items()}
+    for nodeid, speedup in sorted(speedups.items(), key=lambda kv: kv[1], reverse=True):
+        timing = compared[nodeid]
+        terminalreporter.write_line(
+            f"  {speedup:6.1f}x  {timing['http'] * 1000:7.0f}ms vs "
+            f"{timing['browser'] * 1000:7.0f}ms browser  {nodeid}"
+        )
+    browser_total = sum(t["browser"] for t in compared.values())
+    compared_http = sum(t["http"] for t in compared.values())
+    terminalreporter.write_line(
+        f"compared {len(compared)} test(s): {compared_http:.1f}s over HTTP vs "
+        f"{browser_total:.1f}s in the browser ({browser_total / max(compared_http, 1e-6):.1f}x)"
+    )
@@ -9,12 +9,14 @@ tests complete.
 
 import logging
 import os
+import threading
 import time
 import types
-from typing import Optional, Type
+from typing import Callable, Dict, List, Optional, Tuple, Type
 from urllib.parse import urlparse
 
 import psutil
+import urllib3
 from prometheus_client import (
     CollectorRegistry,
     Counter,
@@ -57,12 +59,115 @@ MEMORY_USAGE = Gauge(
     "Memory usage during test execution",
     registry=registry,
 )
+BROWSER_TREE_RSS = Gauge(
+    "browser_tree_rss_bytes",
+    "RSS of the worker's browser process tree (Playwright driver and browser)",
+    registry=registry,
+)
+BROWSER_TREE_CPU = Gauge(
+    "browser_tree_cpu_percent",
+    "CPU use of the worker's browser process tree since the previous test",
+    registry=registry,
+)
+BROWSER_RELAUNCHES = Counter(
+    "browser_relaunches_total",
+    "Browsers relaunched by the health watchdog, by reason (tests, rss, crash)",
+    ["reason"],
+    registry=registry,
+)
 TEST_PERFORMANCE = Histogram(
     "test_performance_score",
     "Test performance score (1-100)",
     buckets=[20, 40, 60, 80, 100],
     registry=registry,
 )
+CONCURRENCY_LIMIT = Gauge(
+    "test_concurrency_limit",
+    "Adaptive (AIMD) limit on tests running concurrently against ParaBank",
+    registry=registry,
+)
+CONCURRENCY_WAIT = Counter(
+    "test_concurrency_wait_seconds",
+    "Time tests waited for a concurrency token",
+    registry=registry,
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "parabank_http_request_duration_seconds",
+    "ParaBank request time (start to response end) by normalized endpoint and status class",
+    ["endpoint", "status_class"],
+    buckets=[0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0],
+    registry=registry,
+)
+SLEEP_SECONDS = Counter(
+    "test_sleep_seconds",
+    "Dead time in fixed waits (wait_for_timeout, time.sleep, estimated slow_mo) by call site",
+    ["kind", "site"],
+    registry=registry,
+)
+ERROR_PROBE_SECONDS = Histogram(
+    "error_probe_seconds",
+    "Time spent checking pages for ParaBank error pages, by cache hit",
+    ["cached"],
+    buckets=[0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0],
+    registry=registry,
+)
+DROPDOWN_WAIT = Histogram(
+    "dropdown_wait_seconds",
+    "Time select dropdowns took to populate, by selector",
+    ["select"],
+    buckets=[0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 15.0],
+    registry=registry,
+)
+PAGE_TIMING = Histogram(
+    "parabank_page_timing_seconds",
+    "Navigation and paint timings of ParaBank pages (ttfb, dom_content_loaded, load, fcp, lcp)",
+    ["page", "metric"],
+    buckets=[0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0],
+    registry=registry,
+)
+PAGE_JS_HEAP = Histogram(
+    "parabank_page_js_heap_bytes",
+    "Used JS heap of ParaBank pages after load (Chromium)",
+    ["page"],
+    buckets=[1e6, 2.5e6, 5e6, 10e6, 25e6, 50e6, 100e6],
+    registry=registry,
+)
+STEP_DURATION = Histogram(
+    "test_step_duration_seconds",
+    "Duration of page-object and flow steps, by step name",
+    ["step"],
+    buckets=[0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0],
+    registry=registry,
+)
+FIXTURE_DURATION = Histogram(
+    "fixture_duration_seconds",
+    "Own setup and teardown time of pytest fixtures, by fixture and phase",
+    ["fixture", "phase"],
+    buckets=[0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0],
+    registry=registry,
+)
+METRICS_PUSHES_DROPPED = Counter(
+    "metrics_pushes_dropped_total",
+    "Background Pushgateway pushes that failed (gateway down or too slow)",
+    registry=registry,
+)
+METRICS_PUSHES_LATE = Counter(
+    "metrics_pushes_late_total",
+    "Background pushes that landed more than two intervals after the change they carried",
+    registry=registry,
+)
+
+# Seconds between background pushes; changes in between are coalesced into one push
+PUSH_INTERVAL_SECONDS = float(os.environ.get("METRICS_PUSH_INTERVAL", "5"))
+PUSH_TIMEOUT_SECONDS = 5.0
+# Off while the run-wide /metrics endpoint (metrics_server) collects worker metrics instead
+_pushes_enabled = True
+
+
+def set_pushes_enabled(enabled: bool) -> None:
+    """Turn the per-test Pushgateway pushes of ``ExecutionMetrics`` on or off."""
+    global _pushes_enabled  # pylint: disable=global-statement
+    _pushes_enabled = enabled
 
 
 def _pushgateway_url() -> str:
@@ -111,6 +216,119 @@ def push_metrics(job_name: str = "para-bank-tests", grouping_key: Optional[dict]
         logger.debug("Pushgateway unavailable; skipping push (job=%s): %s", job_name, e)
 
 
+class _KeepAliveHandler:
+    """``push_to_gateway`` handler that reuses one HTTP connection between pushes."""
+
+    def __init__(self) -> None:
+        self.http = urllib3.PoolManager(num_pools=1, maxsize=1, retries=False)
+
+    def __call__(
+        self,
+        url: str,
+        method: str,
+        timeout: Optional[float],
+        headers: List[Tuple[str, str]],
+        data: bytes,
+    ) -> Callable[[], None]:
+        def handle() -> None:
+            response = self.http.request(
+                method, url, body=data, headers=dict(headers), timeout=timeout
+            )
+            if response.status >= 400:
+                raise OSError(f"error talking to pushgateway: {response.status}")
+
+        return handle
+
+
+class BackgroundPusher:
+    """Per-worker thread that pushes the registry at most every ``interval`` seconds.
+
+    Tests only mark the registry dirty (``request_push``), which never blocks; the
+    thread coalesces everything that changed since its last push into one request.
+    A slow or unreachable Pushgateway therefore costs nothing on the test thread.
+    """
+
+    def __init__(
+        self,
+        job_name: str = "para-bank-tests",
+        grouping_key: Optional[dict] = None,
+        interval: float = PUSH_INTERVAL_SECONDS,
+    ) -> None:
+        self.job_name = job_name
+        self.grouping_key = grouping_key
+        self.interval = interval
+        self._handler = _KeepAliveHandler()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        # Time of the oldest change not yet pushed (None when nothing is pending)
+        self._pending_since: Optional[float] = None
+        self._thread = threading.Thread(target=self._run, name="metrics-pusher", daemon=True)
+        self._thread.start()
+
+    def request_push(self) -> None:
+        """Mark the registry as changed; the thread pushes it on its next tick."""
+        with self._lock:
+            if self._pending_since is None:
+                self._pending_since = time.monotonic()
+        self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self._wake.wait()
+            self._wake.clear()
+            self._push_pending()
+            # Coalesce everything that arrives during the interval into the next push
+            self._stopping.wait(self.interval)
+
+    def _push_pending(self) -> None:
+        with self._lock:
+            pending_since, self._pending_since = self._pending_since, None
+        if pending_since is None:
+            return
+        try:
+            push_to_gateway(
+                _pushgateway_url(),
+                job=self.job_name,
+                registry=registry,
+                grouping_key=self.grouping_key,
+                timeout=PUSH_TIMEOUT_SECONDS,
+                handler=self._handler,
+            )
+        except Exception as e:
+            METRICS_PUSHES_DROPPED.inc()
+            logger.debug("Pushgateway unavailable; dropped push (job=%s): %s", self.job_name, e)
+            return
+        if time.monotonic() - pending_since > 2 * self.interval:
+            METRICS_PUSHES_LATE.inc()
+
+    def flush(self, timeout: float = PUSH_TIMEOUT_SECONDS) -> None:
+        """Stop the thread and push whatever is still pending (session finish)."""
+        self._stopping.set()
+        self._wake.set()
+        self._thread.join(timeout)
+        self._push_pending()
+        self._handler.http.clear()
+
+
+_pushers: Dict[Tuple[Tuple[str, str], ...], BackgroundPusher] = {}
+
+
+def get_pusher(grouping_key: Optional[dict] = None) -> BackgroundPusher:
+    """Return this process's background pusher for ``grouping_key``, starting it if needed."""
+    key = tuple(sorted((grouping_key or {}).items()))
+    if key not in _pushers:
+        _pushers[key] = BackgroundPusher(grouping_key=grouping_key)
+    return _pushers[key]
+
+
+def flush_metrics() -> None:
+    """Push pending metrics from every background pusher and stop their threads."""
+    while _pushers:
+        _, pusher = _pushers.popitem()
+        pusher.flush()
+
+
 def cleanup_metrics(job_name: str = "para-bank-tests") -> None:
     """Cleanup old metrics from the Pushgateway.
 
@@ -194,8 +412,9 @@ class ExecutionMetrics:
         else:
             TEST_FAILURES.inc()
 
-        # Push metrics after each test with the grouping key
-        push_metrics(grouping_key=self.grouping_key)
+        # Hand the push to the worker's background pusher; never block the test on it
+        if _pushes_enabled:
+            get_pusher(self.grouping_key).request_push()
 
 
 # For direct execution
@@ -0,0 +1,224 @@
+"""Live ``/metrics`` endpoint for the whole run, fed by the xdist workers.
+
+Each worker keeps its own ``metrics_pusher.registry``. Instead of pushing that
+registry to the Pushgateway after every test, workers attach the *changes* since
+their previous report to the teardown report of each test. xdist already ships
+those reports to the controller, which folds the deltas into one aggregated
+registry and serves it on ``--metrics-port`` (default 8000, the
+``para-bank-tests`` target in ``config/prometheus/prometheus.yml``).
+
+Counters and histograms are summed across workers; gauges keep one series per
+worker under a ``worker`` label. ``--metrics-port=0`` turns the endpoint off and
+restores the Pushgateway pushes.
+"""
+import logging
+import os
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import pytest
+from _pytest.config import Config as PytestConfig
+from _pytest.config.argparsing import Parser
+from _pytest.nodes import Item
+from _pytest.runner import CallInfo
+from prometheus_client import CollectorRegistry, start_http_server
+from prometheus_client.metrics_core import Metric
+
+from src.utils.metrics_pusher import registry, set_pushes_enabled
+from src.utils.xdist_stats import collect, publish
+
+logger = logging.getLogger("parabank")
+
+DEFAULT_METRICS_PORT = int(os.environ.get("METRICS_PORT", "8000"))
+# Families whose samples only ever grow; everything else is sent as a current value
+_MONOTONIC_TYPES = {"counter", "histogram", "summary"}
+
+Labels = Tuple[Tuple[str, str], ...]
+SampleKey = Tuple[str, Labels]
+
+
+class MetricDeltaTracker:
+    """Turns a registry into compact deltas against what was sent last time.
+
+    A delta is a plain dict so execnet can ship it::
+
+        {"families": {name: [type, help]},            # first sighting only
+         "counters": [[family, sample, labels, increase], ...],
+         "gauges":   [[family, sample, labels, value], ...]}
+    """
+
+    def __init__(self, source: CollectorRegistry) -> None:
+        self.source = source
+        self._sent: Dict[SampleKey, float] = {}
+        self._families: Dict[str, str] = {}
+
+    def delta(self) -> Dict[str, Any]:
+        families: Dict[str, List[str]] = {}
+        counters: List[List[Any]] = []
+        gauges: List[List[Any]] = []
+        for family in self.source.collect():
+            if family.name not in self._families:
+                self._families[family.name] = family.type
+                families[family.name] = [family.type, family.documentation]
+            for sample in family.samples:
+                if sample.name.endswith("_created"):
+                    continue  # creation timestamps differ per worker and cannot be summed
+                labels = sorted(sample.labels.items())
+                key = (sample.name, tuple((k, v) for k, v in labels))
+                previous = self._sent.get(key)
+                if previous == sample.value:
+                    continue
+                self._sent[key] = sample.value
+                if family.type in _MONOTONIC_TYPES:
+                    counters.append(
+                        [family.name, sample.name, labels, sample.value - (previous or 0.0)]
+                    )
+                else:
+                    gauges.append([family.name, sample.name, labels, sample.value])
+        if not (families or counters or gauges):
+            return {}
+        return {"families": families, "counters": counters, "gauges": gauges}
+
+
+class MetricsAggregator:
+    """Collector holding the run-wide view built from every worker's deltas."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._families: Dict[str, Tuple[str, str]] = {}
+        self._totals: Dict[str, Dict[SampleKey, float]] = {}
+        self._gauges: Dict[str, Dict[SampleKey, float]] = {}
+        self.deltas_applied = 0
+
+    def apply(self, worker: str, delta: Dict[str, Any]) -> None:
+        """Fold one worker delta into the aggregate."""
+        with self._lock:
+            for name, (metric_type, documentation) in delta.get("families", {}).items():
+                self._families.setdefault(name, (metric_type, documentation))
+            for family, sample, labels, increase in delta.get("counters", []):
+                key = (sample, tuple((k, v) for k, v in labels))
+                totals = self._totals.setdefault(family, {})
+                totals[key] = totals.get(key, 0.0) + increase
+            for family, sample, labels, value in delta.get("gauges", []):
+                labels = sorted([*labels, ("worker", worker)])
+                key = (sample, tuple((k, v) for k, v in labels))
+                self._gauges.setdefault(family, {})[key] = value
+            self.deltas_applied += 1
+
+    def collect(self) -> Iterable[Metric]:
+        with self._lock:
+            for name, (metric_type, documentation) in self._families.items():
+                metric = Metric(name, documentation, metric_type)
+                samples = {**self._totals.get(name, {}), **self._gauges.get(name, {})}
+                for (sample, labels), value in sorted(samples.items()):
+                    metric.add_sample(sample, dict(labels), value)
+                yield metric
+
+
+AGGREGATOR = MetricsAggregator()
+_tracker: Optional[MetricDeltaTracker] = None
+_server: Optional[Any] = None
+
+
+def _streaming(config: PytestConfig) -> bool:
+    workerinput = getattr(config, "workerinput", None)
+    if workerinput is not None:
+        return bool(workerinput.get("metrics_streaming"))
+    return _server is not None
+
+
+def _worker_name(config: PytestConfig) -> str:
+    workerinput = getattr(config, "workerinput", None)
+    return str(workerinput["workerid"]) if workerinput is not None else "master"
+
+
+def pytest_addoption(parser: Parser) -> None:
+    """Register the live metrics endpoint options."""
+    group = parser.getgroup("parabank-metrics", "Live metrics endpoint")
+    group.addoption(
+        "--metrics-port",
+        action="store",
+        type=int,
+        default=DEFAULT_METRICS_PORT,
+        help="Serve aggregated run metrics on this port (0: push to the Pushgateway instead; "
+        f"default: METRICS_PORT or {DEFAULT_METRICS_PORT})",
+    )
+    group.addoption(
+        "--metrics-host",
+        action="store",
+        default="0.0.0.0",  # nosec B104 - Prometheus scrapes from the docker network
+        help="Address the metrics endpoint binds to (default: 0.0.0.0)",
+    )
+
+
+def pytest_configure(config: PytestConfig) -> None:
+    """Start the endpoint in the controller; workers switch from pushing to streaming."""
+    global _server, _tracker  # pylint: disable=global-statement
+    if hasattr(config, "workerinput"):
+        if config.workerinput.get("metrics_streaming"):
+            set_pushes_enabled(False)
+            _tracker = MetricDeltaTracker(registry)
+        return
+    port = config.getoption("--metrics-port")
+    if not port:
+        return
+    aggregated = CollectorRegistry(auto_describe=True)
+    aggregated.register(AGGREGATOR)
+    try:
+        _server = start_http_server(port, config.getoption("--metrics-host"), aggregated)
+    except OSError as e:
+        logger.warning(f"Metrics endpoint not started on port {port} ({e}); using Pushgateway")
+        return
+    logger.info(f"Serving aggregated run metrics on :{port}/metrics")
+    set_pushes_enabled(False)
+    if getattr(config.option, "dist", "no") == "no":
+        # No xdist workers: this process runs the tests and feeds the aggregate itself
+        _tracker = MetricDeltaTracker(registry)
+
+
+def pytest_unconfigure(config: PytestConfig) -> None:
+    global _server  # pylint: disable=global-statement
+    if isinstance(_server, tuple):
+        _server[0].shutdown()
+        _server[0].server_close()
+    _server = None
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node: Any) -> None:
+    """Tell each worker whether to stream deltas instead of pushing (controller side)."""
+    node.workerinput["metrics_streaming"] = _server is not None
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item: Item, call: CallInfo[None]) -> Any:
+    """Attach the registry changes since the last test to its teardown report."""
+    outcome = yield
+    if call.when == "teardown" and _tracker is not None and _streaming(item.config):
+        delta = _tracker.delta()
+        if delta:
+            outcome.get_result().metric_delta = delta
+
+
+def pytest_runtest_logreport(report: pytest.TestReport) -> None:
+    """Fold deltas arriving on test reports into the aggregate (controller side)."""
+    delta = getattr(report, "metric_delta", None)
+    if delta and _server is not None:
+        AGGREGATOR.apply(getattr(report, "worker_id", None) or "master", delta)
+
+
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    """Send what changed after the last teardown report (e.g. the last test's counters)."""
+    if _tracker is None:
+        return
+    delta = _tracker.delta()
+    if not publish(session.config, "metric_delta", delta) and delta and _server is not None:
+        AGGREGATOR.apply(_worker_name(session.config), delta)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node: Any, error: Any) -> None:
+    """Apply a finished worker's final delta (controller side)."""
+    delta = collect(node, "metric_delta")
+    if delta and _server is not None:
+        AGGREGATOR.apply(str(node.gateway.id), delta)
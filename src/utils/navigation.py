@@ -0,0 +1,235 @@
+"""Deep-link navigation between page objects.
+
+Most tests used to reach a page the way a user would: open the accounts
+overview, wait for the left panel, click a link and wait for a second page load.
+Page objects now declare where they live with ``@route``:
+
+* ``url``: canonical URL relative to ``base_url``. It may contain
+  ``{placeholders}`` that are filled from navigation parameters, e.g.
+  ``activity.htm?id={account_id}``.
+* ``requires``: preconditions of a direct visit. ``AUTH`` needs a logged-in
+  session, and ``SELECTED_ACCOUNT`` needs an ``account_id``.
+* ``link`` / ``link_on``: the anchor that leads to the page and where it is
+  found (``EVERY_PAGE`` header/footer, the ``ACCOUNT_MENU`` of logged-in pages,
+  or the name of one page object).
+
+``Navigator.goto(PageClass)`` searches that graph for the cheapest route from
+the current URL. A direct load costs ``LOAD_COST``, and a click costs the load
+it triggers plus ``CLICK_COST``. The result is usually a single ``goto``, or
+nothing when the page is already open. A click is only used when a
+precondition cannot be met directly, e.g. no ``account_id`` for the account
+details page. ``click_through=True``, or ``NAV_CLICK_THROUGH=1`` for the whole
+run, makes the last hop a click for tests that verify the link itself.
+"""
+import heapq
+import logging
+import os
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple, TypeVar, Union
+from urllib.parse import urlsplit
+
+from playwright.sync_api import Page
+
+from src.utils.stability import safe_click
+
+logger = logging.getLogger("parabank")
+
+AUTH = "auth"
+SELECTED_ACCOUNT = "selected_account"
+PRECONDITIONS = (AUTH, SELECTED_ACCOUNT)
+
+EVERY_PAGE = "*"
+ACCOUNT_MENU = "menu"
+
+LOAD_COST = 1.0
+# Waiting for the link to become actionable, on top of the load the click triggers
+CLICK_COST = 0.5
+
+T = TypeVar("T", bound=type)
+
+
+class NavigationError(Exception):
+    """Raised when no route reaches a page with its preconditions met."""
+
+
+@dataclass(frozen=True)
+class PageRoute:
+    """Where a page object lives and how it can be reached."""
+
+    name: str
+    url: str
+    requires: FrozenSet[str] = frozenset()
+    link: Optional[str] = None
+    link_on: str = EVERY_PAGE
+
+    @property
+    def path(self) -> str:
+        return self.url.split("?", 1)[0]
+
+    def deep_link(self, params: Dict[str, Any]) -> Optional[str]:
+        """The URL with ``params`` filled in, or None if a placeholder has no value."""
+        try:
+            return self.url.format(**params)
+        except KeyError:
+            return None
+
+
+@dataclass(frozen=True)
+class NavStep:
+    """One hop of a route: a direct ``goto`` or a ``click`` on a link."""
+
+    action: str
+    target: str
+    value: str
+
+    def __str__(self) -> str:
+        return f"{self.action} {self.value}"
+
+
+ROUTES: Dict[str, PageRoute] = {}
+
+
+def route(
+    url: str,
+    requires: Iterable[str] = (),
+    link: Optional[str] = None,
+    link_on: Union[str, type] = EVERY_PAGE,
+) -> Callable[[T], T]:
+    """Class decorator declaring a page object's URL, preconditions and incoming link."""
+    unknown = set(requires) - set(PRECONDITIONS)
+    if unknown:
+        raise ValueError(f"Unknown navigation preconditions: {sorted(unknown)}")
+
+    def register(cls: T) -> T:
+        page_route = PageRoute(
+            cls.__name__,
+            url,
+            frozenset(requires),
+            link,
+            link_on.__name__ if isinstance(link_on, type) else link_on,
+        )
+        ROUTES[page_route.name] = page_route
+        setattr(cls, "ROUTE", page_route)
+        return cls
+
+    return register
+
+
+def click_through_default() -> bool:
+    """Return True if ``NAV_CLICK_THROUGH`` forces link clicks for the whole run."""
+    return os.environ.get("NAV_CLICK_THROUGH", "").lower() in ("1", "true", "yes")
+
+
+class Navigator:
+    """Moves a page between routed page objects along the cheapest route."""
+
+    def __init__(
+        self,
+        page: Page,
+        base_url: Optional[str] = None,
+        click_through: Optional[bool] = None,
+        authenticated: Optional[bool] = None,
+    ) -> None:
+        """
+        Args:
+            page: The Playwright page to navigate
+            base_url: Application base URL; defaults to the directory of the current URL
+            click_through: Force the last hop to be a link click (default: NAV_CLICK_THROUGH)
+            authenticated: Whether the session is logged in. None trusts the caller
+                (``user_login``) and lets direct visits to ``AUTH`` pages through.
+        """
+        self.page = page
+        self.base_url = (base_url or page.url.rsplit("/", 1)[0]).rstrip("/")
+        self.click_through = click_through_default() if click_through is None else click_through
+        self.authenticated = authenticated
+
+    def current(self) -> Optional[str]:
+        """Name of the routed page the browser is on, or None (blank or unknown page)."""
+        url = self.page.url
+        if not url.startswith(self.base_url):
+            return None
+        filename = urlsplit(url).path.rsplit("/", 1)[-1]
+        return next((r.name for r in ROUTES.values() if r.path == filename), None)
+
+    def _satisfied(self, page_route: PageRoute, params: Dict[str, Any]) -> bool:
+        if AUTH in page_route.requires and self.authenticated is False:
+            return False
+        return SELECTED_ACCOUNT not in page_route.requires or "account_id" in params
+
+    def _has_link(self, node: Optional[str], page_route: PageRoute) -> bool:
+        if node is None or page_route.link is None:
+            return False
+        if page_route.link_on == EVERY_PAGE:
+            return True
+        if page_route.link_on == ACCOUNT_MENU:
+            return AUTH in ROUTES[node].requires
+        return page_route.link_on == node
+
+    def _edges(
+        self, node: Optional[str], goal: PageRoute, params: Dict[str, Any], force_click: bool
+    ) -> Iterable[Tuple[NavStep, float]]:
+        for page_route in ROUTES.values():
+            if AUTH in page_route.requires and self.authenticated is False:
+                continue
+            # A click can meet a precondition (e.g. select an account); a deep link cannot
+            url = page_route.deep_link(params) if self._satisfied(page_route, params) else None
+            if url is not None and not (force_click and page_route is goal):
+                yield NavStep("goto", page_route.name, url), LOAD_COST
+            if self._has_link(node, page_route):
+                yield NavStep("click", page_route.name, str(page_route.link)), (
+                    LOAD_COST + CLICK_COST
+                )
+
+    def plan(
+        self, target: Union[type, str], click_through: Optional[bool] = None, **params: Any
+    ) -> List[NavStep]:
+        """Cheapest list of steps from the current page to ``target`` (Dijkstra)."""
+        name = target if isinstance(target, str) else target.__name__
+        goal = ROUTES.get(name)
+        if goal is None:
+            raise NavigationError(f"{name} does not declare a route")
+        if AUTH in goal.requires and self.authenticated is False:
+            raise NavigationError(f"{name} requires a logged-in session")
+        force_click = self.click_through if click_through is None else click_through
+        start = self.current()
+        if start == goal.name and not force_click:
+            url = goal.deep_link(params)
+            if url is None or self.page.url == f"{self.base_url}/{url}":
+                return []
+
+        counter = 0
+        frontier: List[Tuple[float, int, Optional[str], List[NavStep]]] = [
+            (0.0, counter, start, [])
+        ]
+        settled: Dict[Optional[str], float] = {}
+        while frontier:
+            cost, _, node, steps = heapq.heappop(frontier)
+            if node == goal.name and steps:
+                # Only click edges lead to the goal when a click is forced
+                return steps
+            if node in settled:
+                continue
+            settled[node] = cost
+            for step, step_cost in self._edges(node, goal, params, force_click):
+                if step.target not in settled or step.target == goal.name:
+                    counter += 1
+                    heapq.heappush(
+                        frontier, (cost + step_cost, counter, step.target, [*steps, step])
+                    )
+        how = "by clicking a link" if force_click else "with its preconditions met"
+        raise NavigationError(f"No route to {name} {how} from {self.page.url}")
+
+    def goto(
+        self, target: Union[type, str], click_through: Optional[bool] = None, **params: Any
+    ) -> List[NavStep]:
+        """Navigate to ``target`` along the cheapest route and return the steps taken."""
+        steps = self.plan(target, click_through, **params)
+        for step in steps:
+            if step.action == "goto":
+                self.page.goto(f"{self.base_url}/{step.value}")
+            else:
+                safe_click(self.page.locator(step.value))
+                self.page.wait_for_load_state("load")
+        name = target if isinstance(target, str) else target.__name__
+        logger.info(f"Navigated to {name}: {' -> '.join(map(str, steps)) or 'already there'}")
+        return steps
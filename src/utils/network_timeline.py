@@ -0,0 +1,333 @@
+"""Per-test network timeline: a bounded waterfall of the app requests a test made.
+
+``attach_circuit_breaker`` feeds every finished app request of the running
+test into a ``NetworkTimeline``. The timeline is a fixed-size ring with one
+typed array per column, so a request costs 20 bytes and no Python object.
+A test that makes thousands of requests keeps only the last
+``--network-timeline-size`` of them and counts the rest as dropped.
+
+Columns:
+
+* ``start``: seconds since the test started.
+* ``ttfb`` and ``end``: milliseconds after the request started. ``-1`` means
+  the response or its body never arrived.
+* ``size``: the response's Content-Length. ``-1`` means unknown, e.g. a chunked
+  response.
+* ``status``: the HTTP status. ``0`` means the request failed.
+* ``endpoint``: an index into the timeline's table of ``normalize_endpoint``
+  labels.
+
+A test that fails, or takes longer than ``--network-timeline-slow`` seconds,
+gets its waterfall attached to its report in three places:
+
+* as a "network timeline" section, shown in the terminal and the HTML log;
+* as a bar chart in the pytest-html report;
+* as ``test-results/network/<test>.txt``, whose path is the JUnit property
+  ``network_timeline``.
+"""
+import html
+import logging
+import time
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Generator, List, Optional, Tuple
+
+import pytest
+from _pytest.config import Config as PytestConfig
+from _pytest.config.argparsing import Parser
+from _pytest.nodes import Item
+from _pytest.runner import CallInfo
+from _pytest.terminal import TerminalReporter
+
+from src.utils.artifacts import artifact_name
+from src.utils.xdist_stats import collect, publish, summary_section
+
+try:
+    from pytest_html import extras as html_extras  # type: ignore
+except ImportError:  # pragma: no cover - pytest-html not installed
+    html_extras = None
+
+logger = logging.getLogger("parabank")
+
+DEFAULT_CAPACITY = 500
+DEFAULT_SLOW_SECONDS = 30.0
+# Distinct endpoint labels per timeline; anything beyond it is recorded as "other"
+MAX_ENDPOINTS = 1000
+WATERFALL_WIDTH = 40
+TIMELINE_DIR = Path("test-results") / "network"
+
+# start (s), ttfb (ms), end (ms), size (bytes), status, endpoint
+Entry = Tuple[float, float, float, int, int, str]
+
+
+class NetworkTimeline:
+    """Ring buffer of one test's app requests, stored as one array per column."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        self.capacity = max(capacity, 1)
+        self.started = time.time()
+        self.count = 0
+        self.failed = 0
+        self.bytes = 0
+        self._start = array("f", [0.0]) * self.capacity
+        self._ttfb = array("f", [0.0]) * self.capacity
+        self._end = array("f", [0.0]) * self.capacity
+        self._size = array("i", [0]) * self.capacity
+        self._status = array("H", [0]) * self.capacity
+        self._endpoint = array("H", [0]) * self.capacity
+        self._endpoint_ids: Dict[str, int] = {}
+        self._endpoints: List[str] = []
+
+    @property
+    def dropped(self) -> int:
+        """Requests overwritten by newer ones."""
+        return max(self.count - self.capacity, 0)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the columns, which does not grow with the request count."""
+        columns = (self._start, self._ttfb, self._end, self._size, self._status, self._endpoint)
+        return sum(column.itemsize * len(column) for column in columns)
+
+    def record(
+        self, endpoint: str, status: int, started: float, ttfb_ms: float, end_ms: float, size: int
+    ) -> None:
+        """Add a finished request; ``started`` is its epoch start time in seconds."""
+        slot = self.count % self.capacity
+        self._start[slot] = started - self.started
+        self._ttfb[slot] = ttfb_ms
+        self._end[slot] = end_ms
+        self._size[slot] = min(size, 2**31 - 1)
+        self._status[slot] = status
+        self._endpoint[slot] = self._endpoint_id(endpoint)
+        self.count += 1
+        if status == 0 or status >= 500:
+            self.failed += 1
+        if size > 0:
+            self.bytes += size
+
+    def _endpoint_id(self, endpoint: str) -> int:
+        index = self._endpoint_ids.get(endpoint)
+        if index is None:
+            if len(self._endpoints) >= MAX_ENDPOINTS:
+                endpoint = "other"
+                index = self._endpoint_ids.get(endpoint)
+            if index is None:
+                index = self._endpoint_ids[endpoint] = len(self._endpoints)
+                self._endpoints.append(endpoint)
+        return index
+
+    def entries(self) -> List[Entry]:
+        """The retained requests, oldest first in completion order."""
+        retained = min(self.count, self.capacity)
+        first = self.count - retained
+        slots = [(first + i) % self.capacity for i in range(retained)]
+        return [
+            (
+                self._start[slot],
+                self._ttfb[slot],
+                self._end[slot],
+                self._size[slot],
+                self._status[slot],
+                self._endpoints[self._endpoint[slot]],
+            )
+            for slot in slots
+        ]
+
+    def recent(self, limit: int) -> List[Entry]:
+        """The last ``limit`` requests to finish."""
+        return self.entries()[-limit:] if limit > 0 else []
+
+    def summary(self) -> str:
+        return (
+            f"{self.count} request(s), {self.failed} failed, {self.dropped} dropped, "
+            f"{_format_size(self.bytes)} received"
+        )
+
+    def waterfall(self, width: int = WATERFALL_WIDTH) -> str:
+        """Plain-text waterfall: ``-`` waits for the first byte, ``#`` receives the body."""
+        entries = sorted(self.entries())
+        lines = [self.summary()]
+        if not entries:
+            return lines[0]
+        first, span = _span(entries)
+        lines.append(f"{'start':>9} {'ttfb':>7} {'end':>7} {'status':>6} {'size':>8}  endpoint")
+        for start, ttfb, end, size, status, endpoint in entries:
+            offset, waiting, receiving = _bar(start - first, ttfb, end, span, width)
+            bar = (" " * offset + "-" * waiting + "#" * receiving).ljust(width)
+            lines.append(
+                f"{start:+8.3f}s {_format_ms(ttfb):>7} {_format_ms(end):>7} {status or 'fail':>6} "
+                f"{_format_size(size):>8}  |{bar}| {endpoint}"
+            )
+        return "\n".join(lines)
+
+    def html_waterfall(self) -> str:
+        """The waterfall as an HTML table with bars, for the pytest-html report."""
+        entries = sorted(self.entries())
+        if not entries:
+            return f"<p>Network timeline: {html.escape(self.summary())}</p>"
+        first, span = _span(entries)
+        rows = []
+        for start, ttfb, end, size, status, endpoint in entries:
+            offset, waiting, receiving = _bar(start - first, ttfb, end, span, 100)
+            colour = "#c0392b" if status == 0 or status >= 500 else "#2e86c1"
+            rows.append(
+                f"<tr><td>{start:+.3f}s</td><td>{_format_ms(ttfb)}</td><td>{_format_ms(end)}</td>"
+                f"<td>{status or 'failed'}</td><td>{_format_size(size)}</td>"
+                f"<td>{html.escape(endpoint)}</td>"
+                f'<td style="width:300px"><div style="margin-left:{offset}%;white-space:nowrap">'
+                f'<span style="display:inline-block;height:8px;width:{waiting}%;'
+                f'background:#aed6f1"></span>'
+                f'<span style="display:inline-block;height:8px;width:{receiving}%;'
+                f'background:{colour}"></span></div></td></tr>'
+            )
+        return (
+            f"<p>Network timeline: {html.escape(self.summary())}</p>"
+            '<table style="font-size:11px"><tr><th>start</th><th>ttfb</th><th>end</th>'
+            "<th>status</th><th>size</th><th>endpoint</th><th>waterfall</th></tr>"
+            f"{''.join(rows)}</table>"
+        )
+
+
+def _span(entries: List[Entry]) -> Tuple[float, float]:
+    """Start of the first request and the seconds until the last one ended."""
+    first = entries[0][0]
+    last = max(start + max(end, ttfb, 0.0) / 1000 for start, ttfb, end, *_ in entries)
+    return first, max(last - first, 0.001)
+
+
+def _bar(start: float, ttfb: float, end: float, span: float, width: int) -> Tuple[int, int, int]:
+    """Offset, waiting and receiving widths of one request's bar, out of ``width``."""
+    scale = width / span
+    offset = min(int(start * scale), width - 1)
+    waiting = max(int(ttfb / 1000 * scale), 1) if ttfb >= 0 else 0
+    receiving = max(int((end - max(ttfb, 0.0)) / 1000 * scale), 1) if end >= 0 else 0
+    waiting = min(waiting, width - offset)
+    return offset, waiting, min(receiving, width - offset - waiting)
+
+
+def _format_ms(ms: float) -> str:
+    return f"{ms:.0f}ms" if ms >= 0 else "-"
+
+
+def _format_size(size: int) -> str:
+    if size < 0:
+        return "?"
+    if size < 1024:
+        return f"{size}B"
+    if size < 1024 * 1024:
+        return f"{size / 1024:.1f}kB"
+    return f"{size / 1024 / 1024:.1f}MB"
+
+
+_capacity = DEFAULT_CAPACITY
+_slow_seconds = DEFAULT_SLOW_SECONDS
+_current: Optional[NetworkTimeline] = None
+# Run totals of this process (merged from the workers on the controller)
+_run_stats = {"tests": 0, "requests": 0, "dropped": 0, "failed_tests": 0, "slow_tests": 0}
+
+
+def current_timeline() -> Optional[NetworkTimeline]:
+    """The running test's timeline, or None outside a test or when disabled."""
+    return _current
+
+
+def pytest_addoption(parser: Parser) -> None:
+    """Register the network timeline options."""
+    group = parser.getgroup("parabank-network-timeline", "per-test network timeline")
+    group.addoption(
+        "--network-timeline-size",
+        action="store",
+        type=int,
+        default=DEFAULT_CAPACITY,
+        help="Requests kept per test for the network waterfall "
+        f"(default: {DEFAULT_CAPACITY}; 0 disables the timeline)",
+    )
+    group.addoption(
+        "--network-timeline-slow",
+        action="store",
+        type=float,
+        default=DEFAULT_SLOW_SECONDS,
+        help="Attach the waterfall to passing tests that take longer than this many seconds "
+        f"(default: {DEFAULT_SLOW_SECONDS:.0f}; 0: failed tests only)",
+    )
+
+
+def pytest_configure(config: PytestConfig) -> None:
+    """Read the timeline size and slow-test threshold."""
+    global _capacity, _slow_seconds  # pylint: disable=global-statement
+    _capacity = config.getoption("--network-timeline-size")
+    _slow_seconds = config.getoption("--network-timeline-slow")
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item: Item, nextitem: Optional[Item]) -> Generator[None, None, None]:
+    """Give each test its own timeline for setup, call and teardown."""
+    global _current  # pylint: disable=global-statement
+    if _capacity <= 0:
+        yield
+        return
+    _current = NetworkTimeline(_capacity)
+    yield
+    if _current.count:
+        _run_stats["tests"] += 1
+        _run_stats["requests"] += _current.count
+        _run_stats["dropped"] += _current.dropped
+    _current = None
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item: Item, call: CallInfo[None]) -> Generator[Any, None, None]:
+    """Attach the waterfall to the report of a failed or slow test."""
+    outcome: Any = yield
+    report = outcome.get_result()
+    timeline = _current
+    if timeline is None or not timeline.count or report.when == "teardown":
+        return
+    slow = bool(_slow_seconds) and time.time() - timeline.started > _slow_seconds
+    if not report.failed and not (report.when == "call" and slow):
+        return
+    _run_stats["failed_tests" if report.failed else "slow_tests"] += 1
+    report.sections.append(("network timeline", timeline.waterfall()))
+    if html_extras is not None:
+        extras = getattr(report, "extras", [])
+        report.extras = [*extras, html_extras.html(timeline.html_waterfall())]
+    try:
+        TIMELINE_DIR.mkdir(parents=True, exist_ok=True)
+        path = TIMELINE_DIR / f"{artifact_name(item)}.txt"
+        path.write_text(f"{item.nodeid}\n{timeline.waterfall()}\n", encoding="utf-8")
+        # JUnit writes the properties of the teardown report, which copies the item's
+        item.user_properties.append(("network_timeline", str(path)))
+    except OSError as e:
+        logger.debug(f"Could not write network timeline: {e}")
+
+
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    """Hand the timeline totals to the controller."""
+    publish(session.config, "network_timeline", dict(_run_stats))
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node: Any, error: Any) -> None:
+    """Merge a finished worker's timeline totals (controller side)."""
+    data = collect(node, "network_timeline")
+    if data:
+        for key, value in data.items():
+            _run_stats[key] += value
+
+
+def pytest_terminal_summary(terminalreporter: TerminalReporter, config: PytestConfig) -> None:
+    """Report how many requests were recorded and how many waterfalls were attached."""
+    if not _run_stats["requests"]:
+        return
+    if not summary_section(terminalreporter, config, "network timeline"):
+        return
+    terminalreporter.write_line(
+        f"{_run_stats['requests']} app request(s) over {_run_stats['tests']} test(s), "
+        f"{_run_stats['dropped']} dropped from full buffers "
+        f"({NetworkTimeline(_capacity).nbytes / 1024:.1f} kB per test)"
+    )
+    terminalreporter.write_line(
+        f"waterfalls attached: {_run_stats['failed_tests']} failed, "
+        f"{_run_stats['slow_tests']} slow; written to {TIMELINE_DIR}"
+    )
@@ -0,0 +1,283 @@
+"""Web performance metrics for every ParaBank page the tests visit.
+
+``TEST_DURATION`` only tells how long a whole test took. With ``--web-vitals``,
+every page the tests load reports its own timings. These are read from the
+Navigation Timing and Paint Timing entries and a largest-contentful-paint
+observer:
+
+* ``ttfb``: time to the first byte of the response.
+* ``dom_content_loaded`` and ``load``: the end of those events.
+* ``fcp`` and ``lcp``: first and largest contentful paint. LCP is the largest
+  paint by the time the load event fired.
+
+For Chromium the collector also reads the JS heap size (``JSHeapUsedSize``)
+from CDP ``Performance.getMetrics``.
+
+An init script gathers the timings in the page once ``load`` has fired and
+hands them to Python through an exposed binding. The test never waits for a
+round trip to fetch them. Values go into ``parabank_page_timing_seconds`` and
+``parabank_page_js_heap_bytes``, labelled by the normalized page. They are
+pushed with the other metrics.
+
+``--page-budgets FILE`` sets per-page limits. The JSON maps a page, or ``*``
+for every page, to limits in milliseconds (``heap_mb`` in MB)::
+
+    {"*": {"load": 5000}, "/overview.htm": {"lcp": 2500, "heap_mb": 20}}
+
+A page over budget logs a warning and is listed in the test's report. With
+``--page-budget-action=fail`` it also fails a test that otherwise passed.
+"""
+import json
+import logging
+import os
+from typing import Any, Dict, Generator, List, Optional
+
+import pytest
+from _pytest.config import Config as PytestConfig
+from _pytest.config.argparsing import Parser
+from _pytest.nodes import Item
+from _pytest.runner import CallInfo
+from _pytest.terminal import TerminalReporter
+from playwright.sync_api import CDPSession, Page
+
+from src.utils.metrics_pusher import PAGE_JS_HEAP, PAGE_TIMING
+from src.utils.stability import normalize_endpoint
+from src.utils.xdist_stats import collect, publish, summary_section
+
+logger = logging.getLogger("parabank")
+
+# Also named in _INIT_SCRIPT
+BINDING_NAME = "__parabankPagePerformance"
+TIMINGS = ("ttfb", "dom_content_loaded", "load", "fcp", "lcp")
+BUDGET_ACTIONS = ["warn", "fail"]
+
+# Runs in every document of the page; reports the top frame's timings after load
+_INIT_SCRIPT = """
+(() => {
+  if (window !== window.top) return;
+  let lcp = -1;
+  try {
+    new PerformanceObserver((list) => {
+      const entries = list.getEntries();
+      lcp = entries[entries.length - 1].startTime;
+    }).observe({ type: "largest-contentful-paint", buffered: true });
+  } catch (e) {}
+  window.addEventListener("load", () => setTimeout(() => {
+    const report = window.__parabankPagePerformance;
+    const nav = performance.getEntriesByType("navigation")[0];
+    if (!report || !nav) return;
+    const fcp = performance.getEntriesByName("first-contentful-paint")[0];
+    report({
+      url: location.href,
+      ttfb: nav.responseStart - nav.startTime,
+      dom_content_loaded: nav.domContentLoadedEventEnd - nav.startTime,
+      load: nav.loadEventEnd - nav.startTime,
+      fcp: fcp ? fcp.startTime : -1,
+      lcp,
+    });
+  }, 0));
+})();
+"""
+
+
+class PagePerformance:
+    """Per-page timing totals and budget checks of this process."""
+
+    def __init__(self, budgets: Optional[Dict[str, Dict[str, float]]] = None) -> None:
+        self.budgets = budgets or {}
+        # page -> metric -> [samples, total, max]
+        self.pages: Dict[str, Dict[str, List[float]]] = {}
+        self.violations = 0
+
+    def record(self, page: str, values: Dict[str, float]) -> List[str]:
+        """Add one page load; returns the budgets it broke."""
+        totals = self.pages.setdefault(page, {})
+        for metric, value in values.items():
+            entry = totals.setdefault(metric, [0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += value
+            entry[2] = max(entry[2], value)
+        broken = []
+        for metric, limit in {**self.budgets.get("*", {}), **self.budgets.get(page, {})}.items():
+            if metric == "heap_mb":
+                value, unit = values.get("heap", -1.0) / (1024 * 1024), "MB"
+            else:
+                value, unit = values.get(metric, -1.0), "ms"
+            if value > limit:
+                broken.append(f"{page} {metric} {value:.0f}{unit} > {limit:.0f}{unit}")
+        self.violations += len(broken)
+        return broken
+
+    def merge(self, data: Dict[str, Any]) -> None:
+        for page, metrics in data["pages"].items():
+            totals = self.pages.setdefault(page, {})
+            for metric, (samples, total, peak) in metrics.items():
+                entry = totals.setdefault(metric, [0, 0.0, 0.0])
+                entry[0] += samples
+                entry[1] += total
+                entry[2] = max(entry[2], peak)
+        self.violations += data["violations"]
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"pages": self.pages, "violations": self.violations}
+
+
+_collector: Optional[PagePerformance] = None
+_budget_action = "warn"
+# Budgets broken by the running test
+_test_violations: List[str] = []
+
+
+def load_budgets(path: str) -> Dict[str, Dict[str, float]]:
+    """Read a ``--page-budgets`` file."""
+    with open(path, "r", encoding="utf-8") as f:
+        budgets: Dict[str, Dict[str, float]] = json.load(f)
+    return budgets
+
+
+def _heap_session(page: Page) -> Optional[CDPSession]:
+    """A CDP session with the Performance domain enabled, Chromium only."""
+    browser = page.context.browser
+    if browser is None or browser.browser_type.name != "chromium":
+        return None
+    try:
+        session = page.context.new_cdp_session(page)
+        session.send("Performance.enable")
+    except Exception as e:
+        logger.debug(f"No CDP session for JS heap metrics: {e}")
+        return None
+    return session
+
+
+def attach_page_performance(page: Page, base_url: str) -> None:
+    """Report the timings of every page ``page`` loads (no-op without ``--web-vitals``)."""
+    collector = _collector
+    if collector is None:
+        return
+    base_prefix = base_url.rstrip("/") if base_url else ""
+    cdp = _heap_session(page)
+
+    def _on_page_loaded(source: Dict[str, Any], facts: Dict[str, Any]) -> None:
+        url = str(facts.get("url", ""))
+        if base_prefix and not url.startswith(base_prefix):
+            return
+        name = normalize_endpoint(url, base_prefix)
+        values = {metric: float(facts[metric]) for metric in TIMINGS if facts.get(metric, -1) > 0}
+        for metric, value in values.items():
+            PAGE_TIMING.labels(page=name, metric=metric).observe(value / 1000)
+        if cdp is not None:
+            try:
+                metrics = cdp.send("Performance.getMetrics")["metrics"]
+                heap = next(m["value"] for m in metrics if m["name"] == "JSHeapUsedSize")
+                PAGE_JS_HEAP.labels(page=name).observe(heap)
+                values["heap"] = heap
+            except Exception as e:
+                logger.debug(f"Could not read JS heap metrics: {e}")
+        for violation in collector.record(name, values):
+            logger.warning(f"Page budget exceeded: {violation}")
+            _test_violations.append(violation)
+
+    try:
+        page.expose_binding(BINDING_NAME, _on_page_loaded)
+        page.add_init_script(_INIT_SCRIPT)
+    except Exception as e:
+        logger.debug(f"Could not attach page performance collector: {e}")
+
+
+def pytest_addoption(parser: Parser) -> None:
+    """Register the page performance options."""
+    group = parser.getgroup("parabank-page-performance", "web performance metrics")
+    group.addoption(
+        "--web-vitals",
+        action="store_true",
+        default=os.environ.get("WEB_VITALS", "").lower() in ("1", "true", "yes"),
+        help="Record navigation/paint timings and JS heap of every page visited "
+        "(default: WEB_VITALS env)",
+    )
+    group.addoption(
+        "--page-budgets",
+        action="store",
+        default=None,
+        help="JSON file of per-page budgets in ms (heap_mb in MB); implies --web-vitals",
+    )
+    group.addoption(
+        "--page-budget-action",
+        action="store",
+        default="warn",
+        choices=BUDGET_ACTIONS,
+        help="What a page over budget does to its test (default: warn)",
+    )
+
+
+def pytest_configure(config: PytestConfig) -> None:
+    """Create the collector when web vitals are on."""
+    global _collector, _budget_action  # pylint: disable=global-statement
+    budgets_path = config.getoption("--page-budgets")
+    if not (config.getoption("--web-vitals") or budgets_path):
+        return
+    budgets = load_budgets(budgets_path) if budgets_path else {}
+    _collector = PagePerformance(budgets)
+    _budget_action = config.getoption("--page-budget-action")
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item: Item, nextitem: Optional[Item]) -> Generator[None, None, None]:
+    """Collect the budgets each test breaks separately."""
+    _test_violations.clear()
+    yield
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item: Item, call: CallInfo[None]) -> Generator[Any, None, None]:
+    """List broken budgets on the call report, failing it with ``--page-budget-action=fail``."""
+    outcome: Any = yield
+    report = outcome.get_result()
+    if report.when != "call" or not _test_violations:
+        return
+    text = "\n".join(_test_violations)
+    report.sections.append(("page budgets", text))
+    item.user_properties.append(("page_budget_violations", len(_test_violations)))
+    if _budget_action == "fail" and report.passed:
+        report.outcome = "failed"
+        report.longrepr = f"Page budgets exceeded:\n{text}"
+
+
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    """Hand the page totals to the controller."""
+    if _collector is not None:
+        publish(session.config, "page_performance", _collector.as_dict())
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node: Any, error: Any) -> None:
+    """Merge a finished worker's page totals (controller side)."""
+    data = collect(node, "page_performance")
+    if data and _collector is not None:
+        _collector.merge(data)
+
+
+def pytest_terminal_summary(terminalreporter: TerminalReporter, config: PytestConfig) -> None:
+    """Average and worst timings per page."""
+    if _collector is None or not _collector.pages:
+        return
+    if not summary_section(terminalreporter, config, "page performance"):
+        return
+    terminalreporter.write_line(
+        f"{'page':40} {'loads':>5} {'ttfb':>8} {'dcl':>8} {'load':>8} {'fcp':>8} {'lcp':>8} "
+        f"{'max load':>8} {'max heap':>8}"
+    )
+    for page, metrics in sorted(_collector.pages.items()):
+        loads = max(int(entry[0]) for entry in metrics.values())
+        averages = " ".join(
+            f"{metrics[metric][1] / metrics[metric][0]:6.0f}ms"
+            if metric in metrics
+            else f"{'-':>8}"
+            for metric in TIMINGS
+        )
+        peak_load = f"{metrics['load'][2]:6.0f}ms" if "load" in metrics else f"{'-':>8}"
+        heap = f"{metrics['heap'][2] / 1e6:6.1f}MB" if "heap" in metrics else f"{'-':>8}"
+        terminalreporter.write_line(f"{page[:40]:40} {loads:5d} {averages} {peak_load} {heap}")
+    if _collector.violations:
+        terminalreporter.write_line(
+            f"{_collector.violations} page budget violation(s) ({_budget_action})"
+        )
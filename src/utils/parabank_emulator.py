@@ -0,0 +1,1332 @@
+#!/usr/bin/env python3
+"""
+Local ParaBank stand-in server for hermetic test runs
+
+Serves the ParaBank pages the page objects in ``tests/pages`` drive (same DOM ids
+and texts) plus the ``services_proxy/bank`` JSON endpoints behind them, keeping
+all customers, accounts and transactions in memory. Select it with
+``pytest --env=local`` (each worker starts its own instance on a free port) or
+run it standalone:
+
+    python -m src.utils.parabank_emulator --port 8089
+"""
+
+import argparse
+import html
+import json
+import secrets
+import threading
+from dataclasses import asdict, dataclass, field
+from datetime import date
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+CONTEXT_PATH = "/parabank"
+SESSION_COOKIE = "JSESSIONID"
+ACCOUNT_TYPES = ["CHECKING", "SAVINGS", "LOAN"]
+NEW_ACCOUNT_DEPOSIT = 100.0
+INITIAL_BALANCE = 515.50
+LOAN_PROVIDER = "Wealth Securities Dynamic Loans (WSDL)"
+INTERNAL_ERROR = "An internal error has occurred and has been logged."
+
+# 1x1 transparent GIF, stretched by width/height so logos have a visible box.
+_PIXEL = "data:image/gif;base64,R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7"
+
+
+@dataclass
+class Customer:
+    """A bank customer (mirrors the ParaBank REST ``customer`` payload)."""
+
+    id: int
+    first_name: str
+    last_name: str
+    street: str
+    city: str
+    state: str
+    zip_code: str
+    phone_number: str
+    ssn: str
+    username: str
+    password: str
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "firstName": self.first_name,
+            "lastName": self.last_name,
+            "address": {
+                "street": self.street,
+                "city": self.city,
+                "state": self.state,
+                "zipCode": self.zip_code,
+            },
+            "phoneNumber": self.phone_number,
+            "ssn": self.ssn,
+        }
+
+
+@dataclass
+class Account:
+    id: int
+    customer_id: int
+    type: str
+    balance: float
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "customerId": self.customer_id,
+            "type": self.type,
+            "balance": round(self.balance, 2),
+        }
+
+
+@dataclass
+class Transaction:
+    id: int
+    account_id: int
+    type: str  # "Credit" or "Debit"
+    date: str  # MM-DD-YYYY
+    amount: float
+    description: str
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "accountId": self.account_id,
+            "type": self.type,
+            "date": self.date,
+            "amount": round(self.amount, 2),
+            "description": self.description,
+        }
+
+
+@dataclass
+class BankState:
+    """In-memory bank data shared by every request to one emulator instance."""
+
+    customers: Dict[int, Customer] = field(default_factory=dict)
+    accounts: Dict[int, Account] = field(default_factory=dict)
+    transactions: Dict[int, Transaction] = field(default_factory=dict)
+    sessions: Dict[str, int] = field(default_factory=dict)
+    next_customer_id: int = 12212
+    next_account_id: int = 13344
+    next_transaction_id: int = 14476
+    lock: threading.RLock = field(default_factory=threading.RLock)
+
+    def reset(self) -> None:
+        """Restore the seeded demo data (the classic ``john`` / ``demo`` customer)."""
+        with self.lock:
+            self.customers.clear()
+            self.accounts.clear()
+            self.transactions.clear()
+            self.sessions.clear()
+            self.next_customer_id, self.next_account_id, self.next_transaction_id = (
+                12212,
+                13344,
+                14476,
+            )
+            john = self.add_customer(
+                {
+                    "first_name": "John",
+                    "last_name": "Smith",
+                    "street": "1431 Main St",
+                    "city": "Beverly Hills",
+                    "state": "CA",
+                    "zip_code": "90210",
+                    "phone_number": "310-447-4121",
+                    "ssn": "622-11-9999",
+                    "username": "john",
+                    "password": "demo",
+                }
+            )
+            self.open_account(john.id, "SAVINGS", None, opening_balance=1231.10)
+
+    # --- Customers and sessions -------------------------------------------------
+
+    def add_customer(self, data: Dict[str, str]) -> Customer:
+        with self.lock:
+            customer = Customer(id=self.next_customer_id, **data)
+            self.next_customer_id += 111
+            self.customers[customer.id] = customer
+            self.open_account(customer.id, "CHECKING", None, opening_balance=INITIAL_BALANCE)
+            return customer
+
+    def find_by_username(self, username: str) -> Optional[Customer]:
+        return next((c for c in self.customers.values() if c.username == username), None)
+
+    def login(self, username: str, password: str) -> Optional[Customer]:
+        customer = self.find_by_username(username)
+        if customer is None or customer.password != password:
+            return None
+        return customer
+
+    def new_session(self, customer: Customer) -> str:
+        token = secrets.token_hex(16).upper()
+        with self.lock:
+            self.sessions[token] = customer.id
+        return token
+
+    # --- Accounts and transactions --------------------------------------------
+
+    def customer_accounts(self, customer_id: int) -> List[Account]:
+        return sorted(
+            (a for a in self.accounts.values() if a.customer_id == customer_id),
+            key=lambda a: a.id,
+        )
+
+    def open_account(
+        self,
+        customer_id: int,
+        account_type: str,
+        from_account_id: Optional[int],
+        opening_balance: float = NEW_ACCOUNT_DEPOSIT,
+    ) -> Account:
+        with self.lock:
+            account = Account(self.next_account_id, customer_id, account_type, 0.0)
+            self.next_account_id += 111
+            self.accounts[account.id] = account
+            if from_account_id is not None:
+                self.move(from_account_id, account.id, opening_balance, "Funds Transfer")
+            else:
+                account.balance = opening_balance
+            return account
+
+    def record(self, account_id: int, kind: str, amount: float, description: str) -> None:
+        with self.lock:
+            txn = Transaction(
+                self.next_transaction_id,
+                account_id,
+                kind,
+                date.today().strftime("%m-%d-%Y"),
+                amount,
+                description,
+            )
+            self.next_transaction_id += 111
+            self.transactions[txn.id] = txn
+
+    def move(self, from_id: int, to_id: Optional[int], amount: float, description: str) -> None:
+        """Debit ``from_id`` and credit ``to_id`` (``None`` for external payees)."""
+        with self.lock:
+            source = self.accounts[from_id]
+            source.balance -= amount
+            self.record(from_id, "Debit", amount, f"{description} Sent")
+            if to_id is not None:
+                self.accounts[to_id].balance += amount
+                self.record(to_id, "Credit", amount, f"{description} Received")
+
+    def account_transactions(self, account_id: int) -> List[Transaction]:
+        return sorted(
+            (t for t in self.transactions.values() if t.account_id == account_id),
+            key=lambda t: t.id,
+        )
+
+
+# --- HTML rendering --------------------------------------------------------------
+
+_STYLE = """
+body{font-family:Arial,sans-serif;font-size:13px;margin:0}
+#mainPanel{width:980px;margin:0 auto}
+#topPanel{height:60px}
+#headerPanel ul{list-style:none;margin:0;padding:4px}
+#headerPanel li{display:inline;margin-right:12px}
+#bodyPanel{display:flex;min-height:400px}
+#leftPanel{width:220px;padding:10px;background:#eef}
+#rightPanel{flex:1;padding:10px}
+#footerPanel{width:980px;margin:0 auto;padding:10px}
+#footerPanel li{display:inline}
+.error{color:#c00}
+.hidden{display:none}
+"""
+
+_SCRIPT = (
+    """
+function pbCall(path, method, body) {
+  var opts = {method: method || 'GET', headers: {'Accept': 'application/json'}};
+  if (body !== undefined) {
+    opts.headers['Content-Type'] = 'application/json';
+    opts.body = JSON.stringify(body);
+  }
+  return fetch('services_proxy/bank/' + path, opts).then(function (r) {
+    if (!r.ok) { throw new Error('HTTP ' + r.status); }
+    var type = r.headers.get('Content-Type') || '';
+    return type.indexOf('json') >= 0 ? r.json() : r.text();
+  });
+}
+function pbShow(id, on) { document.getElementById(id).style.display = on ? '' : 'none'; }
+function pbVal(id) { return document.getElementById(id).value.trim(); }
+function pbMoney(v) { return '$' + Number(v).toFixed(2); }
+function pbFail(formId, errorId) {
+  pbShow(formId, false);
+  document.getElementById(errorId).innerHTML = '<h1 class="title">Error!</h1>' +
+    '<p class="error">%s</p>';
+  pbShow(errorId, true);
+}
+"""
+    % INTERNAL_ERROR
+)
+
+
+def _e(value: Any) -> str:
+    return html.escape(str(value), quote=True)
+
+
+def _money(value: float) -> str:
+    return f"-${abs(value):,.2f}" if value < 0 else f"${value:,.2f}"
+
+
+def _layout(title: str, right: str, customer: Optional[Customer], script: str = "") -> str:
+    if customer is None:
+        left = (
+            "<h2>Customer Login</h2>"
+            '<div id="loginPanel">'
+            '<form method="post" action="login.htm" name="login">'
+            '<p><b>Username</b></p><div class="login">'
+            '<input type="text" class="input" name="username"></div>'
+            '<p><b>Password</b></p><div class="login">'
+            '<input type="password" class="input" name="password"></div>'
+            '<div class="login"><input type="submit" class="button" value="Log In"></div>'
+            "</form>"
+            '<p><a href="lookup.htm">Forgot login info?</a></p>'
+            '<p><a href="register.htm">Register</a></p>'
+            "</div>"
+        )
+    else:
+        left = (
+            f'<p class="smallText"><b>Welcome</b> {_e(customer.first_name)} '
+            f"{_e(customer.last_name)}</p>"
+            "<h2>Account Services</h2><ul>"
+            '<li><a href="openaccount.htm">Open New Account</a></li>'
+            '<li><a href="overview.htm">Accounts Overview</a></li>'
+            '<li><a href="transfer.htm">Transfer Funds</a></li>'
+            '<li><a href="billpay.htm">Bill Pay</a></li>'
+            '<li><a href="findtrans.htm">Find Transactions</a></li>'
+            '<li><a href="updateprofile.htm">Update Contact Info</a></li>'
+            '<li><a href="requestloan.htm">Request Loan</a></li>'
+            '<li><a href="logout.htm">Log Out</a></li>'
+            "</ul>"
+        )
+    return (
+        "<!DOCTYPE html><html><head>"
+        f"<title>ParaBank | {_e(title)}</title><style>{_STYLE}</style>"
+        '<script src="static/parabank.js"></script></head><body>'
+        '<div id="mainPanel"><div id="topPanel">'
+        f'<a href="admin.htm"><img class="admin" src="{_PIXEL}" alt="ParaBank" '
+        'width="60" height="40"></a>'
+        f'<a href="index.htm"><img class="logo" src="{_PIXEL}" alt="ParaBank" '
+        'title="ParaBank" width="140" height="40"></a>'
+        '<p class="caption">Experience the difference</p></div>'
+        '<div id="headerPanel"><ul class="leftmenu">'
+        '<li class="Solutions">Solutions</li>'
+        '<li><a href="about.htm">About Us</a></li>'
+        '<li><a href="services.htm">Services</a></li>'
+        '<li><a href="#">Products</a></li>'
+        '<li><a href="#">Locations</a></li>'
+        '<li><a href="admin.htm">Admin Page</a></li>'
+        '</ul><ul class="button">'
+        '<li class="home"><a href="index.htm">home</a></li>'
+        '<li class="aboutus"><a href="about.htm">about</a></li>'
+        '<li class="contact"><a href="contact.htm">contact</a></li>'
+        "</ul></div>"
+        f'<div id="bodyPanel"><div id="leftPanel">{left}</div>'
+        f'<div id="rightPanel">{right}</div></div></div>'
+        '<div id="footerPanel"><ul>'
+        '<li><a href="index.htm">Home</a> | </li>'
+        '<li><a href="about.htm">About Us</a> | </li>'
+        '<li><a href="services.htm">Services</a> | </li>'
+        '<li><a href="#">Products</a> | </li>'
+        '<li><a href="#">Locations</a> | </li>'
+        '<li><a href="#">Forum</a> | </li>'
+        '<li><a href="sitemap.htm">Site Map</a> | </li>'
+        '<li><a href="contact.htm">Contact Us</a></li>'
+        '</ul><p class="copyright">&copy; Parasoft. All rights reserved.</p></div>'
+        f"<script>{script}</script></body></html>"
+    )
+
+
+def _error_panel(message: str = INTERNAL_ERROR) -> str:
+    return f'<h1 class="title">Error!</h1><p class="error">{_e(message)}</p>'
+
+
+def _field_row(label: str, name: str, value: str = "", error: str = "") -> str:
+    error_html = f'<span id="{name}.errors" class="error">{_e(error)}</span>' if error else ""
+    return (
+        f"<tr><td>{_e(label)}:</td>"
+        f'<td><input id="{name}" name="{name}" class="input" value="{_e(value)}"></td>'
+        f"<td>{error_html}</td></tr>"
+    )
+
+
+def _account_options(accounts: List[Account]) -> str:
+    return "".join(f'<option value="{a.id}">{a.id}</option>' for a in accounts)
+
+
+def _hidden_error(element_id: str, text: str) -> str:
+    return f'<span id="{element_id}" class="error" style="display:none">{_e(text)}</span>'
+
+
+_REGISTER_FIELDS = [
+    ("First Name", "customer.firstName", "first_name", "First name is required."),
+    ("Last Name", "customer.lastName", "last_name", "Last name is required."),
+    ("Address", "customer.address.street", "street", "Address is required."),
+    ("City", "customer.address.city", "city", "City is required."),
+    ("State", "customer.address.state", "state", "State is required."),
+    ("Zip Code", "customer.address.zipCode", "zip_code", "Zip Code is required."),
+    ("Phone #", "customer.phoneNumber", "phone_number", ""),
+    ("SSN", "customer.ssn", "ssn", "Social Security Number is required."),
+    ("Username", "customer.username", "username", "Username is required."),
+    ("Password", "customer.password", "password", "Password is required."),
+]
+
+_LOOKUP_FIELDS = [
+    ("First Name", "firstName", "first_name", "First name is required."),
+    ("Last Name", "lastName", "last_name", "Last name is required."),
+    ("Address", "address.street", "street", "Address is required."),
+    ("City", "address.city", "city", "City is required."),
+    ("State", "address.state", "state", "State is required."),
+    ("Zip Code", "address.zipCode", "zip_code", "Zip Code is required."),
+    ("SSN", "ssn", "ssn", "Social Security Number is required."),
+]
+
+_BILLPAY_FIELDS = [
+    ("Payee Name", "payee.name", "name", "Payee name is required."),
+    ("Address", "payee.address.street", "address", "Address is required."),
+    ("City", "payee.address.city", "city", "City is required."),
+    ("State", "payee.address.state", "state", "State is required."),
+    ("Zip Code", "payee.address.zipCode", "zipCode", "Zip Code is required."),
+    ("Phone #", "payee.phoneNumber", "phoneNumber", "Phone number is required."),
+]
+
+_PROFILE_FIELDS = [
+    ("First Name", "customer.firstName", "first_name", "firstName", "First name is required."),
+    ("Last Name", "customer.lastName", "last_name", "lastName", "Last name is required."),
+    ("Address", "customer.address.street", "street", "street", "Address is required."),
+    ("City", "customer.address.city", "city", "city", "City is required."),
+    ("State", "customer.address.state", "state", "state", "State is required."),
+    ("Zip Code", "customer.address.zipCode", "zip_code", "zipCode", "Zip Code is required."),
+    ("Phone #", "customer.phoneNumber", "phone_number", "phoneNumber", ""),
+]
+
+
+# --- Request handling ------------------------------------------------------------
+
+Response = Tuple[int, str, str, Dict[str, str]]
+
+
+class ParaBankHandler(BaseHTTPRequestHandler):
+    """HTTP handler rendering ParaBank pages from the server's ``BankState``."""
+
+    protocol_version = "HTTP/1.1"
+    server: "_EmulatorHTTPServer"
+
+    # Silence the default stderr access log; it would interleave with test output.
+    def log_message(self, format: str, *args: Any) -> None:  # pylint: disable=redefined-builtin
+        return
+
+    @property
+    def state(self) -> BankState:
+        return self.server.state
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:  # pylint: disable=invalid-name
+        self._dispatch("POST")
+
+    def _dispatch(self, method: str) -> None:
+        parsed = urlparse(self.path)
+        self.query = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        self.body = self.rfile.read(length).decode("utf-8") if length else ""
+        self.form = {k: v[-1] for k, v in parse_qs(self.body, keep_blank_values=True).items()}
+        self.set_cookie: Optional[str] = None
+
+        path = parsed.path
+        if path in (CONTEXT_PATH, f"{CONTEXT_PATH}/"):
+            self._send(302, "", "text/plain", {"Location": f"{CONTEXT_PATH}/index.htm"})
+            return
+        if not path.startswith(f"{CONTEXT_PATH}/"):
+            self._send(404, "Not Found", "text/plain")
+            return
+        path = path[len(CONTEXT_PATH) + 1 :]
+        if path == "static/parabank.js":
+            self._send(200, _SCRIPT, "application/javascript", {"Cache-Control": "max-age=3600"})
+            return
+
+        try:
+            for prefix in ("services_proxy/bank/", "services/bank/"):
+                if path.startswith(prefix):
+                    status, payload = self._api(method, path[len(prefix) :].split("/"))
+                    if isinstance(payload, str):
+                        self._send(status, payload, "text/plain")
+                    else:
+                        self._send(status, json.dumps(payload), "application/json")
+                    return
+            page = _PAGES.get(path)
+            if page is None:
+                self._send(404, "Not Found", "text/plain")
+                return
+            status, body, content_type, headers = page(self, method)
+            self._send(status, body, content_type, headers)
+        except Exception:  # pylint: disable=broad-except
+            # Unknown ids, malformed input or an emulator bug: answer like ParaBank's error
+            # page instead of dropping the connection mid-request
+            self._send(500, _layout("Error", _error_panel(), self.customer), "text/html")
+
+    def _send(
+        self,
+        status: int,
+        body: str,
+        content_type: str,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> None:
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        if self.set_cookie:
+            self.send_header("Set-Cookie", self.set_cookie)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    # --- session helpers ---
+
+    @property
+    def customer(self) -> Optional[Customer]:
+        cookie = SimpleCookie(self.headers.get("Cookie", ""))
+        morsel = cookie.get(SESSION_COOKIE)
+        if morsel is None:
+            return None
+        customer_id = self.state.sessions.get(morsel.value)
+        return self.state.customers.get(customer_id) if customer_id is not None else None
+
+    def _log_in(self, customer: Customer) -> None:
+        token = self.state.new_session(customer)
+        self.set_cookie = f"{SESSION_COOKIE}={token}; Path={CONTEXT_PATH}; HttpOnly"
+
+    def _page(self, title: str, right: str, script: str = "", status: int = 200) -> Response:
+        return status, _layout(title, right, self.customer, script), "text/html", {}
+
+    def _redirect(self, target: str) -> Response:
+        return 302, "", "text/plain", {"Location": f"{CONTEXT_PATH}/{target}"}
+
+    def _require_login(self) -> Optional[Response]:
+        if self.customer is None:
+            return self._page("Error", _error_panel())
+        return None
+
+    # --- public pages ---
+
+    def index(self, method: str) -> Response:
+        right = (
+            '<div id="showOverview"><h2>ATM Services</h2><ul class="services">'
+            "<li>Withdraw Funds</li><li>Transfer Funds</li><li>Check Balances</li>"
+            "<li>Make Deposits</li></ul>"
+            '<h2>Online Services</h2><ul class="servicestwo">'
+            "<li>Bill Pay</li><li>Account History</li><li>Transfer Funds</li></ul></div>"
+        )
+        return self._page("Welcome | Online Banking", right)
+
+    def about(self, method: str) -> Response:
+        right = (
+            '<h1 class="title">ParaSoft Demo Website</h1>'
+            "<p>ParaBank is a demo site used for demonstration of Parasoft software "
+            "solutions. All materials herein are used solely for simulating a realistic "
+            "online banking website.</p>"
+        )
+        return self._page("About Us", right)
+
+    def services(self, method: str) -> Response:
+        right = (
+            '<span class="heading">Available Bookstore SOAP services:</span>'
+            "<p>ParaBank exposes its account services as REST and SOAP endpoints.</p>"
+        )
+        return self._page("Services", right)
+
+    def admin(self, method: str) -> Response:
+        return self._page("Administration", '<h1 class="title">Administration</h1>')
+
+    def sitemap(self, method: str) -> Response:
+        return self._page("Site Map", '<h1 class="title">Site Map</h1>')
+
+    def login(self, method: str) -> Response:
+        username = self.form.get("username", "")
+        password = self.form.get("password", "")
+        if not username or not password:
+            return self._page("Error", _error_panel("Please enter a username and password."))
+        customer = self.state.login(username, password)
+        if customer is None:
+            message = "The username and password could not be verified."
+            return self._page("Error", _error_panel(message))
+        self._log_in(customer)
+        return self._redirect("overview.htm")
+
+    def logout(self, method: str) -> Response:
+        cookie = SimpleCookie(self.headers.get("Cookie", ""))
+        morsel = cookie.get(SESSION_COOKIE)
+        if morsel is not None:
+            with self.state.lock:
+                self.state.sessions.pop(morsel.value, None)
+        return self._redirect("index.htm")
+
+    def register(self, method: str) -> Response:
+        values = {attr: self.form.get(name, "").strip() for _, name, attr, _ in _REGISTER_FIELDS}
+        errors: Dict[str, str] = {}
+        if method == "POST":
+            for _, name, attr, message in _REGISTER_FIELDS:
+                if message and not values[attr]:
+                    errors[name] = message
+            repeated = self.form.get("repeatedPassword", "")
+            if not repeated:
+                errors["repeatedPassword"] = "Password confirmation is required."
+            elif values["password"] and repeated != values["password"]:
+                errors["repeatedPassword"] = "Passwords did not match."
+            if values["username"] and self.state.find_by_username(values["username"]):
+                errors["customer.username"] = "This username already exists."
+            if not errors:
+                customer = self.state.add_customer(values)
+                self._log_in(customer)
+                right = (
+                    f'<h1 class="title">Welcome {_e(customer.username)}</h1>'
+                    "<p>Your account was created successfully. You are now logged in.</p>"
+                )
+                return 200, _layout("Customer Created", right, customer), "text/html", {}
+
+        rows = "".join(
+            _field_row(
+                label, name, values[attr] if "password" not in name else "", errors.get(name, "")
+            )
+            for label, name, attr, _ in _REGISTER_FIELDS
+        )
+        rows += _field_row("Confirm", "repeatedPassword", "", errors.get("repeatedPassword", ""))
+        right = (
+            '<h1 class="title">Signing up is easy!</h1>'
+            "<p>If you have an account with us you can sign-up for free instant online "
+            "access. You will have to provide some personal information.</p>"
+            '<form id="customerForm" method="post" action="register.htm">'
+            f'<table class="form2">{rows}</table>'
+            '<input type="submit" class="button" value="Register"></form>'
+        )
+        return self._page("Register for Free Online Account Access", right)
+
+    def lookup(self, method: str) -> Response:
+        values = {attr: self.form.get(name, "").strip() for _, name, attr, _ in _LOOKUP_FIELDS}
+        errors: Dict[str, str] = {}
+        if method == "POST":
+            errors = {
+                name: message for _, name, attr, message in _LOOKUP_FIELDS if not values[attr]
+            }
+            if not errors:
+                match = next(
+                    (
+                        c
+                        for c in self.state.customers.values()
+                        if all(getattr(c, attr) == values[attr] for attr in values)
+                    ),
+                    None,
+                )
+                if match is None:
+                    message = "The customer information provided could not be found."
+                    return self._page("Error", _error_panel(message))
+                self._log_in(match)
+                right = (
+                    '<h1 class="title">Customer Lookup</h1>'
+                    '<p class="smallText">Your login information was located successfully. '
+                    "You are now logged in.</p>"
+                    f"<p><b>Username</b>: {_e(match.username)}<br>"
+                    f"<b>Password</b>: {_e(match.password)}</p>"
+                )
+                return 200, _layout("Customer Lookup", right, match), "text/html", {}
+
+        rows = "".join(
+            _field_row(label, name, values[attr], errors.get(name, ""))
+            for label, name, attr, _ in _LOOKUP_FIELDS
+        )
+        right = (
+            '<h1 class="title">Customer Lookup</h1>'
+            "<p>Please fill out the following information in order to validate your "
+            "account.</p>"
+            '<form id="lookupForm" method="post" action="lookup.htm">'
+            f'<table class="form2">{rows}</table>'
+            '<input type="submit" class="button" value="Find My Login Info"></form>'
+        )
+        return self._page("Customer Lookup", right)
+
+    def contact(self, method: str) -> Response:
+        fields = [("Name", "name"), ("Email", "email"), ("Phone", "phone")]
+        values = {name: self.form.get(name, "").strip() for _, name in fields}
+        values["message"] = self.form.get("message", "").strip()
+        errors: Dict[str, str] = {}
+        if method == "POST":
+            messages = {
+                "name": "Name is required.",
+                "email": "Email is required.",
+                "phone": "Phone is required.",
+                "message": "Message is required.",
+            }
+            errors = {name: text for name, text in messages.items() if not values[name]}
+            if not errors:
+                right = (
+                    '<h1 class="title">Customer Care</h1>'
+                    f"<p>Thank you {_e(values['name'])}</p>"
+                    "<p>A Customer Care Representative will be contacting you.</p>"
+                )
+                return self._page("Customer Care", right)
+
+        rows = "".join(
+            _field_row(label, name, values[name], errors.get(name, "")) for label, name in fields
+        )
+        message_error = errors.get("message", "")
+        rows += (
+            "<tr><td>Message:</td>"
+            f'<td><textarea id="message" name="message">{_e(values["message"])}</textarea></td>'
+            f'<td><span id="message.errors" class="error">{_e(message_error)}</span></td></tr>'
+            if message_error
+            else "<tr><td>Message:</td>"
+            f'<td><textarea id="message" name="message">{_e(values["message"])}</textarea></td>'
+            "<td></td></tr>"
+        )
+        right = (
+            '<h1 class="title">Customer Care</h1>'
+            "<p>Email support is available by filling out the following form.</p>"
+            '<form id="contactForm" method="post" action="contact.htm">'
+            f'<table class="form2">{rows}</table>'
+            '<input type="submit" class="button" value="Send to Customer Care"></form>'
+        )
+        return self._page("Customer Care", right)
+
+    # --- authenticated pages ---
+
+    def overview(self, method: str) -> Response:
+        denied = self._require_login()
+        if denied:
+            return denied
+        assert self.customer is not None
+        accounts = self.state.customer_accounts(self.customer.id)
+        rows = "".join(
+            f'<tr><td><a href="activity.htm?id={a.id}">{a.id}</a></td>'
+            f"<td>{_money(a.balance)}</td><td>{_money(max(a.balance, 0.0))}</td></tr>"
+            for a in accounts
+        )
+        total = sum(a.balance for a in accounts)
+        rows += f"<tr><td><b>Total</b></td><td><b>{_money(total)}</b></td><td>&nbsp;</td></tr>"
+        right = (
+            '<div id="showOverview"><h1 class="title">Accounts Overview</h1>'
+            '<table id="accountTable" class="table"><thead><tr><th>Account</th>'
+            "<th>Balance*</th><th>Available Amount</th></tr></thead>"
+            f"<tbody>{rows}</tbody></table>"
+            '<p class="smallText">*Balance includes deposits that may be subject to holds</p>'
+            "</div>"
+        )
+        return self._page("Accounts Overview", right)
+
+    def activity(self, method: str) -> Response:
+        denied = self._require_login()
+        if denied:
+            return denied
+        account = self.state.accounts[int(self.query.get("id", "0"))]
+        rows = "".join(
+            f'<tr data-type="{t.type}" data-month="{int(t.date[:2])}"><td>{t.date}</td>'
+            f'<td><a href="transaction.htm?id={t.id}">{_e(t.description)}</a></td>'
+            f"<td>{_money(t.amount) if t.type == 'Debit' else ''}</td>"
+            f"<td>{_money(t.amount) if t.type == 'Credit' else ''}</td></tr>"
+            for t in self.state.account_transactions(account.id)
+        )
+        months = ["All"] + [date(2000, m, 1).strftime("%B") for m in range(1, 13)]
+        month_options = "".join(f'<option value="{m}">{m}</option>' for m in months)
+        right = (
+            '<div id="accountDetails"><h1 class="title">Account Details</h1><table>'
+            f'<tr><td>Account Number:</td><td id="accountId">{account.id}</td></tr>'
+            f'<tr><td>Account Type:</td><td id="accountType">{account.type}</td></tr>'
+            f'<tr><td>Balance:</td><td id="balance">{_money(account.balance)}</td></tr>'
+            '<tr><td>Available:</td><td id="availableBalance">'
+            f"{_money(max(account.balance, 0.0))}</td></tr></table></div>"
+            '<div id="accountActivity"><h1 class="title">Account Activity</h1>'
+            f'<select id="month" class="input">{month_options}</select>'
+            '<select id="transactionType" class="input"><option value="All">All</option>'
+            '<option value="Credit">Credit</option><option value="Debit">Debit</option></select>'
+            '<input type="button" class="button" value="Go" onclick="filterActivity()">'
+            '<table id="transactionTable" class="table"><thead><tr><th>Date</th>'
+            "<th>Transaction</th><th>Debit (-)</th><th>Credit (+)</th></tr></thead>"
+            f"<tbody>{rows}</tbody></table>"
+            '<p id="noTransactions" style="display:none"><b>No transactions found.</b></p></div>'
+        )
+        script = """
+function filterActivity() {
+  var month = pbVal('month'), type = pbVal('transactionType'), shown = 0;
+  var months = ['All','January','February','March','April','May','June','July',
+                'August','September','October','November','December'];
+  document.querySelectorAll('#transactionTable tbody tr').forEach(function (row) {
+    var ok = (month === 'All' || months.indexOf(month) === Number(row.dataset.month)) &&
+             (type === 'All' || row.dataset.type === type);
+    row.style.display = ok ? '' : 'none';
+    if (ok) { shown += 1; }
+  });
+  pbShow('noTransactions', shown === 0);
+}
+"""
+        return self._page("Account Activity", right, script)
+
+    def openaccount(self, method: str) -> Response:
+        denied = self._require_login()
+        if denied:
+            return denied
+        assert self.customer is not None
+        accounts = self.state.customer_accounts(self.customer.id)
+        type_options = "".join(
+            f'<option value="{i}">{t}</option>' for i, t in enumerate(ACCOUNT_TYPES[:2])
+        )
+        right = (
+            '<div id="openAccountForm"><h1 class="title">Open New Account</h1>'
+            "<form><p><b>What type of Account would you like to open?</b></p>"
+            f'<select id="type" class="input">{type_options}</select>'
+            f"<p><b>A minimum of {_money(NEW_ACCOUNT_DEPOSIT)} must be deposited into this "
+            "account at time of opening. Please choose an existing account to transfer "
+            "funds into the new account.</b></p>"
+            f'<select id="fromAccountId" class="input">{_account_options(accounts)}</select>'
+            '<div><input type="button" class="button" value="Open New Account" '
+            'onclick="openAccount()"></div></form></div>'
+            '<div id="openAccountResult" style="display:none">'
+            '<h1 class="title">Account Opened!</h1>'
+            "<p>Congratulations, your account is now open.</p>"
+            '<p><b>Your new account number:</b> <a id="newAccountId" href="#"></a></p></div>'
+            '<div id="openAccountError" style="display:none"></div>'
+        )
+        script = f"""
+function openAccount() {{
+  var type = pbVal('type'), from = pbVal('fromAccountId');
+  pbCall('createAccount?customerId={self.customer.id}&newAccountType=' + type +
+         '&fromAccountId=' + from, 'POST').then(function (account) {{
+    var link = document.getElementById('newAccountId');
+    link.textContent = account.id;
+    link.href = 'activity.htm?id=' + account.id;
+    pbShow('openAccountForm', false);
+    pbShow('openAccountResult', true);
+  }}).catch(function () {{ pbFail('openAccountForm', 'openAccountError'); }});
+}}
+"""
+        return self._page("Open Account", right, script)
+
+    def transfer(self, method: str) -> Response:
+        denied = self._require_login()
+        if denied:
+            return denied
+        assert self.customer is not None
+        options = _account_options(self.state.customer_accounts(self.customer.id))
+        right = (
+            '<div id="showForm"><h1 class="title">Transfer Funds</h1><form>'
+            '<p><b>Amount:</b> $<input id="amount" class="input" type="text">'
+            '<span id="amount.errors" class="error" style="display:none">'
+            "The amount cannot be empty.</span></p>"
+            f'<div>From account #<select id="fromAccountId" class="input">{options}</select>'
+            f' to account #<select id="toAccountId" class="input">{options}</select></div>'
+            '<div><input type="button" class="button" value="Transfer" '
+            'onclick="transferFunds()"></div></form></div>'
+            '<div id="showResult" style="display:none"><h1 class="title">Transfer Complete!</h1>'
+            '<p><span id="amountResult"></span> has been transferred from account '
+            '#<span id="fromAccountIdResult"></span> to account '
+            '#<span id="toAccountIdResult"></span>.</p>'
+            "<p>See Account Activity for more details.</p></div>"
+            '<div id="showError" style="display:none"></div>'
+        )
+        script = """
+function transferFunds() {
+  var amount = pbVal('amount'), from = pbVal('fromAccountId'), to = pbVal('toAccountId');
+  if (!amount || isNaN(Number(amount))) { pbShow('amount.errors', true); return; }
+  pbCall('transfer?fromAccountId=' + from + '&toAccountId=' + to + '&amount=' + amount, 'POST')
+    .then(function () {
+      document.getElementById('amountResult').textContent = pbMoney(amount);
+      document.getElementById('fromAccountIdResult').textContent = from;
+      document.getElementById('toAccountIdResult').textContent = to;
+      pbShow('showForm', false);
+      pbShow('showResult', true);
+    }).catch(function () { pbFail('showForm', 'showError'); });
+}
+"""
+        return self._page("Transfer Funds", right, script)
+
+    def billpay(self, method: str) -> Response:
+        denied = self._require_login()
+        if denied:
+            return denied
+        assert self.customer is not None
+        rows = "".join(
+            f'<tr><td>{_e(label)}:</td><td><input class="input" name="{name}"></td>'
+            f'<td>{_hidden_error("validationModel-" + key, message)}</td></tr>'
+            for label, name, key, message in _BILLPAY_FIELDS
+        )
+        rows += (
+            '<tr><td>Account #:</td><td><input class="input" name="payee.accountNumber"></td>'
+            f'<td>{_hidden_error("validationModel-account-empty", "Account number is required.")}'
+            f'{_hidden_error("validationModel-account-invalid", "Please enter a valid number.")}'
+            "</td></tr>"
+            '<tr><td>Verify Account #:</td><td><input class="input" name="verifyAccount"></td>'
+            "<td>"
+            + _hidden_error("validationModel-verifyAccount-empty", "Account number is required.")
+            + _hidden_error("validationModel-verifyAccount-invalid", "Please enter a valid number.")
+            + _hidden_error(
+                "validationModel-verifyAccount-mismatch", "The account numbers do not match."
+            )
+            + "</td></tr>"
+            '<tr><td>Amount: $</td><td><input class="input" name="amount"></td><td>'
+            + _hidden_error("validationModel-amount-empty", "The amount cannot be empty.")
+            + _hidden_error("validationModel-amount-invalid", "Please enter a valid amount.")
+            + "</td></tr>"
+            '<tr><td>From account #:</td><td><select name="fromAccountId" class="input">'
+            f"{_account_options(self.state.customer_accounts(self.customer.id))}"
+            "</select></td><td></td></tr>"
+        )
+        right = (
+            '<div id="billpayForm"><h1 class="title">Bill Payment Service</h1>'
+            "<p>Enter payee information</p>"
+            f'<form><table class="form2">{rows}</table>'
+            '<input type="button" class="button" value="Send Payment" onclick="payBill()">'
+            "</form></div>"
+            '<div id="billpayResult" style="display:none">'
+            '<h1 class="title">Bill Payment Complete</h1>'
+            '<p>Bill Payment to <span id="payeeName"></span> in the amount of '
+            '<span id="paidAmount"></span> from account <span id="paidFromAccount"></span> '
+            "was successful.</p><p>See Account Activity for more details.</p></div>"
+            '<div id="billpayError" style="display:none"></div>'
+        )
+        script = """
+function payBill() {
+  function v(name) { return document.querySelector('[name="' + name + '"]').value.trim(); }
+  var required = {'name': 'payee.name', 'address': 'payee.address.street',
+    'city': 'payee.address.city', 'state': 'payee.address.state',
+    'zipCode': 'payee.address.zipCode', 'phoneNumber': 'payee.phoneNumber'};
+  document.querySelectorAll('#billpayForm .error').forEach(function (el) {
+    el.style.display = 'none';
+  });
+  var ok = true;
+  function fail(id) { pbShow('validationModel-' + id, true); ok = false; }
+  Object.keys(required).forEach(function (key) { if (!v(required[key])) { fail(key); } });
+  var account = v('payee.accountNumber'), verify = v('verifyAccount'), amount = v('amount');
+  if (!account) { fail('account-empty'); }
+  else if (isNaN(Number(account))) { fail('account-invalid'); }
+  if (!verify) { fail('verifyAccount-empty'); }
+  else if (isNaN(Number(verify))) { fail('verifyAccount-invalid'); }
+  else if (account && verify !== account) { fail('verifyAccount-mismatch'); }
+  if (!amount) { fail('amount-empty'); } else if (isNaN(Number(amount))) { fail('amount-invalid'); }
+  if (!ok) { return; }
+  var from = v('fromAccountId');
+  var payee = {name: v('payee.name'), phoneNumber: v('payee.phoneNumber'),
+    accountNumber: Number(account), address: {street: v('payee.address.street'),
+    city: v('payee.address.city'), state: v('payee.address.state'),
+    zipCode: v('payee.address.zipCode')}};
+  pbCall('billpay?accountId=' + from + '&amount=' + amount, 'POST', payee).then(function (r) {
+    document.getElementById('payeeName').textContent = r.payeeName;
+    document.getElementById('paidAmount').textContent = pbMoney(r.amount);
+    document.getElementById('paidFromAccount').textContent = r.accountId;
+    pbShow('billpayForm', false);
+    pbShow('billpayResult', true);
+  }).catch(function () { pbFail('billpayForm', 'billpayError'); });
+}
+"""
+        return self._page("Bill Pay", right, script)
+
+    def findtrans(self, method: str) -> Response:
+        denied = self._require_login()
+        if denied:
+            return denied
+        assert self.customer is not None
+        options = _account_options(self.state.customer_accounts(self.customer.id))
+        right = (
+            '<div id="formContainer"><h1 class="title">Find Transactions</h1>'
+            f'<p>Select an account: <select id="accountId" class="input">{options}</select></p>'
+            '<div><b>Find by Transaction ID:</b> <input id="transactionId" class="input">'
+            '<button id="findById" class="button" type="button" '
+            "onclick=\"findTransactions('id')\">Find Transactions</button>"
+            + _hidden_error("transactionIdError", "Invalid transaction ID")
+            + "</div>"
+            '<div><b>Find by Date:</b> <input id="transactionDate" class="input" '
+            'placeholder="MM-DD-YYYY">'
+            '<button id="findByDate" class="button" type="button" '
+            "onclick=\"findTransactions('date')\">Find Transactions</button>"
+            + _hidden_error("transactionDateError", "Invalid date format")
+            + "</div>"
+            '<div><b>Find by Date Range:</b> Between <input id="fromDate" class="input"> and '
+            '<input id="toDate" class="input">'
+            '<button id="findByDateRange" class="button" type="button" '
+            "onclick=\"findTransactions('range')\">Find Transactions</button>"
+            + _hidden_error("dateRangeError", "Invalid date format")
+            + "</div>"
+            '<div><b>Find by Amount:</b> <input id="amount" class="input">'
+            '<button id="findByAmount" class="button" type="button" '
+            "onclick=\"findTransactions('amount')\">Find Transactions</button>"
+            + _hidden_error("amountError", "Invalid amount")
+            + "</div></div>"
+            '<div id="resultContainer" style="display:none">'
+            '<h1 class="title">Transaction Results</h1>'
+            '<table id="transactionTable" class="table"><thead><tr><th>Date</th>'
+            "<th>Transaction</th><th>Debit (-)</th><th>Credit (+)</th></tr></thead>"
+            '<tbody id="transactionBody"></tbody></table></div>'
+            '<div id="errorContainer" style="display:none"></div>'
+        )
+        script = """
+function findTransactions(kind) {
+  var account = pbVal('accountId'), path = null, errorId = null;
+  var datePattern = /^\\d{2}-\\d{2}-\\d{4}$/;
+  ['transactionIdError', 'transactionDateError', 'dateRangeError', 'amountError']
+    .forEach(function (id) { pbShow(id, false); });
+  if (kind === 'id') {
+    var id = pbVal('transactionId');
+    if (/^\\d+$/.test(id)) { path = 'accounts/' + account + '/transactions/' + id; }
+    else { errorId = 'transactionIdError'; }
+  } else if (kind === 'date') {
+    var day = pbVal('transactionDate');
+    if (datePattern.test(day)) { path = 'accounts/' + account + '/transactions/onDate/' + day; }
+    else { errorId = 'transactionDateError'; }
+  } else if (kind === 'range') {
+    var from = pbVal('fromDate'), to = pbVal('toDate');
+    if (datePattern.test(from) && datePattern.test(to)) {
+      path = 'accounts/' + account + '/transactions/fromDate/' + from + '/toDate/' + to;
+    } else { errorId = 'dateRangeError'; }
+  } else {
+    var amount = pbVal('amount');
+    if (amount && !isNaN(Number(amount))) {
+      path = 'accounts/' + account + '/transactions/amount/' + amount;
+    } else { errorId = 'amountError'; }
+  }
+  if (errorId) { pbShow(errorId, true); return; }
+  pbCall(path).then(function (txns) {
+    var body = document.getElementById('transactionBody');
+    body.innerHTML = '';
+    (Array.isArray(txns) ? txns : [txns]).forEach(function (t) {
+      var row = document.createElement('tr');
+      [t.date, t.description, t.type === 'Debit' ? pbMoney(t.amount) : '',
+       t.type === 'Credit' ? pbMoney(t.amount) : ''].forEach(function (text) {
+        var cell = document.createElement('td');
+        cell.textContent = text;
+        row.appendChild(cell);
+      });
+      body.appendChild(row);
+    });
+    pbShow('formContainer', false);
+    pbShow('resultContainer', true);
+  }).catch(function () { pbFail('formContainer', 'errorContainer'); });
+}
+"""
+        return self._page("Find Transactions", right, script)
+
+    def requestloan(self, method: str) -> Response:
+        denied = self._require_login()
+        if denied:
+            return denied
+        assert self.customer is not None
+        options = _account_options(self.state.customer_accounts(self.customer.id))
+        right = (
+            '<div id="requestLoanForm"><h1 class="title">Apply for a Loan</h1><form>'
+            '<table class="form2">'
+            '<tr><td>Loan Amount: $</td><td><input id="amount" class="input"></td></tr>'
+            '<tr><td>Down Payment: $</td><td><input id="downPayment" class="input"></td></tr>'
+            '<tr><td>From account #:</td><td><select id="fromAccountId" class="input">'
+            f"{options}</select></td></tr></table>"
+            + _hidden_error(
+                "requestLoanError", "Please enter a valid loan amount and down payment."
+            )
+            + '<div><input type="button" class="button" value="Apply Now" '
+            'onclick="requestLoan()"></div></form></div>'
+            '<div id="requestLoanResult" style="display:none">'
+            '<h1 class="title">Loan Request Processed</h1><table>'
+            f'<tr><td>Loan Provider:</td><td id="loanProviderName">{_e(LOAN_PROVIDER)}</td></tr>'
+            '<tr><td>Date:</td><td id="responseDate"></td></tr>'
+            '<tr><td>Status:</td><td id="loanStatus"></td></tr></table>'
+            '<div id="loanRequestApproved" style="display:none">'
+            "<p>Congratulations, your loan has been approved.</p>"
+            '<p><b>Your new account number:</b> <a id="newAccountId" href="#"></a></p></div>'
+            '<div id="loanRequestDenied" style="display:none">'
+            '<p class="error">You do not have sufficient funds for the given down payment.</p>'
+            "</div></div>"
+        )
+        script = f"""
+function requestLoan() {{
+  var amount = pbVal('amount'), down = pbVal('downPayment'), from = pbVal('fromAccountId');
+  if (!amount || !down || isNaN(Number(amount)) || isNaN(Number(down))) {{
+    pbShow('requestLoanError', true);
+    return;
+  }}
+  pbCall('requestLoan?customerId={self.customer.id}&amount=' + amount + '&downPayment=' +
+         down + '&fromAccountId=' + from, 'POST').then(function (r) {{
+    document.getElementById('responseDate').textContent = r.responseDate;
+    document.getElementById('loanStatus').textContent = r.approved ? 'Approved' : 'Denied';
+    if (r.approved) {{
+      var link = document.getElementById('newAccountId');
+      link.textContent = r.accountId;
+      link.href = 'activity.htm?id=' + r.accountId;
+    }}
+    pbShow(r.approved ? 'loanRequestApproved' : 'loanRequestDenied', true);
+    pbShow('requestLoanForm', false);
+    pbShow('requestLoanResult', true);
+  }});
+}}
+"""
+        return self._page("Request Loan", right, script)
+
+    def updateprofile(self, method: str) -> Response:
+        denied = self._require_login()
+        if denied:
+            return denied
+        customer = self.customer
+        assert customer is not None
+        rows = "".join(
+            f"<tr><td>{_e(label)}:</td>"
+            f'<td><input id="{name}" name="{name}" class="input" '
+            f'value="{_e(getattr(customer, attr))}"></td>'
+            f'<td>{_hidden_error(key + "-error", message) if message else ""}</td></tr>'
+            for label, name, attr, key, message in _PROFILE_FIELDS
+        )
+        right = (
+            '<div id="updateProfileForm"><h1 class="title">Update Profile</h1>'
+            f'<form><table class="form2">{rows}</table>'
+            '<input type="button" class="button" value="Update Profile" '
+            'onclick="updateProfile()"></form></div>'
+        )
+        fields = json.dumps({key: name for _, name, _, key, _ in _PROFILE_FIELDS})
+        script = f"""
+function updateProfile() {{
+  var fields = {fields}, params = [], ok = true;
+  Object.keys(fields).forEach(function (key) {{
+    var value = document.getElementById(fields[key]).value.trim();
+    var error = document.getElementById(key + '-error');
+    if (error) {{ error.style.display = value ? 'none' : ''; if (!value) {{ ok = false; }} }}
+    params.push(key + '=' + encodeURIComponent(value));
+  }});
+  if (!ok) {{ return; }}
+  pbCall('customers/update/{customer.id}?' + params.join('&'), 'POST').then(function () {{
+    document.getElementById('rightPanel').innerHTML =
+      '<div id="updateProfileResult"><h1 class="title">Profile Updated</h1>' +
+      '<p>Your updated address and phone number have been added to the system.</p></div>';
+  }});
+}}
+"""
+        return self._page("Update Profile", right, script)
+
+    # --- JSON API (services_proxy/bank and services/bank) ---
+
+    def _api(self, method: str, parts: List[str]) -> Tuple[int, Any]:
+        state = self.state
+        q = self.query
+        with state.lock:
+            if parts[0] == "login" and len(parts) == 3:
+                customer = state.login(parts[1], parts[2])
+                if customer is None:
+                    return 400, "Invalid username and/or password"
+                return 200, customer.to_json()
+            if parts[0] == "customers" and len(parts) == 2 and method == "GET":
+                return 200, state.customers[int(parts[1])].to_json()
+            if parts[0] == "customers" and len(parts) == 3 and parts[2] == "accounts":
+                accounts = state.customer_accounts(int(parts[1]))
+                return 200, [a.to_json() for a in accounts]
+            if (
+                parts[0] == "customers"
+                and len(parts) == 3
+                and parts[1] == "update"
+                and method == "POST"
+            ):
+                customer = state.customers[int(parts[2])]
+                for attr, key in (
+                    ("first_name", "firstName"),
+                    ("last_name", "lastName"),
+                    ("street", "street"),
+                    ("city", "city"),
+                    ("state", "state"),
+                    ("zip_code", "zipCode"),
+                    ("phone_number", "phoneNumber"),
+                    ("ssn", "ssn"),
+                    ("username", "username"),
+                    ("password", "password"),
+                ):
+                    if q.get(key):
+                        setattr(customer, attr, q[key])
+                return 200, "Successfully updated customer profile"
+            if parts[0] == "customers" and len(parts) == 1 and method == "POST":
+                payload = json.loads(self.body or "{}")
+                address = payload.get("address", {})
+                if state.find_by_username(payload.get("username", "")):
+                    return 400, "This username already exists."
+                customer = state.add_customer(
+                    {
+                        "first_name": payload.get("firstName", ""),
+                        "last_name": payload.get("lastName", ""),
+                        "street": address.get("street", ""),
+                        "city": address.get("city", ""),
+                        "state": address.get("state", ""),
+                        "zip_code": address.get("zipCode", ""),
+                        "phone_number": payload.get("phoneNumber", ""),
+                        "ssn": payload.get("ssn", ""),
+                        "username": payload.get("username", ""),
+                        "password": payload.get("password", ""),
+                    }
+                )
+                return 200, customer.to_json()
+            if parts[0] == "createAccount" and method == "POST":
+                account = state.open_account(
+                    int(q["customerId"]),
+                    ACCOUNT_TYPES[int(q.get("newAccountType", "0"))],
+                    int(q["fromAccountId"]),
+                )
+                return 200, account.to_json()
+            if parts[0] == "transfer" and method == "POST":
+                amount = float(q["amount"])
+                state.move(int(q["fromAccountId"]), int(q["toAccountId"]), amount, "Funds Transfer")
+                return 200, (
+                    f"Successfully transferred ${amount:.2f} from account "
+                    f"#{q['fromAccountId']} to account #{q['toAccountId']}"
+                )
+            if parts[0] == "billpay" and method == "POST":
+                payee = json.loads(self.body or "{}")
+                amount = float(q["amount"])
+                state.move(int(q["accountId"]), None, amount, f"Bill Payment to {payee['name']}")
+                return 200, {
+                    "payeeName": payee["name"],
+                    "amount": amount,
+                    "accountId": q["accountId"],
+                }
+            if parts[0] == "requestLoan" and method == "POST":
+                return 200, self._request_loan(q)
+            if parts[0] == "accounts":
+                return self._account_api(parts)
+            if parts[0] == "transactions" and len(parts) == 2:
+                return 200, state.transactions[int(parts[1])].to_json()
+            if parts[0] in ("initializeDB", "cleanDB") and method == "POST":
+                state.reset()
+                return 204, ""
+        return 404, "Not Found"
+
+    def _account_api(self, parts: List[str]) -> Tuple[int, Any]:
+        state = self.state
+        account = state.accounts[int(parts[1])]
+        if len(parts) == 2:
+            return 200, account.to_json()
+        txns = state.account_transactions(account.id)
+        if len(parts) == 3:
+            return 200, [t.to_json() for t in txns]
+        kind = parts[3]
+        if kind == "amount":
+            wanted = float(parts[4])
+            txns = [t for t in txns if abs(t.amount - wanted) < 0.005]
+        elif kind == "onDate":
+            txns = [t for t in txns if t.date == parts[4]]
+        elif kind == "fromDate":
+
+            def _key(value: str) -> str:
+                return f"{value[6:]}{value[:2]}{value[3:5]}"
+
+            low, high = _key(parts[4]), _key(parts[6])
+            txns = [t for t in txns if low <= _key(t.date) <= high]
+        else:
+            txns = [t for t in txns if t.id == int(kind)]
+        return 200, [t.to_json() for t in txns]
+
+    def _request_loan(self, q: Dict[str, str]) -> Dict[str, Any]:
+        state = self.state
+        amount, down = float(q["amount"]), float(q["downPayment"])
+        source = state.accounts[int(q["fromAccountId"])]
+        response: Dict[str, Any] = {
+            "responseDate": date.today().strftime("%m-%d-%Y"),
+            "loanProviderName": LOAN_PROVIDER,
+            "approved": False,
+            "message": "error.insufficient.funds.for.down.payment",
+            "accountId": None,
+        }
+        if down > source.balance or down > amount:
+            return response
+        loan = state.open_account(int(q["customerId"]), "LOAN", None, opening_balance=amount)
+        state.move(source.id, None, down, "Down Payment for Loan")
+        response.update({"approved": True, "message": "", "accountId": loan.id})
+        return response
+
+
+_PAGES: Dict[str, Callable[[ParaBankHandler, str], Response]] = {
+    "index.htm": ParaBankHandler.index,
+    "about.htm": ParaBankHandler.about,
+    "services.htm": ParaBankHandler.services,
+    "admin.htm": ParaBankHandler.admin,
+    "sitemap.htm": ParaBankHandler.sitemap,
+    "contact.htm": ParaBankHandler.contact,
+    "login.htm": ParaBankHandler.login,
+    "logout.htm": ParaBankHandler.logout,
+    "register.htm": ParaBankHandler.register,
+    "lookup.htm": ParaBankHandler.lookup,
+    "overview.htm": ParaBankHandler.overview,
+    "activity.htm": ParaBankHandler.activity,
+    "openaccount.htm": ParaBankHandler.openaccount,
+    "transfer.htm": ParaBankHandler.transfer,
+    "billpay.htm": ParaBankHandler.billpay,
+    "findtrans.htm": ParaBankHandler.findtrans,
+    "requestloan.htm": ParaBankHandler.requestloan,
+    "updateprofile.htm": ParaBankHandler.updateprofile,
+}
+
+
+class _EmulatorHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], state: BankState) -> None:
+        super().__init__(address, ParaBankHandler)
+        self.state = state
+
+
+class ParaBankEmulator:
+    """In-process ParaBank stand-in running on a background thread."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.state = BankState()
+        self.state.reset()
+        self._server = _EmulatorHTTPServer((host, port), self.state)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host!s}:{port}{CONTEXT_PATH}"
+
+    def start(self) -> "ParaBankEmulator":
+        """Start serving on a daemon thread and return self."""
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="parabank-emulator", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Shut the server down and release the port."""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a JSON-friendly dump of the bank state (useful when debugging)."""
+        with self.state.lock:
+            return {
+                "customers": [asdict(c) for c in self.state.customers.values()],
+                "accounts": [a.to_json() for a in self.state.accounts.values()],
+                "transactions": [t.to_json() for t in self.state.transactions.values()],
+            }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the local ParaBank emulator")
+    parser.add_argument(
+        "--host", default="127.0.0.1", help="Interface to bind (default: 127.0.0.1)"
+    )
+    parser.add_argument("--port", type=int, default=8089, help="Port to listen on (default: 8089)")
+    args = parser.parse_args()
+
+    emulator = ParaBankEmulator(args.host, args.port)
+    print(f"ParaBank emulator serving at {emulator.base_url}")
+    try:
+        emulator._server.serve_forever()  # pylint: disable=protected-access
+    except KeyboardInterrupt:
+        print("\nStopping ParaBank emulator.")
+        emulator._server.server_close()  # pylint: disable=protected-access
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""Duration-aware test scheduling for pytest-xdist.
+
+xdist's default ``load`` distribution hands out tests in collection order, so the
+slowest tests (E2E happy path, registration) regularly end up at the tail of one
+worker while the others sit idle. This plugin keeps a persisted history of
+per-test setup and call durations and dispatches tests longest-first, which is
+the online form of longest-processing-time-first (LPT) bin packing.
+
+The tests of a class are dispatched as one unit, ranked by their total, and run
+on one worker in collection order. Class-scoped fixtures, like the home page's
+batched DOM checks, are then built once per run rather than once per worker the
+class was spread over. The controller only sees node ids, so it cannot tell which
+classes have such fixtures and keeps every class together.
+"""
+import heapq
+import json
+import logging
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import pytest
+from _pytest.config import Config as PytestConfig
+from _pytest.config.argparsing import Parser
+from _pytest.terminal import TerminalReporter
+from xdist.scheduler import LoadScheduling
+
+from src.utils.xdist_stats import summary_section
+
+logger = logging.getLogger("parabank")
+
+DEFAULT_HISTORY_PATH = "test-results/durations.json"
+# Estimate used for tests that have never run before and no history exists yet.
+DEFAULT_ESTIMATE_SECONDS = 5.0
+# Weight of the latest run when blending it into the stored history.
+EWMA_ALPHA = 0.5
+
+
+class DurationHistory:
+    """Persisted per-test setup/call durations, smoothed across runs."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._entries: Dict[str, Dict[str, float]] = {}
+        self._current: Dict[str, Dict[str, float]] = {}
+
+    def load(self) -> "DurationHistory":
+        """Read the history file; a missing or corrupt file yields an empty history."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self._entries = data
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable duration history {self.path}: {e}")
+        return self
+
+    def record(self, nodeid: str, when: str, duration: float) -> None:
+        """Accumulate a phase duration for the current run (reruns add up)."""
+        if when not in ("setup", "call"):
+            return
+        phases = self._current.setdefault(nodeid, {"setup": 0.0, "call": 0.0})
+        phases[when] += duration
+
+    def estimate(self, nodeid: str) -> Optional[float]:
+        """Return the predicted setup + call duration, or None if never seen."""
+        entry = self._entries.get(nodeid)
+        if not entry:
+            return None
+        return float(entry.get("setup", 0.0)) + float(entry.get("call", 0.0))
+
+    def estimates(self, nodeids: Sequence[str]) -> Dict[str, float]:
+        """Predict durations for ``nodeids``, filling unknown tests with the median."""
+        known = {nodeid: self.estimate(nodeid) for nodeid in nodeids}
+        seen = [value for value in known.values() if value is not None]
+        fallback = statistics.median(seen) if seen else DEFAULT_ESTIMATE_SECONDS
+        return {nodeid: fallback if value is None else value for nodeid, value in known.items()}
+
+    def save(self) -> None:
+        """Blend this run into the stored history and write it back."""
+        if not self._current:
+            return
+        for nodeid, phases in self._current.items():
+            entry = self._entries.get(nodeid)
+            if entry is None:
+                self._entries[nodeid] = {**phases, "runs": 1}
+                continue
+            for when in ("setup", "call"):
+                previous = float(entry.get(when, phases[when]))
+                entry[when] = EWMA_ALPHA * phases[when] + (1 - EWMA_ALPHA) * previous
+            entry["runs"] = int(entry.get("runs", 0)) + 1
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f, indent=2, sort_keys=True)
+            tmp_path.replace(self.path)
+        except OSError as e:
+            logger.warning(f"Could not persist duration history to {self.path}: {e}")
+
+
+def scheduling_unit(nodeid: str) -> str:
+    """Return the class of ``nodeid``, or ``nodeid`` itself for a module-level test."""
+    parts = nodeid.split("[", 1)[0].split("::")
+    return "::".join(parts[:-1]) if len(parts) > 2 else nodeid
+
+
+def lpt_makespan(durations: Sequence[float], workers: int) -> float:
+    """Return the makespan of assigning ``durations`` longest-first to the least-loaded worker."""
+    if workers <= 0 or not durations:
+        return 0.0
+    loads = [0.0] * workers
+    for duration in sorted(durations, reverse=True):
+        heapq.heapreplace(loads, loads[0] + duration)
+    return max(loads)
+
+
+def chunked_makespan(durations: Sequence[float], workers: int) -> float:
+    """Approximate xdist ``load`` scheduling: contiguous chunks in collection order."""
+    if workers <= 0 or not durations:
+        return 0.0
+    loads = [0.0] * workers
+    for index, duration in enumerate(durations):
+        loads[index * workers // len(durations)] += duration
+    return max(loads)
+
+
+class LPTScheduling(LoadScheduling):
+    """Load scheduling that dispatches the longest predicted tests first.
+
+    Each worker is kept at two pending items (the one running plus the lookahead
+    xdist needs for teardown decisions), so whichever worker frees up first always
+    receives the next-longest test. A class is never split: the batch is rounded up
+    to the end of the last class it reaches.
+    """
+
+    def __init__(
+        self, config: PytestConfig, history: DurationHistory, log: Optional[Any] = None
+    ) -> None:
+        super().__init__(config, log)
+        self.collection: Optional[List[str]] = None
+        self.history = history
+        self.predicted: Dict[str, float] = {}
+        # Predicted duration of each scheduling unit
+        self.units: Dict[str, float] = {}
+        self.started_at: Optional[float] = None
+
+    def schedule(self) -> None:
+        """Sort pending tests by predicted duration and send the initial batch."""
+        assert self.collection_is_completed
+        if self.collection is not None:
+            for node in self.nodes:
+                self.check_schedule(node)
+            return
+        if not self._check_nodes_have_same_collection():
+            self.log("**Different tests collected, aborting run**")
+            return
+
+        collection = next(iter(self.node2collection.values()))
+        self.collection = collection
+        self.predicted = self.history.estimates(collection)
+        self.units = {}
+        for nodeid in collection:
+            unit = scheduling_unit(nodeid)
+            self.units[unit] = self.units.get(unit, 0.0) + self.predicted[nodeid]
+        # Stable sort: the tests of a unit stay contiguous and in collection order
+        self.pending[:] = sorted(
+            range(len(collection)),
+            key=lambda index: self.units[scheduling_unit(collection[index])],
+            reverse=True,
+        )
+        self.started_at = time.monotonic()
+        if not collection:
+            return
+
+        # Deal the longest tests round-robin so every worker starts on a long one.
+        for _ in range(2):
+            for node in self.nodes:
+                self._send_tests(node, 1)
+
+        if not self.pending:
+            for node in self.nodes:
+                node.shutdown()
+
+    def check_schedule(self, node: Any, duration: float = 0) -> None:
+        """Top the node back up to two pending items, or shut it down when drained."""
+        if node.shutting_down:
+            return
+        if self.pending:
+            missing = 2 - len(self.node2pending[node])
+            if missing > 0:
+                self._send_tests(node, missing)
+        else:
+            node.shutdown()
+        self.log("num items waiting for node:", len(self.pending))
+
+    def _send_tests(self, node: Any, num: int) -> None:
+        """Send ``num`` pending tests, plus the rest of the class the last one belongs to."""
+        collection = self.collection or []
+        while 0 < num < len(self.pending) and scheduling_unit(
+            collection[self.pending[num]]
+        ) == scheduling_unit(collection[self.pending[num - 1]]):
+            num += 1
+        super()._send_tests(node, num)
+
+
+class DurationSchedulerPlugin:
+    """Records durations, installs the LPT scheduler and reports the makespan."""
+
+    def __init__(self, config: PytestConfig, history: DurationHistory) -> None:
+        self.config = config
+        self.history = history
+        self.scheduler: Optional[LPTScheduling] = None
+        self.worker_busy: Dict[str, float] = {}
+        self.finished_at: Optional[float] = None
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_xdist_make_scheduler(self, config: PytestConfig, log: Any) -> Optional[Any]:
+        """Replace xdist's default ``load`` scheduler with the LPT scheduler."""
+        if config.getoption("--no-lpt-schedule") or config.getoption("dist", "no") != "load":
+            return None
+        self.scheduler = LPTScheduling(config, self.history, log)
+        return self.scheduler
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        """Accumulate phase durations (controller side, or single-process runs)."""
+        self.history.record(report.nodeid, report.when, report.duration)
+        node = getattr(report, "node", None)
+        worker = node.gateway.id if node is not None else "master"
+        self.worker_busy[worker] = self.worker_busy.get(worker, 0.0) + report.duration
+        self.finished_at = time.monotonic()
+
+    def pytest_sessionfinish(self, session: pytest.Session, exitstatus: int) -> None:
+        """Persist this run's durations into the history store."""
+        self.history.save()
+
+    def pytest_terminal_summary(self, terminalreporter: TerminalReporter) -> None:
+        """Print predicted vs. actual makespan for the scheduled run."""
+        scheduler = self.scheduler
+        if scheduler is None or not scheduler.collection or scheduler.started_at is None:
+            return
+        workers = max(scheduler.numnodes, 1)
+        ordered = [scheduler.predicted[nodeid] for nodeid in scheduler.collection]
+        predicted = lpt_makespan(list(scheduler.units.values()), workers)
+        baseline = chunked_makespan(ordered, workers)
+        actual = (self.finished_at or scheduler.started_at) - scheduler.started_at
+
+        if not summary_section(terminalreporter, self.config, "duration-aware scheduling"):
+            return
+        terminalreporter.write_line(
+            f"workers: {workers}, tests: {len(ordered)}, "
+            f"predicted serial time: {sum(ordered):.1f}s"
+        )
+        terminalreporter.write_line(
+            f"predicted makespan: {predicted:.1f}s (LPT) vs {baseline:.1f}s (collection order), "
+            f"saving ~{max(baseline - predicted, 0.0):.1f}s"
+        )
+        terminalreporter.write_line(f"actual makespan: {actual:.1f}s")
+        busy = ", ".join(f"{w}={s:.1f}s" for w, s in sorted(self.worker_busy.items()))
+        terminalreporter.write_line(f"worker busy time: {busy}")
+
+
+def pytest_addoption(parser: Parser) -> None:
+    """Register duration-scheduling command line options."""
+    group = parser.getgroup("parabank-scheduling", "duration-aware xdist scheduling")
+    group.addoption(
+        "--duration-history",
+        action="store",
+        default=DEFAULT_HISTORY_PATH,
+        help=f"Path of the per-test duration history (default: {DEFAULT_HISTORY_PATH})",
+    )
+    group.addoption(
+        "--no-lpt-schedule",
+        action="store_true",
+        default=False,
+        help="Use xdist's default load scheduling instead of longest-test-first",
+    )
+
+
+def pytest_configure(config: PytestConfig) -> None:
+    """Register the scheduler plugin on the controller (or single-process) session."""
+    if hasattr(config, "workerinput"):
+        # Workers forward their reports to the controller, which owns the history.
+        return
+    history = DurationHistory(Path(config.getoption("--duration-history"))).load()
+    config.pluginmanager.register(
+        DurationSchedulerPlugin(config, history), "parabank-duration-scheduler"
+    )
@@ -0,0 +1,122 @@
+"""Session-validity probe over the context's API request client.
+
+``user_login`` used to prove a saved session by rendering ``overview.htm``,
+waiting out a "Client Challenge" title and polling three locators, and bill pay
+tests loaded ``billpay.htm`` on top. The probe fetches one authenticated page
+through ``context.request`` instead. It shares the context's cookies but
+renders nothing. The session is valid when the response is a 200, the body has
+the logged-in menu (``logout.htm``) and it is not the internal-error page.
+
+Verdicts are cached per context and endpoint for ``--session-ttl`` seconds, so
+a pooled context that was proven a moment ago costs nothing, and one that has
+been idle for longer costs a single HTTP call.
+"""
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Generator, Tuple
+
+import pytest
+from _pytest.config.argparsing import Parser
+from playwright.sync_api import BrowserContext
+
+logger = logging.getLogger("parabank")
+
+DEFAULT_SESSION_TTL = 120.0
+PROBE_TIMEOUT_MS = 10000
+LOGGED_IN_MARKER = "logout.htm"
+INTERNAL_ERROR_MARKERS = ("internal error has occurred", "internal error has occured")
+
+
+@dataclass(frozen=True)
+class SessionVerdict:
+    """Outcome of one probe: whether the session works, and why not."""
+
+    valid: bool
+    reason: str
+    checked_at: float
+
+
+class SessionProbe:
+    """Probes and caches the session validity of browser contexts."""
+
+    def __init__(self, ttl: float = DEFAULT_SESSION_TTL) -> None:
+        self.ttl = ttl
+        self._verdicts: Dict[Tuple[BrowserContext, str], SessionVerdict] = {}
+        self.stats = {"probes": 0, "cached": 0, "invalid": 0}
+        self.probe_seconds = 0.0
+
+    def check(self, context: BrowserContext, base_url: str, endpoint: str) -> SessionVerdict:
+        """Return the cached verdict for ``endpoint`` if still fresh, else probe it."""
+        key = (context, endpoint)
+        cached = self._verdicts.get(key)
+        if cached is not None and cached.valid and time.monotonic() - cached.checked_at < self.ttl:
+            self.stats["cached"] += 1
+            return cached
+        verdict = self._probe(context, f"{base_url.rstrip('/')}/{endpoint}")
+        if key not in self._verdicts:
+            context.once("close", lambda _: self._forget(context))
+        self._verdicts[key] = verdict
+        if not verdict.valid:
+            self.stats["invalid"] += 1
+        return verdict
+
+    def mark_valid(self, context: BrowserContext, endpoint: str) -> None:
+        """Record a session proven another way (e.g. a manual login) as valid."""
+        key = (context, endpoint)
+        if key not in self._verdicts:
+            context.once("close", lambda _: self._forget(context))
+        self._verdicts[key] = SessionVerdict(True, "logged in", time.monotonic())
+
+    def _probe(self, context: BrowserContext, url: str) -> SessionVerdict:
+        started = time.monotonic()
+        self.stats["probes"] += 1
+        try:
+            response = context.request.get(url, max_redirects=0, timeout=PROBE_TIMEOUT_MS)
+            status = response.status
+            body = response.text().lower() if status == 200 else ""
+        except Exception as e:
+            return SessionVerdict(False, f"probe failed: {e}", started)
+        finally:
+            elapsed = time.monotonic() - started
+            self.probe_seconds += elapsed
+            logger.debug(f"Session probe {url} took {elapsed * 1000:.0f}ms")
+        if status != 200:
+            return SessionVerdict(False, f"status {status}", started)
+        if any(marker in body for marker in INTERNAL_ERROR_MARKERS):
+            return SessionVerdict(False, "internal error page", started)
+        if LOGGED_IN_MARKER not in body:
+            return SessionVerdict(False, "not logged in", started)
+        return SessionVerdict(True, "ok", started)
+
+    def _forget(self, context: BrowserContext) -> None:
+        for key in [key for key in self._verdicts if key[0] is context]:
+            del self._verdicts[key]
+
+    def log_stats(self) -> None:
+        stats = self.stats
+        logger.info(
+            f"Session probe: {stats['probes']} probe(s), {stats['cached']} cached, "
+            f"{stats['invalid']} invalid, {self.probe_seconds * 1000:.0f}ms spent probing"
+        )
+
+
+def pytest_addoption(parser: Parser) -> None:
+    """Register the session probe option."""
+    group = parser.getgroup("parabank-context-pool", "pre-authenticated context pool")
+    group.addoption(
+        "--session-ttl",
+        action="store",
+        type=float,
+        default=DEFAULT_SESSION_TTL,
+        help="Seconds a probed session stays trusted before it is probed again "
+        f"(default: {DEFAULT_SESSION_TTL:.0f})",
+    )
+
+
+@pytest.fixture(scope="session")
+def session_probe(pytestconfig: Any) -> Generator[SessionProbe, None, None]:
+    """Worker-scoped session probe with its verdict cache."""
+    probe = SessionProbe(pytestconfig.getoption("--session-ttl"))
+    yield probe
+    probe.log_stats()
@@ -0,0 +1,69 @@
+"""Fixed-layout records shared by all xdist workers through an mmap'd file.
+
+Used by the circuit breaker and the concurrency controller. Each record is a
+struct header plus an optional raw payload; read-modify-write cycles are
+serialised with ``flock`` so every worker on the host sees one consistent view.
+Without ``fcntl`` (Windows) or without a path the record is process-local.
+"""
+import mmap
+import os
+import struct
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows: state stays per process
+    fcntl = None  # type: ignore[assignment]
+
+
+class SharedRecord:
+    """A struct record (plus ``payload`` bytes) living in a shared memory map.
+
+    A zero-filled record (new or cleared file) reads back with every field at 0
+    and an all-zero payload, so callers treat 0 as "not initialised yet".
+    """
+
+    def __init__(
+        self,
+        fields: Sequence[Tuple[str, str]],
+        payload_size: int = 0,
+        path: Optional[Path] = None,
+        fresh: bool = False,
+    ) -> None:
+        self.names = [name for name, _ in fields]
+        self._header = struct.Struct("<" + "".join(fmt for _, fmt in fields))
+        self.payload_size = payload_size
+        size = self._header.size + payload_size
+        self._lock = threading.Lock()
+        self._fd: Optional[int] = None
+        if path is None:
+            self._map = mmap.mmap(-1, size)
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        if fresh or os.fstat(self._fd).st_size != size:
+            os.ftruncate(self._fd, 0)
+            os.ftruncate(self._fd, size)
+        self._map = mmap.mmap(self._fd, size)
+
+    @contextmanager
+    def locked(self) -> Iterator[Dict[str, Any]]:
+        """Yield the decoded record for update; changes are written back on exit."""
+        with self._lock:
+            if self._fd is not None and fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                record: Dict[str, Any] = dict(
+                    zip(self.names, self._header.unpack_from(self._map, 0))
+                )
+                start = self._header.size
+                record["payload"] = bytearray(self._map[start : start + self.payload_size])
+                yield record
+                self._header.pack_into(self._map, 0, *(record[name] for name in self.names))
+                self._map[start : start + self.payload_size] = bytes(record["payload"])
+            finally:
+                if self._fd is not None and fcntl is not None:
+                    fcntl.flock(self._fd, fcntl.LOCK_UN)
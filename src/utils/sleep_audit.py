@@ -0,0 +1,354 @@
+"""Hard-sleep audit: where a run spends its time waiting on fixed delays.
+
+Three kinds of dead time are attributed to the running test and to the call
+site in this repository that caused them:
+
+* ``wait_for_timeout``: ``Page``/``Frame.wait_for_timeout``, measured.
+* ``time.sleep``: any sleep on the main thread, measured. Background threads
+  (metrics pusher, watchdogs) are not counted; they do not hold up a test.
+* ``slow_mo``: the delay the Playwright driver adds after every input action
+  and navigation. It cannot be observed from Python, so it is estimated as the
+  browser's ``slow_mo`` times the number of slowed-down calls, and reported
+  under the single site ``slow_mo``.
+
+Every wait is added to ``test_sleep_seconds{kind,site}``. The terminal summary
+ranks call sites and tests by dead time and shows its share of the tests' wall
+time. ``--sleep-budget SECONDS`` fails the run when the total goes over it.
+``--no-sleep-audit`` leaves Playwright and ``time.sleep`` unpatched.
+"""
+import functools
+import logging
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from types import FrameType
+from typing import Any, Callable, Dict, Generator, List, Optional, Tuple
+
+import pytest
+from _pytest.config import Config as PytestConfig
+from _pytest.config.argparsing import Parser
+from _pytest.nodes import Item
+from _pytest.terminal import TerminalReporter
+from playwright.sync_api import (
+    BrowserType,
+    ElementHandle,
+    Frame,
+    Keyboard,
+    Locator,
+    Mouse,
+    Page,
+    Touchscreen,
+)
+
+from src.utils.metrics_pusher import SLEEP_SECONDS
+from src.utils.xdist_stats import collect, publish, summary_section
+
+logger = logging.getLogger("parabank")
+
+SUMMARY_TOP = 10
+SLOW_MO_SITE = "slow_mo"
+
+# Sync API methods whose protocol call the driver follows with the slow_mo delay
+_SLOWED_ACTIONS: Dict[type, Tuple[str, ...]] = {
+    Locator: (
+        "blur",
+        "check",
+        "click",
+        "dblclick",
+        "dispatch_event",
+        "drag_to",
+        "fill",
+        "focus",
+        "hover",
+        "press",
+        "press_sequentially",
+        "scroll_into_view_if_needed",
+        "select_option",
+        "select_text",
+        "set_checked",
+        "set_input_files",
+        "tap",
+        "type",
+        "uncheck",
+    ),
+    Page: (
+        "check",
+        "click",
+        "dblclick",
+        "dispatch_event",
+        "drag_and_drop",
+        "fill",
+        "focus",
+        "go_back",
+        "go_forward",
+        "goto",
+        "hover",
+        "press",
+        "reload",
+        "select_option",
+        "set_checked",
+        "set_input_files",
+        "tap",
+        "type",
+        "uncheck",
+    ),
+    Frame: (
+        "check",
+        "click",
+        "dblclick",
+        "dispatch_event",
+        "drag_and_drop",
+        "fill",
+        "focus",
+        "goto",
+        "hover",
+        "press",
+        "select_option",
+        "set_checked",
+        "set_input_files",
+        "tap",
+        "type",
+        "uncheck",
+    ),
+    ElementHandle: (
+        "check",
+        "click",
+        "dblclick",
+        "dispatch_event",
+        "fill",
+        "focus",
+        "hover",
+        "press",
+        "scroll_into_view_if_needed",
+        "select_option",
+        "select_text",
+        "set_checked",
+        "set_input_files",
+        "tap",
+        "type",
+        "uncheck",
+    ),
+    Keyboard: ("down", "insert_text", "press", "type", "up"),
+    Mouse: ("click", "dblclick", "down", "move", "up", "wheel"),
+    Touchscreen: ("tap",),
+}
+
+
+class SleepAudit:
+    """Dead time of this process by call site and by test."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = f"{root}{os.sep}"
+        self.sites: Dict[str, List[Any]] = {}  # site -> [kind, calls, seconds]
+        self.tests: Dict[str, float] = {}
+        self.test_wall = 0.0
+        self.slow_mo = 0.0
+        self.current: Optional[str] = None
+
+    def record(self, kind: str, seconds: float, site: str) -> None:
+        entry = self.sites.setdefault(site, [kind, 0, 0.0])
+        entry[1] += 1
+        entry[2] += seconds
+        if self.current is not None:
+            self.tests[self.current] = self.tests.get(self.current, 0.0) + seconds
+        SLEEP_SECONDS.labels(kind=kind, site=site).inc(seconds)
+
+    def call_site(self) -> str:
+        """``path:line (function)`` of the innermost caller inside the repository."""
+        frame: Optional[FrameType] = sys._getframe(2)  # pylint: disable=protected-access
+        fallback: Optional[FrameType] = None
+        while frame is not None:
+            filename = frame.f_code.co_filename
+            if filename != __file__:
+                fallback = fallback or frame
+                if filename.startswith(self.root) and "site-packages" not in filename:
+                    break
+            frame = frame.f_back
+        frame = frame or fallback
+        if frame is None:
+            return "unknown"
+        filename = frame.f_code.co_filename
+        if filename.startswith(self.root):
+            filename = filename[len(self.root) :]
+        return f"{filename}:{frame.f_lineno} ({frame.f_code.co_name})"
+
+    def total(self) -> float:
+        return float(sum(entry[2] for entry in self.sites.values()))
+
+    def merge(self, data: Dict[str, Any]) -> None:
+        for site, (kind, calls, seconds) in data["sites"].items():
+            entry = self.sites.setdefault(site, [kind, 0, 0.0])
+            entry[1] += calls
+            entry[2] += seconds
+        for nodeid, seconds in data["tests"].items():
+            self.tests[nodeid] = self.tests.get(nodeid, 0.0) + seconds
+        self.test_wall += data["test_wall"]
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"sites": self.sites, "tests": self.tests, "test_wall": self.test_wall}
+
+
+_audit: Optional[SleepAudit] = None
+
+
+def _wrap_sleep(sleep: Callable[[float], None]) -> Callable[[float], None]:
+    @functools.wraps(sleep)
+    def audited_sleep(seconds: float) -> None:
+        audit = _audit
+        if audit is None or threading.current_thread() is not threading.main_thread():
+            sleep(seconds)
+            return
+        started = time.perf_counter()
+        try:
+            sleep(seconds)
+        finally:
+            audit.record("time.sleep", time.perf_counter() - started, audit.call_site())
+
+    return audited_sleep
+
+
+def _wrap_wait_for_timeout(method: Callable[..., None]) -> Callable[..., None]:
+    @functools.wraps(method)
+    def audited_wait(self: Any, timeout: float) -> None:
+        audit = _audit
+        if audit is None:
+            method(self, timeout)
+            return
+        started = time.perf_counter()
+        try:
+            method(self, timeout)
+        finally:
+            audit.record("wait_for_timeout", time.perf_counter() - started, audit.call_site())
+
+    return audited_wait
+
+
+def _wrap_action(method: Callable[..., Any]) -> Callable[..., Any]:
+    @functools.wraps(method)
+    def audited_action(*args: Any, **kwargs: Any) -> Any:
+        try:
+            return method(*args, **kwargs)
+        finally:
+            audit = _audit
+            if audit is not None and audit.slow_mo:
+                audit.record("slow_mo", audit.slow_mo, SLOW_MO_SITE)
+
+    return audited_action
+
+
+def _wrap_browser_start(method: Callable[..., Any]) -> Callable[..., Any]:
+    @functools.wraps(method)
+    def remember_slow_mo(*args: Any, **kwargs: Any) -> Any:
+        if _audit is not None:
+            _audit.slow_mo = (kwargs.get("slow_mo") or 0) / 1000
+        return method(*args, **kwargs)
+
+    return remember_slow_mo
+
+
+def _install() -> None:
+    """Patch ``time.sleep`` and the Playwright sync API (once per process)."""
+    if getattr(time.sleep, "__wrapped__", None) is not None:
+        return
+    setattr(time, "sleep", _wrap_sleep(time.sleep))
+    for owner in (Page, Frame):
+        setattr(owner, "wait_for_timeout", _wrap_wait_for_timeout(owner.wait_for_timeout))
+    for cls, names in _SLOWED_ACTIONS.items():
+        for name in names:
+            setattr(cls, name, _wrap_action(getattr(cls, name)))
+    for name in ("launch", "connect"):
+        setattr(BrowserType, name, _wrap_browser_start(getattr(BrowserType, name)))
+
+
+def pytest_addoption(parser: Parser) -> None:
+    """Register the sleep audit options."""
+    group = parser.getgroup("parabank-sleep-audit", "hard-sleep audit")
+    group.addoption(
+        "--no-sleep-audit",
+        action="store_true",
+        default=False,
+        help="Do not instrument wait_for_timeout, time.sleep and slow_mo",
+    )
+    group.addoption(
+        "--sleep-budget",
+        action="store",
+        type=float,
+        default=0.0,
+        help="Fail the run if fixed waits add up to more than this many seconds (0: no budget)",
+    )
+
+
+def pytest_configure(config: PytestConfig) -> None:
+    """Instrument the processes that run tests; the xdist controller only merges."""
+    global _audit  # pylint: disable=global-statement
+    if config.getoption("--no-sleep-audit"):
+        return
+    _audit = SleepAudit(config.rootpath)
+    if hasattr(config, "workerinput") or getattr(config.option, "dist", "no") == "no":
+        _install()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item: Item, nextitem: Optional[Item]) -> Generator[None, None, None]:
+    """Attribute waits during setup, call and teardown to ``item``."""
+    if _audit is None:
+        yield
+        return
+    _audit.current = item.nodeid
+    started = time.monotonic()
+    yield
+    _audit.test_wall += time.monotonic() - started
+    _audit.current = None
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_teardown(item: Item, nextitem: Optional[Item]) -> Generator[None, None, None]:
+    """Expose each test's dead time in the JUnit/HTML report properties."""
+    yield
+    if _audit is not None:
+        item.user_properties.append(("sleep_seconds", round(_audit.tests.get(item.nodeid, 0), 3)))
+
+
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    """Hand the audit to the controller, or enforce the budget on it."""
+    if _audit is None:
+        return
+    if publish(session.config, "sleep_audit", _audit.as_dict()):
+        return
+    budget = session.config.getoption("--sleep-budget")
+    if budget and _audit.total() > budget:
+        logger.error(f"Fixed waits took {_audit.total():.1f}s, over the {budget:.1f}s budget")
+        session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node: Any, error: Any) -> None:
+    """Merge a finished worker's audit (controller side)."""
+    data = collect(node, "sleep_audit")
+    if data and _audit is not None:
+        _audit.merge(data)
+
+
+def pytest_terminal_summary(terminalreporter: TerminalReporter, config: PytestConfig) -> None:
+    """Rank call sites and tests by the dead time they caused."""
+    if _audit is None or not _audit.sites:
+        return
+    if not summary_section(terminalreporter, config, "hard sleeps"):
+        return
+    total = _audit.total()
+    share = f", {100 * total / _audit.test_wall:.0f}% of test time" if _audit.test_wall else ""
+    budget = config.getoption("--sleep-budget")
+    verdict = ""
+    if budget:
+        verdict = f" (over the {budget:.1f}s budget)" if total > budget else " (within budget)"
+    terminalreporter.write_line(f"{total:.1f}s spent in fixed waits{share}{verdict}")
+    ranked = sorted(_audit.sites.items(), key=lambda entry: entry[1][2], reverse=True)
+    for site, (kind, calls, seconds) in ranked[:SUMMARY_TOP]:
+        terminalreporter.write_line(f"  {seconds:7.1f}s  {calls:5d}x  {kind:16}  {site}")
+    tests = sorted(_audit.tests.items(), key=lambda entry: entry[1], reverse=True)
+    if tests:
+        terminalreporter.write_line("slowest tests by dead time:")
+        for nodeid, seconds in tests[:SUMMARY_TOP]:
+            terminalreporter.write_line(f"  {seconds:7.1f}s  {nodeid}")
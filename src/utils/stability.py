@@ -1,40 +1,80 @@
 """Stability utilities for handling ParaBank demo site instability."""
 import logging
+import re
 import time
-from collections import deque
-from typing import Any, Callable, Optional
+import urllib.error
+import urllib.request
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 from urllib.parse import urlparse
 
 from playwright._impl._errors import TimeoutError as PlaywrightTimeoutError
-from playwright.sync_api import Locator, Page, Response
-
-_RECENT_HTTP_EVENTS: deque[dict[str, Any]] = deque(maxlen=30)
-
-
-def _record_http_event(url: str, status: int) -> None:
-    """Track recent app responses to diagnose unstable endpoints."""
-    parsed = urlparse(url)
-    path = parsed.path or "/"
-    if parsed.query:
-        path = f"{path}?{parsed.query}"
-    _RECENT_HTTP_EVENTS.append(
-        {
-            "ts": int(time.time()),
-            "status": status,
-            "url": url,
-            "path": path,
-        }
-    )
+from playwright.sync_api import Locator, Page, Request, Response
+
+from src.utils.error_probe import detect_error_page
+from src.utils.metrics_pusher import DROPDOWN_WAIT, HTTP_REQUEST_DURATION
+from src.utils.network_timeline import current_timeline
+from src.utils.shared_state import SharedRecord
+
+# Extra consumers of app responses: callback(url, status, latency_ms)
+_RESPONSE_LISTENERS: List[Callable[[str, int, float], None]] = []
+
+
+def add_response_listener(listener: Callable[[str, int, float], None]) -> None:
+    """Feed every app response seen by ``attach_circuit_breaker`` to ``listener`` as well."""
+    if listener not in _RESPONSE_LISTENERS:
+        _RESPONSE_LISTENERS.append(listener)
+
+
+# Path segments that identify a record (ids, dates, amounts) rather than an endpoint
+_ID_SEGMENT = re.compile(r"^[-+]?[\d.,:-]+$|^\d+[A-Za-z]*$")
+_STATIC_SUFFIXES = (".css", ".js", ".gif", ".png", ".jpg", ".jpeg", ".svg", ".ico", ".woff")
+# Bound on distinct endpoint labels; anything beyond it is reported as "other"
+MAX_ENDPOINT_LABELS = 200
+_seen_endpoints: set[str] = set()
+
+
+def normalize_endpoint(url: str, base_url_prefix: str = "") -> str:
+    """Map a request URL to a low-cardinality ParaBank endpoint label.
+
+    The query string and the base path are dropped, record ids become ``{id}``,
+    the credentials of ``login/<user>/<password>`` are masked and static assets
+    collapse into one label per file type, e.g.
+    ``/parabank/services_proxy/bank/accounts/13344/transactions`` ->
+    ``/services_proxy/bank/accounts/{id}/transactions``.
+    """
+    path = urlparse(url).path or "/"
+    base_path = urlparse(base_url_prefix).path.rstrip("/") if base_url_prefix else ""
+    # Only a whole leading segment: /parabankx/a.htm is not under /parabank
+    if base_path and (path == base_path or path.startswith(f"{base_path}/")):
+        path = path[len(base_path) :] or "/"
+    if path.lower().endswith(_STATIC_SUFFIXES):
+        return f"/static/*{path[path.rfind('.'):].lower()}"
+    segments = path.split("/")
+    if "login" in segments and segments.index("login") < len(segments) - 1:
+        login = segments.index("login")
+        segments = segments[: login + 1] + ["{username}", "{password}"]
+    endpoint = "/".join("{id}" if _ID_SEGMENT.match(seg) else seg for seg in segments)
+    if endpoint not in _seen_endpoints:
+        if len(_seen_endpoints) >= MAX_ENDPOINT_LABELS:
+            return "other"
+        _seen_endpoints.add(endpoint)
+    return endpoint
 
 
 def recent_http_events(limit: int = 8) -> list[dict[str, Any]]:
-    """Return most recent response events for diagnostics."""
-    if limit <= 0:
+    """Return the running test's most recent app requests for diagnostics."""
+    timeline = current_timeline()
+    if timeline is None:
         return []
-    return list(_RECENT_HTTP_EVENTS)[-limit:]
+    return [
+        {"status": status, "path": endpoint, "elapsed_ms": end}
+        for _, _, end, _, status, endpoint in timeline.recent(limit)
+    ]
 
 
-def handle_internal_error(page: Page, requires_login: bool = True) -> None:
+def handle_internal_error(page: Page, requires_login: bool = True, fresh: bool = True) -> None:
     """Handle ParaBank internal errors appropriately based on test requirements.
 
     For login-required tests: Mark as xfail (conditional pass) when server error occurs.
@@ -43,32 +83,14 @@ def handle_internal_error(page: Page, requires_login: bool = True) -> None:
     Args:
         page: The Playwright page object
         requires_login: Whether this test requires authentication (default: True)
+        fresh: Re-check the page instead of reusing the verdict cached for the current
+            document. Keep the default after AJAX posts, which change the page without
+            navigating; only pass False right after a navigation.
     """
-    # Check for the known "Error!" title or error paragraph
-    # Use a short timeout to not slow down healthy runs
-    error_detected = False
-    error_message = ""
-
-    try:
-        error_header = page.locator("h1.title", has_text="Error!")
-        error_p = page.locator("p.error")
-
-        if error_header.is_visible(timeout=500) or error_p.is_visible(timeout=500):
-            error_text = (error_header.inner_text() if error_header.is_visible() else "") + (
-                error_p.inner_text() if error_p.is_visible() else ""
-            )
-            if "internal error" in error_text.lower() or "error!" in error_text:
-                error_detected = True
-                error_message = error_text.strip()
-    except Exception:  # nosec B110
-        pass  # Intentionally ignore errors during error detection
-
-    # Also check page content as a fallback for the specific error message
-    if not error_detected:
-        content = page.content().lower()
-        if "internal error has occurred" in content or "internal error has occured" in content:
-            error_detected = True
-            error_message = "Internal Error detected - server is experiencing issues"
+    verdict = detect_error_page(page, fresh=fresh)
+    # An "Error!" page counts as well as the internal-error text
+    error_detected = verdict.is_error
+    error_message = verdict.message or "Internal Error detected - server is experiencing issues"
 
     # Only handle the error if it was detected and test requires login
     if error_detected and requires_login:
@@ -87,43 +109,219 @@ class ParaBankInternalError(Exception):
 
 
 class EnvironmentBlockedException(Exception):
-    """Raised when the Circuit Breaker trips after 3 consecutive 500/429 responses."""
+    """Raised when the circuit breaker stays open longer than the allowed pause."""
+
+
+class _SharedCircuitState(SharedRecord):
+    """Breaker state shared by every xdist worker; the payload is the outcome window."""
+
+    FIELDS = (
+        ("version", "i"),
+        ("state", "i"),
+        ("window_pos", "i"),
+        ("window_len", "i"),
+        ("trips", "i"),
+        ("opened_at", "d"),
+        ("cooldown", "d"),
+        ("probe_started", "d"),
+        ("paused", "d"),
+    )
+    VERSION = 1
+
+    def __init__(self, window: int, path: Optional[Path] = None, fresh: bool = False) -> None:
+        super().__init__(self.FIELDS, window, path, fresh)
+        self.window = window
+
+    @contextmanager
+    def locked(self) -> Iterator[Dict[str, Any]]:
+        """Yield the decoded state for update; changes are written back on exit."""
+        with super().locked() as state:
+            if state["version"] != self.VERSION:
+                # Fresh (zero-filled) file: a closed breaker with an empty window
+                state.update(dict.fromkeys(self.names, 0), version=self.VERSION)
+                state["payload"] = bytearray(self.window)
+            state["outcomes"] = state["payload"]
+            yield state
+            state["payload"] = state.pop("outcomes")
 
 
 class CircuitBreaker:
-    """Tracks consecutive 500/429 HTTP responses and aborts run after threshold."""
+    """Closed/open/half-open breaker over a 500/429 error rate shared by all workers.
 
-    THRESHOLD = 3
+    CLOSED: app responses feed a rolling window; the breaker opens once the
+    window holds at least THRESHOLD failures making up FAILURE_RATE of it.
+    OPEN: tests pause in ``wait_until_closed`` until the cooldown has elapsed.
+    HALF_OPEN: exactly one worker sends a probe request; success closes the
+    breaker, failure reopens it with a doubled cooldown.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = 0, 1, 2
+    STATE_NAMES = {CLOSED: "closed", OPEN: "open", HALF_OPEN: "half-open"}
 
-    def __init__(self) -> None:
-        self._count = 0
+    THRESHOLD = 3
+    FAILURE_RATE = 0.5
+    WINDOW = 10
+    COOLDOWN_SECONDS = 30.0
+    MAX_COOLDOWN_SECONDS = 240.0
+    MAX_WAIT_SECONDS = 600.0
+    # A half-open probe older than this is assumed lost with its worker and retaken.
+    PROBE_TIMEOUT_SECONDS = 30.0
+
+    def __init__(
+        self,
+        state_path: Optional[Path] = None,
+        fresh: bool = False,
+        cooldown: float = COOLDOWN_SECONDS,
+        max_wait: float = MAX_WAIT_SECONDS,
+    ) -> None:
+        self._shared = _SharedCircuitState(self.WINDOW, state_path, fresh)
+        self.cooldown = cooldown
+        self.max_wait = max_wait
+        self.probe_url: Optional[str] = None
+
+    @property
+    def state(self) -> str:
+        """Current state name: ``closed``, ``open`` or ``half-open``."""
+        with self._shared.locked() as shared:
+            return self.STATE_NAMES[shared["state"]]
+
+    def stats(self) -> Dict[str, Any]:
+        """Return trip count and total worker pause time across the run."""
+        with self._shared.locked() as shared:
+            return {
+                "state": self.STATE_NAMES[shared["state"]],
+                "trips": shared["trips"],
+                "paused_seconds": shared["paused"],
+            }
 
     def record(self, url: str, status: int, base_url_prefix: str = "") -> None:
-        """Record a response. Increment on 500/429, reset on 2xx. Raise when threshold hit."""
+        """Record a response: 500/429 count as failures, 2xx as successes."""
         # Only count responses to our app (filter by base_url); skip if no filter
         if base_url_prefix and not url.startswith(base_url_prefix):
             return
-
         if status in (500, 429):
-            self._count += 1
-            if self._count >= self.THRESHOLD:
-                msg = (
-                    f"Circuit breaker tripped after {self.THRESHOLD} consecutive "
-                    f"500/429 responses. Aborting test run."
-                )
-                raise EnvironmentBlockedException(msg)
+            self._push(failed=True)
         elif 200 <= status < 300:
-            self._count = 0
+            self._push(failed=False)
+
+    def record_failure(self) -> None:
+        """Count a server failure detected outside a response (e.g. an internal error page)."""
+        self._push(failed=True)
+
+    def _push(self, failed: bool) -> None:
+        with self._shared.locked() as shared:
+            if shared["state"] != self.CLOSED:
+                # While open/half-open only the probe decides
+                return
+            shared["outcomes"][shared["window_pos"]] = 1 if failed else 0
+            shared["window_pos"] = (shared["window_pos"] + 1) % self.WINDOW
+            shared["window_len"] = min(shared["window_len"] + 1, self.WINDOW)
+            window = shared["outcomes"][: shared["window_len"]]
+            failures = sum(window)
+            if failures >= self.THRESHOLD and failures / len(window) >= self.FAILURE_RATE:
+                self._open(shared, self.cooldown)
+                logging.getLogger("parabank").warning(
+                    f"Circuit breaker opened: {failures}/{len(window)} recent app responses "
+                    f"were 500/429; pausing workers for {self.cooldown:.0f}s"
+                )
+
+    def _open(self, shared: Dict[str, Any], cooldown: float) -> None:
+        shared.update(state=self.OPEN, opened_at=time.time(), cooldown=cooldown)
+        shared["trips"] += 1
+
+    def wait_until_closed(self) -> float:
+        """Block while the breaker is open; return the seconds spent waiting.
+
+        Raises:
+            EnvironmentBlockedException: If the breaker stays open beyond ``max_wait``
+        """
+        logger = logging.getLogger("parabank")
+        started = time.monotonic()
+        while True:
+            probe = False
+            with self._shared.locked() as shared:
+                now = time.time()
+                if shared["state"] == self.CLOSED:
+                    break
+                if shared["state"] == self.OPEN and now - shared["opened_at"] >= shared["cooldown"]:
+                    shared.update(state=self.HALF_OPEN, probe_started=now)
+                    probe = True
+                elif (
+                    shared["state"] == self.HALF_OPEN
+                    and now - shared["probe_started"] > self.PROBE_TIMEOUT_SECONDS
+                ):
+                    shared["probe_started"] = now
+                    probe = True
+                remaining = shared["opened_at"] + shared["cooldown"] - now
+            if probe:
+                self._run_probe()
+                continue
+            waited = time.monotonic() - started
+            if waited > self.max_wait:
+                self._add_paused(waited)
+                raise EnvironmentBlockedException(
+                    f"Circuit breaker still open after pausing {waited:.0f}s"
+                )
+            time.sleep(min(max(remaining, 0.2), 1.0))
+        waited = time.monotonic() - started
+        if waited > 0.01:
+            self._add_paused(waited)
+            logger.info(f"Resumed after circuit breaker pause of {waited:.1f}s")
+        return waited
+
+    def _run_probe(self) -> None:
+        healthy = self._probe()
+        with self._shared.locked() as shared:
+            if healthy:
+                shared.update(state=self.CLOSED, window_pos=0, window_len=0)
+                shared["outcomes"] = bytearray(self.WINDOW)
+            else:
+                self._open(shared, min(shared["cooldown"] * 2, self.MAX_COOLDOWN_SECONDS))
+        logging.getLogger("parabank").warning(
+            f"Circuit breaker probe {'succeeded, closing' if healthy else 'failed, reopening'}"
+        )
+
+    def _probe(self) -> bool:
+        """Send one request to the app; without a probe URL the cooldown alone decides."""
+        if not self.probe_url:
+            return True
+        try:
+            with urllib.request.urlopen(  # nosec B310 - probe_url is the configured base_url
+                self.probe_url, timeout=10
+            ) as response:
+                return int(response.status) < 500 and int(response.status) != 429
+        except urllib.error.HTTPError as e:
+            return e.code < 500 and e.code != 429
+        except (urllib.error.URLError, OSError):
+            return False
+
+    def _add_paused(self, seconds: float) -> None:
+        with self._shared.locked() as shared:
+            shared["paused"] += seconds
 
     def reset(self) -> None:
-        """Reset the failure counter (e.g., at session start)."""
-        self._count = 0
+        """Close the breaker and clear the shared failure window (e.g., at session start)."""
+        with self._shared.locked() as shared:
+            shared.update(state=self.CLOSED, window_pos=0, window_len=0, trips=0, paused=0.0)
+            shared["outcomes"] = bytearray(self.WINDOW)
 
 
-# Singleton for use across the test session
+# Session-wide breaker; configure_circuit_breaker() moves it onto the shared store
 _circuit_breaker = CircuitBreaker()
 
 
+def configure_circuit_breaker(
+    state_path: Path,
+    fresh: bool,
+    cooldown: float = CircuitBreaker.COOLDOWN_SECONDS,
+    max_wait: float = CircuitBreaker.MAX_WAIT_SECONDS,
+) -> CircuitBreaker:
+    """Back the session-wide breaker by ``state_path`` (``fresh`` clears it, controller only)."""
+    global _circuit_breaker  # pylint: disable=global-statement
+    _circuit_breaker = CircuitBreaker(state_path, fresh=fresh, cooldown=cooldown, max_wait=max_wait)
+    return _circuit_breaker
+
+
 def get_circuit_breaker() -> CircuitBreaker:
     """Return the session-wide circuit breaker instance."""
     return _circuit_breaker
@@ -131,28 +329,71 @@ def get_circuit_breaker() -> CircuitBreaker:
 
 def attach_circuit_breaker(page: Page, base_url: str) -> None:
     """Attach response listener to page for circuit breaker (500/429)."""
+    breaker = _circuit_breaker
+    base_prefix = base_url.rstrip("/") if base_url else ""
+    if base_prefix and breaker.probe_url is None:
+        breaker.probe_url = f"{base_prefix}/index.htm"
+
+    # Status and Content-Length of each app request between its response and its completion
+    responses: Dict[Request, Tuple[int, int]] = {}
 
     def _on_response(response: Response) -> None:
         try:
             status = response.status
             url = response.url
-            base_prefix = base_url.rstrip("/") if base_url else ""
             if base_prefix and not url.startswith(base_prefix):
                 return
-            _record_http_event(url, status)
-            _circuit_breaker.record(url, status, base_prefix)
-        except EnvironmentBlockedException:
-            raise
+            length = response.headers.get("content-length", "")
+            responses[response.request] = (status, int(length) if length.isdigit() else -1)
+            breaker.record(url, status, base_prefix)
+            if _RESPONSE_LISTENERS:
+                # Time to first byte; the body may still be streaming at this point
+                latency_ms = max(float(response.request.timing.get("responseStart", 0.0)), 0.0)
+                for listener in _RESPONSE_LISTENERS:
+                    listener(url, status, latency_ms)
+        except Exception:  # nosec B110
+            pass
+
+    def _on_request_done(request: Request) -> None:
+        status, size = responses.pop(request, (0, -1))
+        if not status and (
+            request.failure is None or (base_prefix and not request.url.startswith(base_prefix))
+        ):
+            return
+        try:
+            timing = request.timing
+            endpoint = normalize_endpoint(request.url, base_prefix)
+            timeline = current_timeline()
+            if timeline is not None:
+                timeline.record(
+                    endpoint,
+                    status,
+                    timing["startTime"] / 1000,
+                    timing["responseStart"],
+                    timing["responseEnd"],
+                    size,
+                )
+            # responseEnd is relative to startTime; it is -1 when the body never arrived
+            elapsed_ms = timing["responseEnd"]
+            if elapsed_ms < 0:
+                elapsed_ms = timing["responseStart"]
+            if status and elapsed_ms >= 0:
+                HTTP_REQUEST_DURATION.labels(
+                    endpoint=endpoint, status_class=f"{status // 100}xx"
+                ).observe(elapsed_ms / 1000)
         except Exception:  # nosec B110
             pass
 
     page.on("response", _on_response)
+    page.on("requestfinished", _on_request_done)
+    page.on("requestfailed", _on_request_done)
 
 
 # Backward compatibility - keep old function name but redirect to new one
 def skip_if_internal_error(page: Page) -> None:
     """Deprecated: Use handle_internal_error instead."""
-    handle_internal_error(page, requires_login=False)
+    # Called right after navigations; the cached verdict of the new document is current
+    handle_internal_error(page, requires_login=False, fresh=False)
 
 
 def safe_click(locator: Any, retry_on_timeout: bool = False, timeout: int = 10000) -> None:
@@ -228,28 +469,87 @@ def retry_with_reload(
     return None
 
 
-def wait_for_options(locator: Locator, min_options: int = 1, timeout: int = 15000) -> None:
-    """Wait for a select/dropdown to have at least min_options.
-
-    This uses a polling loop for maximum reliability in parallel execution.
+_OPTIONS_SCRIPT = """
+(select, { minOptions, labels, timeout }) => new Promise((resolve) => {
+  const valid = () => Array.from(select.options)
+    .map((option) => (option.textContent || "").trim())
+    .filter((text) => text && !text.toLowerCase().includes("loading"));
+  const ready = () => {
+    const options = valid();
+    return options.length >= minOptions && labels.every((label) => options.includes(label));
+  };
+  if (ready()) {
+    resolve({ ready: true, options: valid() });
+    return;
+  }
+  const observer = new MutationObserver(() => ready() && finish(true));
+  const timer = setTimeout(() => finish(false), timeout);
+  function finish(ok) {
+    observer.disconnect();
+    clearTimeout(timer);
+    resolve({ ready: ok, options: valid() });
+  }
+  observer.observe(select, { childList: true, subtree: true, characterData: true });
+})
+"""
+
+
+def _select_name(locator: Locator) -> str:
+    match = re.search(r"selector='([^']*)'", repr(locator))
+    return match.group(1) if match else "select"
+
+
+def wait_for_options(
+    locator: Locator,
+    min_options: int = 1,
+    timeout: int = 15000,
+    labels: Optional[Sequence[str]] = None,
+) -> None:
+    """Wait for a select/dropdown to have at least min_options (and every label in labels).
+
+    A MutationObserver on the select resolves the moment the options arrive, so
+    the wait costs one round trip instead of polling. Empty and "Loading..."
+    options do not count. The time each wait took is logged and observed in
+    ``dropdown_wait_seconds``.
     """
     logger = logging.getLogger("parabank")
-    start_time = time.time()
-
-    while time.time() - start_time < (timeout / 1000):
+    name = _select_name(locator)
+    wanted = list(labels or [])
+    started = time.monotonic()
+    deadline = started + timeout / 1000
+    result: Dict[str, Any] = {"ready": False, "options": []}
+    while not result["ready"]:
+        remaining = int((deadline - time.monotonic()) * 1000)
+        if remaining <= 0:
+            break
         try:
-            options = locator.locator("option").all_inner_texts()
-            # Filter out empty options or "Loading..."
-            valid_options = [o for o in options if o.strip() != "" and "loading" not in o.lower()]
-            if len(valid_options) >= min_options:
-                return
-        except Exception:
-            pass  # nosec: B110 (Expected timeout/visibility failure)
-
-        time.sleep(0.5)
-
-    logger.warning(f"Timed out waiting for {min_options} options in dropdown after {timeout}ms")
+            result = locator.evaluate(
+                _OPTIONS_SCRIPT,
+                {"minOptions": min_options, "labels": wanted, "timeout": remaining},
+                timeout=remaining,
+            )
+        except PlaywrightTimeoutError:
+            break
+        except Exception as e:
+            # The page navigated or re-rendered the select; observe the new one
+            logger.debug(f"Dropdown wait on {name} restarted: {e}")
+            try:
+                locator.wait_for(state="attached", timeout=max(remaining, 1))
+            except PlaywrightTimeoutError:
+                break
+    elapsed = time.monotonic() - started
+    DROPDOWN_WAIT.labels(select=name).observe(elapsed)
+    if result["ready"]:
+        logger.debug(
+            f"Dropdown {name} ready with {len(result['options'])} option(s) "
+            f"in {elapsed * 1000:.0f}ms"
+        )
+        return
+
+    condition = f"{min_options} options" + (f" including {wanted}" if wanted else "")
+    logger.warning(f"Timed out waiting for {condition} in dropdown {name} after {timeout}ms")
     # Raise a clear error if it fails
     raise PlaywrightTimeoutError(
-        f"Dropdown did not populate with {min_options} options in {timeout}ms"
+        f"Dropdown {name} did not populate with {condition} in {timeout}ms "
+        f"(has {result['options']})"
     )
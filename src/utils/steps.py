@@ -0,0 +1,246 @@
+"""Step-level timing for page objects and flows.
+
+``TEST_DURATION`` says a test took four minutes, not which part of it did.
+Page objects mark their business steps with ``step``. It works both as a
+decorator (the name defaults to ``Class.method``) and as a context manager:
+
+    @step()
+    def register(self, user_data): ...
+
+    with step("verify overview"):
+        ...
+
+Steps nest. Each test gets a tree of spans timed with ``time.perf_counter``,
+with the test itself as the root. The tree is attached to the test's report as
+a "steps" section. Every step is observed in ``test_step_duration_seconds{step}``.
+The session's trees are folded into a flame graph file, ``--step-flamegraph``
+(``test-results/steps.folded`` by default). It is in the collapsed-stack format
+that ``flamegraph.pl`` and speedscope read: one ``test;step;substep <ms>`` line
+per stack, counting time not spent in a child step.
+
+Only the main thread is traced. A step entered outside a test is timed for the
+histogram but belongs to no tree.
+"""
+import functools
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Generator, List, Optional, TypeVar, cast
+
+import pytest
+from _pytest.config import Config as PytestConfig
+from _pytest.config.argparsing import Parser
+from _pytest.nodes import Item
+from _pytest.runner import CallInfo
+from _pytest.terminal import TerminalReporter
+
+from src.utils.metrics_pusher import STEP_DURATION
+from src.utils.xdist_stats import collect, publish, summary_section
+
+logger = logging.getLogger("parabank")
+
+DEFAULT_FLAMEGRAPH = "test-results/steps.folded"
+SUMMARY_TOP = 10
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class Span:
+    """One timed step and the steps it contains."""
+
+    __slots__ = ("name", "started", "ended", "failed", "children")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.started = time.perf_counter()
+        self.ended: Optional[float] = None
+        self.failed = False
+        self.children: List["Span"] = []
+
+    @property
+    def duration(self) -> float:
+        return (self.ended if self.ended is not None else time.perf_counter()) - self.started
+
+    def render(self, depth: int = 0) -> List[str]:
+        """The span and its children as indented ``duration  name`` lines."""
+        mark = "  (failed)" if self.failed else ""
+        lines = [f"{self.duration:8.3f}s  {'  ' * depth}{self.name}{mark}"]
+        for child in self.children:
+            lines.extend(child.render(depth + 1))
+        return lines
+
+    def fold(self, folded: Dict[str, float], prefix: str = "") -> None:
+        """Add each stack's self time (seconds) to ``folded``."""
+        stack = f"{prefix};{self.name}" if prefix else self.name
+        own = self.duration - sum(child.duration for child in self.children)
+        folded[stack] = folded.get(stack, 0.0) + max(own, 0.0)
+        for child in self.children:
+            child.fold(folded, stack)
+
+
+class StepRecorder:
+    """Step trees of the running test and step totals of this process."""
+
+    def __init__(self) -> None:
+        self.stack: List[Span] = []
+        self.folded: Dict[str, float] = {}
+        self.totals: Dict[str, List[Any]] = {}  # step -> [calls, seconds, max]
+
+    def begin_test(self, nodeid: str) -> None:
+        # Frame names may not contain the folded format's separator
+        self.stack = [Span(nodeid.replace(";", ","))]
+
+    def end_test(self) -> Optional[Span]:
+        if not self.stack:
+            return None
+        root = self.stack[0]
+        root.ended = time.perf_counter()
+        root.fold(self.folded)
+        self.stack = []
+        return root
+
+    def enter(self, name: str) -> Span:
+        span = Span(name.replace(";", ","))
+        if self.stack and threading.current_thread() is threading.main_thread():
+            self.stack[-1].children.append(span)
+            self.stack.append(span)
+        return span
+
+    def exit(self, span: Span, failed: bool) -> None:
+        span.ended = time.perf_counter()
+        span.failed = failed
+        if self.stack and self.stack[-1] is span:
+            self.stack.pop()
+        duration = span.ended - span.started
+        STEP_DURATION.labels(step=span.name).observe(duration)
+        entry = self.totals.setdefault(span.name, [0, 0.0, 0.0])
+        entry[0] += 1
+        entry[1] += duration
+        entry[2] = max(entry[2], duration)
+
+    def merge(self, data: Dict[str, Any]) -> None:
+        for stack, seconds in data["folded"].items():
+            self.folded[stack] = self.folded.get(stack, 0.0) + seconds
+        for name, (calls, seconds, longest) in data["totals"].items():
+            entry = self.totals.setdefault(name, [0, 0.0, 0.0])
+            entry[0] += calls
+            entry[1] += seconds
+            entry[2] = max(entry[2], longest)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"folded": self.folded, "totals": self.totals}
+
+
+_recorder = StepRecorder()
+
+
+class _Step:
+    """Context manager and decorator behind ``step``."""
+
+    def __init__(self, name: Optional[str]) -> None:
+        self.name = name
+        # One span per active use; a decorated method may be re-entered
+        self._spans: List[Span] = []
+
+    def __enter__(self) -> "_Step":
+        self._spans.append(_recorder.enter(self.name or "step"))
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        _recorder.exit(self._spans.pop(), failed=exc_type is not None)
+
+    def __call__(self, func: F) -> F:
+        name = self.name or func.__qualname__
+
+        @functools.wraps(func)
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            with _Step(name):
+                return func(*args, **kwargs)
+
+        return cast(F, timed)
+
+
+def step(name: Optional[str] = None) -> _Step:
+    """Time a block or, as a decorator, every call of a function as one step."""
+    return _Step(name)
+
+
+def current_steps() -> Optional[Span]:
+    """Root span of the running test, or None outside a test."""
+    return _recorder.stack[0] if _recorder.stack else None
+
+
+def write_flamegraph(folded: Dict[str, float], path: Path) -> int:
+    """Write ``folded`` in collapsed-stack format (milliseconds); returns the stack count."""
+    lines = [
+        f"{stack} {round(seconds * 1000)}"
+        for stack, seconds in sorted(folded.items())
+        if round(seconds * 1000) > 0
+    ]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("\n".join(lines) + "\n" if lines else "", encoding="utf-8")
+    return len(lines)
+
+
+def pytest_addoption(parser: Parser) -> None:
+    """Register the step timing option."""
+    group = parser.getgroup("parabank-steps", "step-level timing")
+    group.addoption(
+        "--step-flamegraph",
+        action="store",
+        default=DEFAULT_FLAMEGRAPH,
+        help="Collapsed-stack file of the session's step timings "
+        f"(default: {DEFAULT_FLAMEGRAPH}; empty to skip)",
+    )
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item: Item, nextitem: Optional[Item]) -> Generator[None, None, None]:
+    """Root each test's step tree at the test, over setup, call and teardown."""
+    _recorder.begin_test(item.nodeid)
+    yield
+    _recorder.end_test()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item: Item, call: CallInfo[None]) -> Generator[Any, None, None]:
+    """Attach the step tree so far to the call report of tests that have steps."""
+    outcome: Any = yield
+    report = outcome.get_result()
+    root = current_steps()
+    if report.when == "call" and root is not None and root.children:
+        report.sections.append(("steps", "\n".join(root.render())))
+
+
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    """Hand the step totals to the controller, or write the session's flame graph."""
+    if publish(session.config, "steps", _recorder.as_dict()):
+        return
+    target = session.config.getoption("--step-flamegraph")
+    if target and _recorder.totals:
+        stacks = write_flamegraph(_recorder.folded, Path(target))
+        logger.info(f"Step flame graph ({stacks} stacks) written to {target}")
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node: Any, error: Any) -> None:
+    """Merge a finished worker's step totals (controller side)."""
+    data = collect(node, "steps")
+    if data:
+        _recorder.merge(data)
+
+
+def pytest_terminal_summary(terminalreporter: TerminalReporter, config: PytestConfig) -> None:
+    """Rank steps by the total time spent in them."""
+    if not _recorder.totals or not summary_section(terminalreporter, config, "steps"):
+        return
+    ranked = sorted(_recorder.totals.items(), key=lambda entry: entry[1][1], reverse=True)
+    for name, (calls, seconds, longest) in ranked[:SUMMARY_TOP]:
+        terminalreporter.write_line(
+            f"  {seconds:8.2f}s  {calls:5d}x  mean {seconds / calls:6.2f}s  "
+            f"max {longest:6.2f}s  {name}"
+        )
+    target = config.getoption("--step-flamegraph")
+    if target:
+        terminalreporter.write_line(f"flame graph: {target}")
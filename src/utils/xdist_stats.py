@@ -0,0 +1,68 @@
+"""Worker-to-controller statistics and the end-of-run performance summaries.
+
+Under xdist every worker counts for itself. A plugin publishes its counters when
+the worker's session finishes, and the controller collects them as each worker
+goes down::
+
+    def pytest_sessionfinish(session, exitstatus):
+        publish(session.config, "har_replay", REPLAY_STATS.as_dict())
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(node, error):
+        data = collect(node, "har_replay")
+        if data:
+            REPLAY_STATS.merge(data)
+
+Without xdist ``publish`` does nothing and the process's own counters are the
+run's. The controller then prints one terminal section per plugin with
+``summary_section``. The sections are only shown with ``--perf-summary`` (or
+``-vv``), so an ordinary run ends with the test results.
+"""
+from typing import Any
+
+from _pytest.config import Config as PytestConfig
+from _pytest.config.argparsing import Parser
+from _pytest.terminal import TerminalReporter
+
+
+def is_worker(config: PytestConfig) -> bool:
+    """Return True in an xdist worker process."""
+    return hasattr(config, "workerinput")
+
+
+def publish(config: PytestConfig, key: str, data: Any) -> bool:
+    """Hand ``data`` to the controller under ``key``; returns False outside a worker."""
+    workeroutput = getattr(config, "workeroutput", None)
+    if workeroutput is None:
+        return False
+    workeroutput[key] = data
+    return True
+
+
+def collect(node: Any, key: str) -> Any:
+    """Return what the finished worker ``node`` published under ``key``, or None."""
+    return getattr(node, "workeroutput", {}).get(key)
+
+
+def show_summaries(config: PytestConfig) -> bool:
+    """Return True if the performance summaries are wanted."""
+    return bool(config.getoption("--perf-summary")) or config.getoption("verbose") >= 2
+
+
+def summary_section(terminalreporter: TerminalReporter, config: PytestConfig, title: str) -> bool:
+    """Open the ``title`` summary section; False on workers or when summaries are off."""
+    if is_worker(config) or not show_summaries(config):
+        return False
+    terminalreporter.section(title)
+    return True
+
+
+def pytest_addoption(parser: Parser) -> None:
+    """Register the summary option."""
+    group = parser.getgroup("parabank-perf-summary", "performance summaries")
+    group.addoption(
+        "--perf-summary",
+        action="store_true",
+        default=False,
+        help="Print the plugins' performance sections at the end of the run (also with -vv)",
+    )
@@ -0,0 +1,253 @@
+"""Pooled HTTP client for the ParaBank REST API and plain-form endpoints.
+
+Used to seed customers, accounts and money movements without driving the UI.
+ParaBank's REST API has no registration endpoint, so new customers are created
+by posting the regular ``register.htm`` form over the same connection pool.
+"""
+import json
+import logging
+from dataclasses import dataclass, field
+from http.cookies import SimpleCookie
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlencode, urlsplit
+
+import urllib3
+from urllib3.util.retry import Retry
+
+from tests.data.models import User
+
+logger = logging.getLogger("parabank")
+
+ACCOUNT_TYPES = {"CHECKING": 0, "SAVINGS": 1, "LOAN": 2}
+SESSION_COOKIE = "JSESSIONID"
+
+
+class ParaBankAPIError(Exception):
+    """Raised when a ParaBank API call fails or returns an unexpected response."""
+
+
+@dataclass
+class SeededCustomer:
+    """A customer created through the API, with the ids tests need."""
+
+    user: User
+    customer_id: int
+    account_ids: List[int] = field(default_factory=list)
+
+
+class ParaBankAPI:
+    """Thin REST client sharing one keep-alive connection pool per worker."""
+
+    def __init__(
+        self, base_url: str, api_url: str, timeout: float = 30.0, maxsize: int = 4
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.api_url = api_url.rstrip("/")
+        self.http = urllib3.PoolManager(
+            num_pools=2,
+            maxsize=maxsize,
+            timeout=urllib3.Timeout(connect=10.0, read=timeout),
+            # Only idempotent requests are retried; a retried transfer would move money twice
+            retries=Retry(total=2, backoff_factor=0.5, status_forcelist=(502, 503, 504)),
+            headers={"Accept": "application/json"},
+        )
+
+    def close(self) -> None:
+        """Release pooled connections."""
+        self.http.clear()
+
+    # --- low level ---
+
+    def _call(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        body: Optional[Any] = None,
+    ) -> Any:
+        url = f"{self.api_url}/{path}"
+        if params:
+            url = f"{url}?{urlencode(params)}"
+        kwargs: Dict[str, Any] = {}
+        if body is not None:
+            kwargs["body"] = json.dumps(body).encode("utf-8")
+            kwargs["headers"] = {"Content-Type": "application/json", "Accept": "application/json"}
+        response = self.http.request(method, url, **kwargs)
+        text = response.data.decode("utf-8", errors="replace")
+        if response.status >= 400:
+            raise ParaBankAPIError(f"{method} {path} failed with {response.status}: {text[:200]}")
+        if "json" in response.headers.get("Content-Type", ""):
+            return json.loads(text) if text else None
+        return text
+
+    # --- customers ---
+
+    def login(self, username: str, password: str) -> Dict[str, Any]:
+        """Return the customer record for valid credentials."""
+        customer: Dict[str, Any] = self._call("GET", f"login/{username}/{password}")
+        return customer
+
+    def get_customer(self, customer_id: int) -> Dict[str, Any]:
+        customer: Dict[str, Any] = self._call("GET", f"customers/{customer_id}")
+        return customer
+
+    def update_customer(self, customer_id: int, user: User) -> None:
+        """Overwrite the customer's profile with ``user``'s data."""
+        self._call(
+            "POST",
+            f"customers/update/{customer_id}",
+            params={
+                "firstName": user.first_name,
+                "lastName": user.last_name,
+                "street": user.address,
+                "city": user.city,
+                "state": user.state,
+                "zipCode": user.zip_code,
+                "phoneNumber": user.phone,
+                "ssn": user.ssn,
+                "username": user.username,
+                "password": user.password,
+            },
+        )
+
+    def register_customer(self, user: User) -> SeededCustomer:
+        """Create ``user`` via the registration form and return its ids."""
+        form = {
+            "customer.firstName": user.first_name,
+            "customer.lastName": user.last_name,
+            "customer.address.street": user.address,
+            "customer.address.city": user.city,
+            "customer.address.state": user.state,
+            "customer.address.zipCode": user.zip_code,
+            "customer.phoneNumber": user.phone,
+            "customer.ssn": user.ssn,
+            "customer.username": user.username,
+            "customer.password": user.password,
+            "repeatedPassword": user.password,
+        }
+        response = self.http.request(
+            "POST",
+            f"{self.base_url}/register.htm",
+            body=urlencode(form),
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+            redirect=False,
+        )
+        page = response.data.decode("utf-8", errors="replace")
+        if "created successfully" not in page:
+            raise ParaBankAPIError(f"Registration of {user.username} failed ({response.status})")
+        customer_id = int(self.login(user.username, user.password)["id"])
+        account_ids = [int(a["id"]) for a in self.get_accounts(customer_id)]
+        logger.info(f"Seeded customer {user.username} (id {customer_id}) via API")
+        return SeededCustomer(user=user, customer_id=customer_id, account_ids=account_ids)
+
+    # --- accounts and money movement ---
+
+    def get_accounts(self, customer_id: int) -> List[Dict[str, Any]]:
+        accounts: List[Dict[str, Any]] = self._call("GET", f"customers/{customer_id}/accounts")
+        return accounts
+
+    def get_account(self, account_id: int) -> Dict[str, Any]:
+        account: Dict[str, Any] = self._call("GET", f"accounts/{account_id}")
+        return account
+
+    def create_account(
+        self, customer_id: int, from_account_id: int, account_type: str = "CHECKING"
+    ) -> Dict[str, Any]:
+        """Open a new account funded from ``from_account_id``."""
+        account: Dict[str, Any] = self._call(
+            "POST",
+            "createAccount",
+            params={
+                "customerId": customer_id,
+                "newAccountType": ACCOUNT_TYPES[account_type.upper()],
+                "fromAccountId": from_account_id,
+            },
+        )
+        return account
+
+    def transfer(self, from_account_id: int, to_account_id: int, amount: float) -> str:
+        return str(
+            self._call(
+                "POST",
+                "transfer",
+                params={
+                    "fromAccountId": from_account_id,
+                    "toAccountId": to_account_id,
+                    "amount": f"{amount:.2f}",
+                },
+            )
+        )
+
+    def bill_pay(self, account_id: int, amount: float, payee: Dict[str, Any]) -> Dict[str, Any]:
+        """Pay ``payee`` (ParaBank payee JSON: name, address, phoneNumber, accountNumber)."""
+        result: Dict[str, Any] = self._call(
+            "POST",
+            "billpay",
+            params={"accountId": account_id, "amount": f"{amount:.2f}"},
+            body=payee,
+        )
+        return result
+
+    def request_loan(
+        self, customer_id: int, amount: float, down_payment: float, from_account_id: int
+    ) -> Dict[str, Any]:
+        result: Dict[str, Any] = self._call(
+            "POST",
+            "requestLoan",
+            params={
+                "customerId": customer_id,
+                "amount": f"{amount:.2f}",
+                "downPayment": f"{down_payment:.2f}",
+                "fromAccountId": from_account_id,
+            },
+        )
+        return result
+
+    def get_transactions(self, account_id: int) -> List[Dict[str, Any]]:
+        transactions: List[Dict[str, Any]] = self._call(
+            "GET", f"accounts/{account_id}/transactions"
+        )
+        return transactions
+
+    # --- browser sessions ---
+
+    def storage_state(self, username: str, password: str) -> Dict[str, Any]:
+        """Log in over HTTP and return a Playwright storage state holding the session.
+
+        Raises:
+            ParaBankAPIError: If the credentials are rejected or the session is unusable
+        """
+        response = self.http.request(
+            "POST",
+            f"{self.base_url}/login.htm",
+            body=urlencode({"username": username, "password": password}),
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+            redirect=False,
+        )
+        cookies = SimpleCookie()
+        for header in response.headers.getlist("Set-Cookie"):
+            cookies.load(header)
+        session = cookies.get(SESSION_COOKIE)
+        if response.status != 302 or session is None:
+            raise ParaBankAPIError(f"Login for {username} failed ({response.status})")
+
+        overview = self.http.request(
+            "GET",
+            f"{self.base_url}/overview.htm",
+            headers={"Cookie": f"{SESSION_COOKIE}={session.value}"},
+        )
+        if "Account Services" not in overview.data.decode("utf-8", errors="replace"):
+            raise ParaBankAPIError(f"Session for {username} did not reach the accounts overview")
+
+        parts = urlsplit(self.base_url)
+        cookie = {
+            "name": SESSION_COOKIE,
+            "value": session.value,
+            "domain": parts.hostname or "",
+            "path": session["path"] or "/",
+            "expires": -1,
+            "httpOnly": True,
+            "secure": parts.scheme == "https",
+            "sameSite": "Lax",
+        }
+        return {"cookies": [cookie], "origins": []}
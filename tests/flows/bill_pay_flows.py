@@ -2,6 +2,7 @@
 
 from playwright.sync_api import Page
 
+from src.utils.steps import step
 from tests.pages.bill_pay_page import BillPayPage
 
 
@@ -12,6 +13,7 @@ class BillPayFlows:
         self.page = page
         self.bill_pay_page = BillPayPage(page)
 
+    @step()
     def pay_bill(
         self,
         payee_name: str,
@@ -3,9 +3,18 @@ import logging
 
 from playwright.sync_api import Page, expect
 
+from src.utils.navigation import ACCOUNT_MENU, AUTH, SELECTED_ACCOUNT, route
+from src.utils.steps import step
+
 logger = logging.getLogger("parabank")
 
 
+@route(
+    "overview.htm",
+    requires=[AUTH],
+    link="#leftPanel a[href*='overview.htm']",
+    link_on=ACCOUNT_MENU,
+)
 class AccountOverviewPage:
     """Account Overview Page Object."""
 
@@ -18,6 +27,7 @@ class AccountOverviewPage:
             "#accountTable tbody tr:first-child td:nth-child(2)"
         )
 
+    @step()
     def wait_for_data(self) -> None:
         """Wait for the account data to be visible."""
         expect(self.account_table).to_be_visible(timeout=10000)
@@ -34,7 +44,23 @@ class AccountOverviewPage:
         self.wait_for_data()
         return str(self.first_account_balance.inner_text())
 
+    @step()
     def click_first_account(self) -> None:
         """Click on the first account number link."""
         self.wait_for_data()
         self.first_account_link.click()
+
+
+@route(
+    "activity.htm?id={account_id}",
+    requires=[AUTH, SELECTED_ACCOUNT],
+    link="#accountTable tbody tr:first-child td a",
+    link_on=AccountOverviewPage,
+)
+class AccountDetailsPage:
+    """Account Details (activity) Page Object; the overview link selects the first account."""
+
+    def __init__(self, page: Page) -> None:
+        self.page = page
+        self.title = page.locator("#rightPanel h1.title").first
+        self.account_id = page.locator("#accountId")
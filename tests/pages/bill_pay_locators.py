@@ -6,16 +6,27 @@ from playwright.sync_api import Locator, Page
 class BillPayLocators:
     """Locators for the Bill Pay page."""
 
+    # Payee form fields (CSS, shared with the single-round-trip form fill)
+    NAME = "input[name='payee.name']"
+    ADDRESS = "input[name='payee.address.street']"
+    CITY = "input[name='payee.address.city']"
+    STATE = "input[name='payee.address.state']"
+    ZIP_CODE = "input[name='payee.address.zipCode']"
+    PHONE_NO = "input[name='payee.phoneNumber']"
+    ACCOUNT_NO = "input[name='payee.accountNumber']"
+    VERIFY_ACCOUNT_NO = "input[name='verifyAccount']"
+    AMOUNT = "input[name='amount']"
+
     def __init__(self, page: Page) -> None:
-        self.name_text: Locator = page.locator("input[name='payee.name']")
-        self.address_text: Locator = page.locator("input[name='payee.address.street']")
-        self.city_text: Locator = page.locator("input[name='payee.address.city']")
-        self.state_text: Locator = page.locator("input[name='payee.address.state']")
-        self.zip_code_text: Locator = page.locator("input[name='payee.address.zipCode']")
-        self.phone_no_text: Locator = page.locator("input[name='payee.phoneNumber']")
-        self.account_no: Locator = page.locator("input[name='payee.accountNumber']")
-        self.verify_acc_no_text: Locator = page.locator("input[name='verifyAccount']")
-        self.amount_text: Locator = page.locator("input[name='amount']")
+        self.name_text: Locator = page.locator(self.NAME)
+        self.address_text: Locator = page.locator(self.ADDRESS)
+        self.city_text: Locator = page.locator(self.CITY)
+        self.state_text: Locator = page.locator(self.STATE)
+        self.zip_code_text: Locator = page.locator(self.ZIP_CODE)
+        self.phone_no_text: Locator = page.locator(self.PHONE_NO)
+        self.account_no: Locator = page.locator(self.ACCOUNT_NO)
+        self.verify_acc_no_text: Locator = page.locator(self.VERIFY_ACCOUNT_NO)
+        self.amount_text: Locator = page.locator(self.AMOUNT)
         self.send_payment_button: Locator = page.locator("input.button")
 
         # Validation Errors
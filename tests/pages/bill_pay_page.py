@@ -2,9 +2,19 @@
 
 from playwright.sync_api import Page
 
+from src.utils.form_fill import fill_form
+from src.utils.navigation import ACCOUNT_MENU, AUTH, route
+from src.utils.steps import step
+
 from .bill_pay_locators import BillPayLocators
 
 
+@route(
+    "billpay.htm",
+    requires=[AUTH],
+    link="#leftPanel a[href*='billpay.htm']",
+    link_on=ACCOUNT_MENU,
+)
 class BillPayPage:
     """Low-level interactions with the Bill Pay page (no business rules)."""
 
@@ -42,6 +52,7 @@ class BillPayPage:
     def click_send_payment(self) -> None:
         self.locators.send_payment_button.click()
 
+    @step()
     def submit_form(
         self,
         name: str,
@@ -53,14 +64,22 @@ class BillPayPage:
         account_no: str,
         verify_acc_no: str,
         amount: str,
+        strict: bool = False,
     ) -> None:
-        self.fill_name(name)
-        self.fill_address(address)
-        self.fill_city(city)
-        self.fill_state(state)
-        self.fill_zip_code(zip_code)
-        self.fill_phone_no(phone_no)
-        self.fill_account_no(account_no)
-        self.fill_verify_account_no(verify_acc_no)
-        self.fill_amount(amount)
+        """Fill the payee form in one round trip (``strict``: field by field) and send."""
+        fill_form(
+            self.page,
+            {
+                BillPayLocators.NAME: name,
+                BillPayLocators.ADDRESS: address,
+                BillPayLocators.CITY: city,
+                BillPayLocators.STATE: state,
+                BillPayLocators.ZIP_CODE: zip_code,
+                BillPayLocators.PHONE_NO: phone_no,
+                BillPayLocators.ACCOUNT_NO: account_no,
+                BillPayLocators.VERIFY_ACCOUNT_NO: verify_acc_no,
+                BillPayLocators.AMOUNT: amount,
+            },
+            strict=strict,
+        )
         self.click_send_payment()
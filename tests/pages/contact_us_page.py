@@ -3,9 +3,13 @@ import logging
 
 from playwright.sync_api import Page, expect
 
+from src.utils.navigation import route
+from src.utils.steps import step
+
 logger = logging.getLogger("parabank")
 
 
+@route("contact.htm", link="li.contact a")
 class ContactUsPage:
     """Contact Us Page Object."""
 
@@ -19,6 +23,7 @@ class ContactUsPage:
         self.success_title = page.locator("#rightPanel h1.title")
         self.success_message = page.locator("#rightPanel p").first
 
+    @step()
     def submit_contact_form(self, name: str, email: str, phone: str, message: str) -> None:
         """Fill and submit the contact form."""
         logger.info(f"Submitting contact form for {name}")
@@ -28,6 +33,7 @@ class ContactUsPage:
         self.message_textarea.fill(message)
         self.submit_button.click()
 
+    @step()
     def verify_submission_success(self) -> None:
         """Verify that the contact form was submitted successfully."""
         expect(self.success_title).to_have_text("Customer Care")
@@ -3,9 +3,18 @@ import logging
 
 from playwright.sync_api import Page, expect
 
+from src.utils.navigation import ACCOUNT_MENU, AUTH, route
+from src.utils.steps import step
+
 logger = logging.getLogger("parabank")
 
 
+@route(
+    "findtrans.htm",
+    requires=[AUTH],
+    link="#leftPanel a[href*='findtrans.htm']",
+    link_on=ACCOUNT_MENU,
+)
 class FindTransactionsPage:
     """Find Transactions Page Object."""
 
@@ -27,12 +36,14 @@ class FindTransactionsPage:
         self.id_error = page.locator("#transactionIdError")
         self.date_error = page.locator("#transactionDateError")
 
+    @step()
     def find_by_id(self, transaction_id: str) -> None:
         """Find transaction by ID."""
         logger.info(f"Finding transaction by ID: {transaction_id}")
         self.transaction_id_input.fill(transaction_id)
         self.find_by_id_button.click()
 
+    @step()
     def find_by_date(self, date: str) -> None:
         """Find transactions by date (format: MM-DD-YYYY)."""
         logger.info(f"Finding transactions by date: {date}")
@@ -42,6 +53,7 @@ class FindTransactionsPage:
         if not self.transaction_table.is_visible():
             self.find_by_date_button.click()
 
+    @step()
     def find_by_amount(self, amount: str) -> None:
         """Find transactions by amount."""
         logger.info(f"Finding transactions by amount: {amount}")
@@ -51,6 +63,7 @@ class FindTransactionsPage:
         if not self.transaction_table.is_visible():
             self.find_by_amount_button.click()
 
+    @step()
     def wait_for_results(self) -> None:
         """Wait for the transaction table or a no results message to be visible."""
         # ParaBank might show a table or a message like "No transactions found"
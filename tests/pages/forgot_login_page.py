@@ -2,7 +2,12 @@
 
 from playwright.sync_api import Locator, Page
 
+from src.utils.form_fill import fill_form
+from src.utils.navigation import route
+from src.utils.steps import step
 
+
+@route("lookup.htm", link="#loginPanel a[href*='lookup.htm']", link_on="HomePage")
 class ForgotLoginPage:
     """Page object for the Customer Lookup (Forgot Login) page."""
 
@@ -49,6 +54,7 @@ class ForgotLoginPage:
             "#rightPanel >> p:text('Please fill out the following information')"
         )
 
+    @step()
     def navigate(self, base_url: str) -> None:
         """Navigate to the Forgot Login page.
 
@@ -66,8 +72,9 @@ class ForgotLoginPage:
         state: str,
         zip_code: str,
         ssn: str,
+        strict: bool = False,
     ) -> None:
-        """Fill out the customer lookup form.
+        """Fill out the customer lookup form in one round trip.
 
         Args:
             first_name: Customer first name
@@ -77,19 +84,27 @@ class ForgotLoginPage:
             state: State
             zip_code: Zip code
             ssn: Social security number
+            strict: Fill field by field with real keystrokes instead
         """
-        self.first_name_input.fill(first_name)
-        self.last_name_input.fill(last_name)
-        self.address_input.fill(address)
-        self.city_input.fill(city)
-        self.state_input.fill(state)
-        self.zip_code_input.fill(zip_code)
-        self.ssn_input.fill(ssn)
+        fill_form(
+            self.page,
+            {
+                "#firstName": first_name,
+                "#lastName": last_name,
+                "#address\\.street": address,
+                "#address\\.city": city,
+                "#address\\.state": state,
+                "#address\\.zipCode": zip_code,
+                "#ssn": ssn,
+            },
+            strict=strict,
+        )
 
     def submit_lookup(self) -> None:
         """Submit the customer lookup form."""
         self.find_login_button.click()
 
+    @step()
     def lookup_customer(
         self,
         first_name: str,
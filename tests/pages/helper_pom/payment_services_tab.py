@@ -1,13 +1,36 @@
+from typing import Optional
+
 from playwright.sync_api import Page
 
+from src.utils.navigation import AUTH, ROUTES, Navigator
 from src.utils.stability import safe_click, skip_if_internal_error
+from src.utils.steps import step
+from tests.pages.account_overview_page import AccountOverviewPage
+from tests.pages.bill_pay_page import BillPayPage
+from tests.pages.find_transactions_page import FindTransactionsPage
+from tests.pages.open_account_page import OpenAccountPage
+from tests.pages.request_loan_page import RequestLoanPage
+from tests.pages.transfer_funds_page import TransferFundsPage
+from tests.pages.update_contact_info_page import UpdateContactInfoPage
+
+# Left-panel link name to the page object it opens
+DESTINATIONS = {
+    "open_new_account": OpenAccountPage,
+    "accounts_overview": AccountOverviewPage,
+    "transfer_funds": TransferFundsPage,
+    "bill_pay": BillPayPage,
+    "find_transactions": FindTransactionsPage,
+    "update_contact": UpdateContactInfoPage,
+    "request_loan": RequestLoanPage,
+}
 
 
 class PaymentServicesTab:
     """Payment Services Tab page object with robust navigation."""
 
-    def __init__(self, page: Page) -> None:
+    def __init__(self, page: Page, base_url: Optional[str] = None) -> None:
         self.page = page
+        self.navigator = Navigator(page, base_url)
         self.left_panel = page.locator("#leftPanel")
 
         self.open_new_account_link = self.left_panel.get_by_role("link", name="Open New Account")
@@ -21,8 +44,14 @@ class PaymentServicesTab:
         self.request_loan_link = self.left_panel.get_by_role("link", name="Request Loan")
         self.log_out_link = self.left_panel.get_by_role("link", name="Log Out")
 
-    def navigate_to(self, link_name: str) -> None:
-        """Centralized robust navigation."""
+    @step()
+    def navigate_to(self, link_name: str, click_through: Optional[bool] = None) -> None:
+        """Centralized robust navigation.
+
+        Goes straight to the page's URL unless ``click_through`` (or
+        ``NAV_CLICK_THROUGH``) asks for the left-panel link to be clicked, as
+        tests of the links themselves do. ``logout`` is always a click.
+        """
         links = {
             "open_new_account": self.open_new_account_link,
             "accounts_overview": self.accounts_overview_link,
@@ -34,10 +63,18 @@ class PaymentServicesTab:
             "logout": self.log_out_link,
         }
 
-        if link_name in links:
+        if link_name not in links:
+            raise ValueError(f"Unknown navigation link: {link_name}")
+        if click_through is None:
+            click_through = self.navigator.click_through
+        if link_name in DESTINATIONS and not click_through:
+            self.navigator.goto(DESTINATIONS[link_name])
+        else:
+            current = self.navigator.current()
+            if current is None or AUTH not in ROUTES[current].requires:
+                # Only logged-in account pages carry the left-panel menu
+                self.navigator.goto(AccountOverviewPage)
             safe_click(links[link_name])
-            # Automatically check for internal errors after every side-menu navigation
             self.page.wait_for_load_state("load")
-            skip_if_internal_error(self.page)
-        else:
-            raise ValueError(f"Unknown navigation link: {link_name}")
+        # Automatically check for internal errors after every side-menu navigation
+        skip_if_internal_error(self.page)
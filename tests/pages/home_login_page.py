@@ -6,11 +6,14 @@ from typing import Any, Optional
 
 from playwright.sync_api import Page, expect
 
+from src.utils.navigation import route
 from src.utils.stability import handle_internal_error, retry_with_reload
+from src.utils.steps import step
 
 logger = logging.getLogger("parabank")
 
 
+@route("index.htm", link="ul.button li.home a")
 class HomePage:
     """Page objects and methods Home Page only"""
 
@@ -23,6 +26,7 @@ class HomePage:
         self.contact_link = page.locator("li.contact a")
         self.error_message = page.locator("p.error")
 
+    @step()
     def load(self, base_url: Optional[str] = None) -> None:
         """Navigate to the home page.
 
@@ -64,6 +68,7 @@ class HomePage:
             return True
         return False
 
+    @step()
     def user_log_in(
         self,
         username: Optional[str] = None,
@@ -4,9 +4,17 @@ from typing import Optional
 
 from playwright.sync_api import Page
 
+from src.utils.navigation import ACCOUNT_MENU, AUTH, route
 from src.utils.stability import wait_for_options
+from src.utils.steps import step
 
 
+@route(
+    "openaccount.htm",
+    requires=[AUTH],
+    link="#leftPanel a[href*='openaccount.htm']",
+    link_on=ACCOUNT_MENU,
+)
 class OpenAccountPage:
     """Page object model for the Open New Account page."""
 
@@ -18,6 +26,7 @@ class OpenAccountPage:
         self.account_opened_heading = page.get_by_role("heading", name="Account Opened!")
         self.account_opened_message = page.get_by_text("Congratulations, your account is now open.")
 
+    @step()
     def select_account_type(self, account_type: str) -> None:
         """Select account type, handling both 'SAVING' and 'SAVINGS' labels."""
         wait_for_options(self.account_type_select, min_options=2)
@@ -32,11 +41,13 @@ class OpenAccountPage:
         else:
             self.account_type_select.select_option(label=account_type.upper())
 
+    @step()
     def select_from_account_by_index(self, index: int = 0) -> None:
         """Select a source account by index in the dropdown."""
         wait_for_options(self.from_account_select, min_options=1)
         self.from_account_select.select_option(index=index)
 
+    @step()
     def open_new_account(
         self,
         account_type: str = "CHECKING",
@@ -5,7 +5,10 @@ import os
 
 from playwright.sync_api import Page, expect
 
+from src.utils.form_fill import fill_form
+from src.utils.navigation import route
 from src.utils.stability import ParaBankInternalError, handle_internal_error, safe_click
+from src.utils.steps import step
 
 logger = logging.getLogger("parabank")
 
@@ -19,45 +22,71 @@ def _soft_internal_errors_enabled() -> bool:
     )
 
 
+@route("register.htm", link="#loginPanel a[href*='register.htm']", link_on="HomePage")
 class RegisterPage:
     """Register Page Object."""
 
+    FIRST_NAME = 'input[id="customer\\.firstName"]'
+    LAST_NAME = 'input[id="customer\\.lastName"]'
+    ADDRESS = 'input[id="customer\\.address\\.street"]'
+    CITY = 'input[id="customer\\.address\\.city"]'
+    STATE = 'input[id="customer\\.address\\.state"]'
+    ZIP_CODE = 'input[id="customer\\.address\\.zipCode"]'
+    PHONE = 'input[id="customer\\.phoneNumber"]'
+    SSN = 'input[id="customer\\.ssn"]'
+    USERNAME = 'input[id="customer\\.username"]'
+    PASSWORD = 'input[id="customer\\.password"]'
+    CONFIRM_PASSWORD = 'input[id="repeatedPassword"]'
+
     def __init__(self, page: Page) -> None:
         self.page = page
-        self.first_name_input = page.locator('input[id="customer\\.firstName"]')
-        self.last_name_input = page.locator('input[id="customer\\.lastName"]')
-        self.address_input = page.locator('input[id="customer\\.address\\.street"]')
-        self.city_input = page.locator('input[id="customer\\.address\\.city"]')
-        self.state_input = page.locator('input[id="customer\\.address\\.state"]')
-        self.zip_code_input = page.locator('input[id="customer\\.address\\.zipCode"]')
-        self.phone_input = page.locator('input[id="customer\\.phoneNumber"]')
-        self.ssn_input = page.locator('input[id="customer\\.ssn"]')
-        self.username_input = page.locator('input[id="customer\\.username"]')
-        self.password_input = page.locator('input[id="customer\\.password"]')
-        self.confirm_password_input = page.locator('input[id="repeatedPassword"]')
+        self.first_name_input = page.locator(self.FIRST_NAME)
+        self.last_name_input = page.locator(self.LAST_NAME)
+        self.address_input = page.locator(self.ADDRESS)
+        self.city_input = page.locator(self.CITY)
+        self.state_input = page.locator(self.STATE)
+        self.zip_code_input = page.locator(self.ZIP_CODE)
+        self.phone_input = page.locator(self.PHONE)
+        self.ssn_input = page.locator(self.SSN)
+        self.username_input = page.locator(self.USERNAME)
+        self.password_input = page.locator(self.PASSWORD)
+        self.confirm_password_input = page.locator(self.CONFIRM_PASSWORD)
         self.register_button = page.locator('input[value="Register"]')
         self.success_message = page.locator("#rightPanel .title")
         self.error_message = page.locator(".error")
 
-    def register(self, user_data: dict) -> None:
+    @step()
+    def fill_form(self, user_data: dict, strict: bool = False) -> None:
+        """Fill the registration form in one round trip (``strict``: field by field)."""
+        fill_form(
+            self.page,
+            {
+                self.FIRST_NAME: user_data.get("first_name", "Test"),
+                self.LAST_NAME: user_data.get("last_name", "User"),
+                self.ADDRESS: user_data.get("address", "123 Street"),
+                self.CITY: user_data.get("city", "City"),
+                self.STATE: user_data.get("state", "State"),
+                self.ZIP_CODE: user_data.get("zip_code", "12345"),
+                self.PHONE: user_data.get("phone", "1234567890"),
+                self.SSN: user_data.get("ssn", "123-456-789"),
+                self.USERNAME: str(user_data.get("username")),
+                self.PASSWORD: str(user_data.get("password")),
+                self.CONFIRM_PASSWORD: str(user_data.get("password")),
+            },
+            strict=strict,
+        )
+
+    @step()
+    def register(self, user_data: dict, strict: bool = False) -> None:
         """Fill the registration form and submit."""
         logger.info(f"Registering user: {user_data.get('username')}")
-        self.first_name_input.fill(user_data.get("first_name", "Test"))
-        self.last_name_input.fill(user_data.get("last_name", "User"))
-        self.address_input.fill(user_data.get("address", "123 Street"))
-        self.city_input.fill(user_data.get("city", "City"))
-        self.state_input.fill(user_data.get("state", "State"))
-        self.zip_code_input.fill(user_data.get("zip_code", "12345"))
-        self.phone_input.fill(user_data.get("phone", "1234567890"))
-        self.ssn_input.fill(user_data.get("ssn", "123-456-789"))
-        self.username_input.fill(str(user_data.get("username")))
-        self.password_input.fill(str(user_data.get("password")))
-        self.confirm_password_input.fill(str(user_data.get("password")))
+        self.fill_form(user_data, strict=strict)
         self.register_button.wait_for(state="visible", timeout=10000)
         safe_click(self.register_button)
         # ParaBank registration can be very slow, wait for network
         self.page.wait_for_load_state("networkidle", timeout=15000)
 
+    @step()
     def verify_registration_success(  # pylint: disable=too-complex
         self, username: str, password: str = "password123"
     ) -> None:
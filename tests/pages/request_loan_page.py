@@ -3,11 +3,19 @@ import logging
 
 from playwright.sync_api import Page, expect
 
+from src.utils.navigation import ACCOUNT_MENU, AUTH, route
 from src.utils.stability import wait_for_options
+from src.utils.steps import step
 
 logger = logging.getLogger("parabank")
 
 
+@route(
+    "requestloan.htm",
+    requires=[AUTH],
+    link="#leftPanel a[href*='requestloan.htm']",
+    link_on=ACCOUNT_MENU,
+)
 class RequestLoanPage:
     """Request Loan Page Object."""
 
@@ -20,6 +28,7 @@ class RequestLoanPage:
         self.status_text = page.locator("#loanStatus")
         self.result_container = page.locator("#requestLoanResult")
 
+    @step()
     def apply_for_loan(
         self, amount: str, down_payment: str, from_account: str | None = None
     ) -> None:
@@ -29,7 +38,7 @@ class RequestLoanPage:
         self.down_payment_input.fill(down_payment)
 
         if from_account:
-            wait_for_options(self.from_account_dropdown, min_options=1)
+            wait_for_options(self.from_account_dropdown, labels=[from_account])
             self.from_account_dropdown.select_option(label=from_account)
 
         self.apply_button.click()
@@ -4,7 +4,17 @@ import re
 
 from playwright.sync_api import Page
 
+from src.utils.navigation import ACCOUNT_MENU, AUTH, route
+from src.utils.stability import wait_for_options
+from src.utils.steps import step
 
+
+@route(
+    "transfer.htm",
+    requires=[AUTH],
+    link="#leftPanel a[href*='transfer.htm']",
+    link_on=ACCOUNT_MENU,
+)
 class TransferFundsPage:
     def __init__(self, page: Page) -> None:
         self.page = page
@@ -14,14 +24,16 @@ class TransferFundsPage:
         self.transfer_button = page.locator("input[value='Transfer']")
         self.success_heading = page.locator("#showResult h1.title")
 
+    @step()
     def submit_transfer(self, amount: str, from_account: str, to_account: str) -> None:
         self.amount_input.fill(amount)
-        self.from_account_select.locator("option").first.wait_for(state="attached")
+        wait_for_options(self.from_account_select, labels=[from_account])
         self.from_account_select.select_option(label=from_account)
-        self.to_account_select.locator("option").first.wait_for(state="attached")
+        wait_for_options(self.to_account_select, labels=[to_account])
         self.to_account_select.select_option(label=to_account)
         self.transfer_button.click()
 
+    @step()
     def verify_success(self) -> None:
         """Wait for the transfer process to complete (Success or Error)."""
         # Wait for any visible title that isn't the initial "Transfer Funds"
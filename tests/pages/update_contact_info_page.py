@@ -3,9 +3,18 @@ import logging
 
 from playwright.sync_api import Page, expect
 
+from src.utils.navigation import ACCOUNT_MENU, AUTH, route
+from src.utils.steps import step
+
 logger = logging.getLogger("parabank")
 
 
+@route(
+    "updateprofile.htm",
+    requires=[AUTH],
+    link="#leftPanel a[href*='updateprofile.htm']",
+    link_on=ACCOUNT_MENU,
+)
 class UpdateContactInfoPage:
     """Update Contact Info Page Object."""
 
@@ -20,12 +29,14 @@ class UpdateContactInfoPage:
         self.phone_input = page.locator("[id='customer.phoneNumber']")
         self.update_button = page.locator("input[value='Update Profile']")
 
+    @step()
     def wait_for_data(self) -> None:
         """Wait for the form to be populated with data."""
         # Wait for first name to have a value (it should be pre-filled)
         expect(self.first_name_input).not_to_have_value("", timeout=10000)
         logger.info("Form data loaded.")
 
+    @step()
     def update_phone_number(self, new_phone: str) -> None:
         """Update just the phone number."""
         self.wait_for_data()
@@ -33,6 +44,7 @@ class UpdateContactInfoPage:
         self.phone_input.fill(new_phone)
         self.update_button.click()
 
+    @step()
     def update_zip_code(self, new_zip: str) -> None:
         """Update just the zip code."""
         self.wait_for_data()
@@ -1,14 +1,17 @@
 """Tests for Account Overview."""
 from playwright.sync_api import Page, expect
 
-from tests.pages.account_overview_page import AccountOverviewPage
+from src.utils.navigation import Navigator
+from tests.pages.account_overview_page import AccountDetailsPage, AccountOverviewPage
 
 
 def test_account_overview_details(
     user_login: None,
+    navigator: Navigator,
     account_overview_page: AccountOverviewPage,
 ) -> None:
     """Test that account overview displays account details correctly."""
+    navigator.goto(AccountOverviewPage)
     account_overview_page.wait_for_data()
 
     expect(account_overview_page.title).to_have_text("Accounts Overview")
@@ -22,10 +25,12 @@ def test_account_overview_details(
 
 def test_navigate_to_account_details(
     user_login: None,
+    navigator: Navigator,
     account_overview_page: AccountOverviewPage,
     page: Page,
 ) -> None:
     """Test navigation from overview to account details."""
+    navigator.goto(AccountOverviewPage)
     account_overview_page.wait_for_data()
     account_num = account_overview_page.get_first_account_number()
 
@@ -38,12 +43,12 @@ def test_navigate_to_account_details(
 
 def test_account_activity_filtering(
     user_login: None,
-    account_overview_page: AccountOverviewPage,
+    navigator: Navigator,
     page: Page,
 ) -> None:
     """Test filtering account activity on the Account Details page."""
-    account_overview_page.wait_for_data()
-    account_overview_page.click_first_account()
+    # No account id to deep-link with: the route opens the overview and selects the first one
+    navigator.goto(AccountDetailsPage)
 
     # Filter by month 'All' and type 'All'
     page.select_option("#month", "All")
@@ -62,9 +67,11 @@ def test_account_activity_filtering(
 
 def test_total_balance_presence(
     user_login: None,
+    navigator: Navigator,
     account_overview_page: AccountOverviewPage,
 ) -> None:
     """Test that the Total balance row is present in the overview."""
+    navigator.goto(AccountOverviewPage)
     account_overview_page.wait_for_data()
     total_label = account_overview_page.page.locator("td:has-text('Total')")
     expect(total_label).to_be_visible()
@@ -28,7 +28,7 @@ def _open_bill_pay_with_retry(
     """Open bill pay and recover once via forced same-page relogin."""
     base = base_url.rstrip("/")
     for attempt in range(attempts):
-        payment_services_tab.bill_pay_link.click()
+        payment_services_tab.navigate_to("bill_pay")
         try:
             handle_internal_error(page, requires_login=True)
             return
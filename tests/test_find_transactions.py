@@ -13,7 +13,7 @@ def test_find_transactions_by_amount(
     page: Page,
 ) -> None:
     """Test searching for transactions by amount."""
-    safe_click(payment_services_tab.find_transactions_link)
+    payment_services_tab.navigate_to("find_transactions")
     handle_internal_error(page, requires_login=True)
 
     # Search for a common amount or just any amount to see the table
@@ -33,7 +33,7 @@ def test_find_transactions_navigation(
     page: Page,
 ) -> None:
     """Test navigation to the Find Transactions page."""
-    safe_click(payment_services_tab.find_transactions_link)
+    payment_services_tab.navigate_to("find_transactions", click_through=True)
     handle_internal_error(page, requires_login=True)
 
     expect(page.locator("#rightPanel h1.title").first).to_have_text("Find Transactions")
@@ -46,7 +46,7 @@ def test_find_transactions_by_date(
     page: Page,
 ) -> None:
     """Test searching for transactions by date."""
-    safe_click(payment_services_tab.find_transactions_link)
+    payment_services_tab.navigate_to("find_transactions")
     handle_internal_error(page, requires_login=True)
 
     find_transactions_page.page.wait_for_load_state("networkidle")
@@ -69,7 +69,7 @@ def test_find_transactions_by_id_invalid(
     page: Page,
 ) -> None:
     """Test searching for transactions by an invalid ID."""
-    safe_click(payment_services_tab.find_transactions_link)
+    payment_services_tab.navigate_to("find_transactions")
     handle_internal_error(page, requires_login=True)
 
     find_transactions_page.page.wait_for_load_state("networkidle")
@@ -88,7 +88,7 @@ def test_find_transactions_empty_fields(
     page: Page,
 ) -> None:
     """Test search functionality with empty fields."""
-    safe_click(payment_services_tab.find_transactions_link)
+    payment_services_tab.navigate_to("find_transactions")
     handle_internal_error(page, requires_login=True)
 
     # Click find without filling anything
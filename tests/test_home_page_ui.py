@@ -1,11 +1,17 @@
 """Tests for Home Page UI Elements - No Login Required."""
 import re
+from typing import Callable, ContextManager
 
 import pytest
 from playwright.sync_api import Page, expect
 
+from src.utils.dom_assertions import DomAssertionBatch, DomExpectation
+from src.utils.http_tier import StaticPage, assert_text, assert_url
 from tests.pages.home_login_page import HomePage
 
+FORGOT_LOGIN_LINK = "#loginPanel > p:nth-child(2) > a:nth-child(1)"
+REGISTER_LINK = "#loginPanel a[href*='register']"
+
 
 @pytest.fixture
 def loaded_home_page(page: Page, base_url: str) -> HomePage:
@@ -28,128 +34,94 @@ def loaded_home_page(page: Page, base_url: str) -> HomePage:
     return home_page
 
 
-class TestHomePageUIElements:
-    """Test suite for home page UI elements visibility and functionality."""
-
-    def test_home_page_title(self, loaded_home_page: HomePage, page: Page) -> None:
-        """Verify the home page title is correct."""
-        expect(page).to_have_title("ParaBank | Welcome | Online Banking")
-
-    def test_login_panel_visible(self, loaded_home_page: HomePage, page: Page) -> None:
-        """Verify the login panel is visible on home page."""
-        login_panel = page.locator("#loginPanel")
-        expect(login_panel).to_be_visible()
-
-    def test_username_field_visible_and_enabled(self, loaded_home_page: HomePage) -> None:
-        """Verify username input field is visible and enabled."""
-        expect(loaded_home_page.user_name_text).to_be_visible()
-        expect(loaded_home_page.user_name_text).to_be_enabled()
-        expect(loaded_home_page.user_name_text).to_be_editable()
-
-    def test_password_field_visible_and_enabled(self, loaded_home_page: HomePage) -> None:
-        """Verify password input field is visible and enabled."""
-        expect(loaded_home_page.password_text).to_be_visible()
-        expect(loaded_home_page.password_text).to_be_enabled()
-        expect(loaded_home_page.password_text).to_be_editable()
-        expect(loaded_home_page.password_text).to_have_attribute("type", "password")
-
-    def test_login_button_visible_and_enabled(self, loaded_home_page: HomePage) -> None:
-        """Verify login button is visible and clickable."""
-        expect(loaded_home_page.log_in_button).to_be_visible()
-        expect(loaded_home_page.log_in_button).to_be_enabled()
-        expect(loaded_home_page.log_in_button).to_have_attribute("type", "submit")
-
-    def test_forgot_login_link_visible_and_clickable(self, loaded_home_page: HomePage) -> None:
-        """Verify 'Forgot login info?' link is visible and clickable."""
-        expect(loaded_home_page.forget_login_button).to_be_visible()
-        expect(loaded_home_page.forget_login_button).to_have_text("Forgot login info?")
-
-    def test_register_link_visible_and_clickable(
-        self, loaded_home_page: HomePage, page: Page
-    ) -> None:
-        """Verify 'Register' link is visible and clickable."""
-        register_link = page.locator("#loginPanel a[href*='register']")
-        expect(register_link).to_be_visible()
-        expect(register_link).to_have_text("Register")
-
-    def test_parabank_logo_visible(self, loaded_home_page: HomePage, page: Page) -> None:
-        """Verify ParaBank logo is visible."""
-        logo = page.locator(".logo")
-        expect(logo).to_be_visible()
-
-    def test_admin_logo_visible(self, loaded_home_page: HomePage, page: Page) -> None:
-        """Verify admin logo/link is visible."""
-        # Admin logo is an image with class 'admin'
-        admin_logo = page.locator("img.admin")
-        expect(admin_logo).to_be_visible()
-
-    def test_home_link_in_navigation(self, loaded_home_page: HomePage, page: Page) -> None:
-        """Verify 'Home' link is visible in navigation."""
-        # Navigation links use lowercase text
-        home_link = page.locator("ul.button li.home a")
-        expect(home_link).to_be_visible()
-
-    def test_about_us_link_in_navigation(self, loaded_home_page: HomePage, page: Page) -> None:
-        """Verify 'About Us' link is visible in navigation."""
-        # Use first matching link
-        about_link = page.locator("#headerPanel a[href*='about']").first
-        expect(about_link).to_be_visible()
-        expect(about_link).to_contain_text("About")
-
-    def test_contact_link_in_navigation(self, loaded_home_page: HomePage) -> None:
-        """Verify 'Contact' link is visible in navigation."""
-        expect(loaded_home_page.contact_link).to_be_visible()
-        # Navigation links use lowercase text
-        expect(loaded_home_page.contact_link).to_contain_text("contact")
-
-    def test_customer_login_heading(self, loaded_home_page: HomePage, page: Page) -> None:
-        """Verify 'Customer Login' heading is visible."""
-        # Login heading is an h2 element inside leftPanel
-        login_heading = page.locator("#leftPanel h2").filter(has_text="Customer Login")
-        expect(login_heading).to_be_visible()
-
-    def test_username_label(self, loaded_home_page: HomePage, page: Page) -> None:
-        """Verify username label is visible."""
-        # Check for username text in the login panel
-        username_label = page.locator("#loginPanel").get_by_text("Username")
-        expect(username_label).to_be_visible()
-
-    def test_password_label(self, loaded_home_page: HomePage, page: Page) -> None:
-        """Verify password label is visible."""
-        # Check for password text in the login panel
-        password_label = page.locator("#loginPanel").get_by_text("Password")
-        expect(password_label).to_be_visible()
-
-    def test_right_panel_visible(self, loaded_home_page: HomePage, page: Page) -> None:
-        """Verify right panel with ATM services info is visible."""
-        right_panel = page.locator("#rightPanel")
-        expect(right_panel).to_be_visible()
-
-    def test_atm_services_heading(self, loaded_home_page: HomePage, page: Page) -> None:
-        """Verify content is visible in right panel."""
-        # Right panel may have different content, just check it exists and has content
-        right_panel = page.locator("#rightPanel")
-        expect(right_panel).to_be_visible()
-        # Check that right panel has some text content
-        expect(right_panel).not_to_be_empty()
-
-    def test_footer_visible(self, loaded_home_page: HomePage, page: Page) -> None:
-        """Verify footer is visible."""
-        footer = page.locator("#footerPanel")
-        expect(footer).to_be_visible()
-
-    def test_footer_links_visible(self, loaded_home_page: HomePage, page: Page) -> None:
-        """Verify footer links are visible."""
-        # Check for common footer links
-        footer_links = page.locator("#footerPanel a")
-        expect(footer_links.first).to_be_visible()
-
-    def test_page_loads_successfully(
-        self, loaded_home_page: HomePage, page: Page, base_url: str
+# Read-only checks: one page load and one batched evaluation cover the whole list
+HOME_PAGE_CHECKS = [
+    DomExpectation("home_page_title", "title", expected="ParaBank | Welcome | Online Banking"),
+    DomExpectation("login_panel_visible", "visible", "#loginPanel"),
+    DomExpectation("username_field_visible", "visible", 'input[name="username"]'),
+    DomExpectation("username_field_enabled", "enabled", 'input[name="username"]'),
+    DomExpectation("username_field_editable", "editable", 'input[name="username"]'),
+    DomExpectation("password_field_visible", "visible", 'input[name="password"]'),
+    DomExpectation("password_field_enabled", "enabled", 'input[name="password"]'),
+    DomExpectation("password_field_editable", "editable", 'input[name="password"]'),
+    DomExpectation(
+        "password_field_type", "attribute", 'input[name="password"]', "password", "type"
+    ),
+    DomExpectation("login_button_visible", "visible", 'input[value="Log In"]'),
+    DomExpectation("login_button_enabled", "enabled", 'input[value="Log In"]'),
+    DomExpectation("login_button_type", "attribute", 'input[value="Log In"]', "submit", "type"),
+    DomExpectation("forgot_login_link_visible", "visible", FORGOT_LOGIN_LINK),
+    DomExpectation("forgot_login_link_text", "text", FORGOT_LOGIN_LINK, "Forgot login info?"),
+    DomExpectation("register_link_visible", "visible", REGISTER_LINK),
+    DomExpectation("register_link_text", "text", REGISTER_LINK, "Register"),
+    DomExpectation("parabank_logo_visible", "visible", ".logo"),
+    # Admin logo is an image with class 'admin'
+    DomExpectation("admin_logo_visible", "visible", "img.admin"),
+    # Navigation links use lowercase text
+    DomExpectation("home_link_in_navigation", "visible", "ul.button li.home a"),
+    DomExpectation(
+        "about_us_link_in_navigation", "visible", "#headerPanel a[href*='about']", first=True
+    ),
+    DomExpectation(
+        "about_us_link_text",
+        "contains_text",
+        "#headerPanel a[href*='about']",
+        "About",
+        first=True,
+    ),
+    DomExpectation("contact_link_in_navigation", "visible", "li.contact a"),
+    DomExpectation("contact_link_text", "contains_text", "li.contact a", "contact"),
+    # Login heading is an h2 element inside leftPanel
+    DomExpectation("customer_login_heading", "visible", "#leftPanel h2", has_text="Customer Login"),
+    # Labels are <p><b>Username</b></p>; strict, so exactly one label paragraph must match
+    DomExpectation("username_label", "visible", "#loginPanel p", has_text="Username"),
+    DomExpectation("password_label", "visible", "#loginPanel p", has_text="Password"),
+    DomExpectation("right_panel_visible", "visible", "#rightPanel"),
+    # Right panel content varies; it only has to have some
+    DomExpectation("right_panel_has_content", "not_empty", "#rightPanel"),
+    DomExpectation("footer_visible", "visible", "#footerPanel"),
+    DomExpectation("footer_links_visible", "visible", "#footerPanel a", first=True),
+    DomExpectation("page_loads_successfully", "url", expected="{base_url}.*"),
+]
+
+
+@pytest.fixture(scope="class")
+def home_page_checks(
+    class_page: Callable[..., ContextManager[Page]], base_url: str, request: pytest.FixtureRequest
+) -> DomAssertionBatch:
+    """Load the home page once and evaluate every static check in one batch.
+
+    Reruns of the checks would only re-read this batch, so with ``--reruns`` a batch
+    with failures is loaded once more instead, as the first retry.
+    """
+    batch = DomAssertionBatch(HOME_PAGE_CHECKS)
+
+    def _failed() -> bool:
+        return not all(result.passed for result in batch.results.values())
+
+    attempts = 2 if request.config.getoption("reruns", 0) else 1
+    for attempt in range(1, attempts + 1):
+        with class_page(attempt, failed=_failed) as page:
+            HomePage(page).load(base_url)
+            page.locator("#loginPanel").wait_for(state="visible", timeout=15000)
+            batch.run(page, base_url=base_url)
+        if not _failed():
+            break
+    return batch
+
+
+class TestHomePageStaticElements:
+    """Visibility, text and attribute checks of the home page, one outcome per check."""
+
+    @pytest.mark.parametrize("check", HOME_PAGE_CHECKS, ids=lambda check: check.name)
+    def test_home_page_element(
+        self, check: DomExpectation, home_page_checks: DomAssertionBatch
     ) -> None:
-        """Verify home page loads without errors."""
-        # Check that we're on a page within the base URL
-        expect(page).to_have_url(re.compile(f"{re.escape(base_url)}.*"))
+        home_page_checks.assert_passed(check.name)
+
+
+class TestHomePageUIElements:
+    """Interactive home page checks that need a browser page of their own."""
 
     def test_login_form_can_accept_input(self, loaded_home_page: HomePage) -> None:
         """Verify login form fields can accept user input."""
@@ -161,41 +133,39 @@ class TestHomePageUIElements:
         loaded_home_page.password_text.fill("testpass")
         expect(loaded_home_page.password_text).to_have_value("testpass")
 
-    def test_register_link_navigation(
-        self, loaded_home_page: HomePage, page: Page, base_url: str
-    ) -> None:
+
+@pytest.mark.browserless
+class TestHomePageLinks:
+    """Home page links to server-rendered pages, followed without a browser."""
+
+    def test_register_link_navigation(self, static_page: StaticPage, base_url: str) -> None:
         """Verify clicking 'Register' link navigates to registration page."""
-        register_link = page.locator("#loginPanel a[href*='register']")
-        register_link.click()
+        static_page.goto(base_url)
+        static_page.locator(REGISTER_LINK).click()
 
-        expect(page).to_have_url(f"{base_url}/register.htm")
-        expect(page.locator("h1.title").first).to_have_text("Signing up is easy!")
+        assert_url(static_page, f"{base_url}/register.htm")
+        assert_text(static_page.locator("h1.title").first, "Signing up is easy!")
 
-    def test_about_us_link_navigation(
-        self, loaded_home_page: HomePage, page: Page, base_url: str
-    ) -> None:
+    def test_about_us_link_navigation(self, static_page: StaticPage, base_url: str) -> None:
         """Verify clicking 'About Us' link navigates to about page."""
-        about_link = page.locator("#headerPanel a[href*='about']").first
-        about_link.click()
+        static_page.goto(base_url)
+        static_page.locator("#headerPanel a[href*='about']").first.click()
 
-        expect(page).to_have_url(f"{base_url}/about.htm")
+        assert_url(static_page, f"{base_url}/about.htm")
 
-    def test_contact_link_navigation(
-        self, loaded_home_page: HomePage, page: Page, base_url: str
-    ) -> None:
+    def test_contact_link_navigation(self, static_page: StaticPage, base_url: str) -> None:
         """Verify clicking 'Contact' link navigates to contact page."""
-        loaded_home_page.contact_link.click()
+        static_page.goto(base_url)
+        static_page.locator("li.contact a").click()
 
-        expect(page).to_have_url(f"{base_url}/contact.htm")
-        expect(page.locator("h1.title").first).to_have_text("Customer Care")
+        assert_url(static_page, f"{base_url}/contact.htm")
+        assert_text(static_page.locator("h1.title").first, "Customer Care")
 
-    def test_home_link_navigation(
-        self, loaded_home_page: HomePage, page: Page, base_url: str
-    ) -> None:
+    def test_home_link_navigation(self, static_page: StaticPage, base_url: str) -> None:
         """Verify clicking 'Home' link stays on home page."""
+        static_page.goto(base_url)
         # Navigation links use lowercase text
-        home_link = page.locator("ul.button li.home a")
-        home_link.click()
+        static_page.locator("ul.button li.home a").click()
 
         # Should navigate to index page - use raw string for regex
-        expect(page).to_have_url(re.compile(rf"{re.escape(base_url)}/?(index\.htm)?$"))
+        assert_url(static_page, re.compile(rf"{re.escape(base_url)}/?(index\.htm)?$"))
@@ -9,7 +9,7 @@ from tests.pages.helper_pom.payment_services_tab import PaymentServicesTab
 def test_logout_successful(page: Page, payment_services_tab: PaymentServicesTab) -> None:
     """Verify that the user can log out successfully."""
     # Logout
-    payment_services_tab.log_out_link.click()
+    payment_services_tab.navigate_to("logout")
 
     # Verify we are on the login page/home page
     expect(page.locator("input[name='username']")).to_be_visible()
@@ -3,7 +3,7 @@
 import pytest
 from playwright.sync_api import Page, expect
 
-from src.utils.stability import safe_click
+from tests.api.parabank_api import SeededCustomer
 from tests.pages.helper_pom.payment_services_tab import PaymentServicesTab
 from tests.pages.open_account_page import OpenAccountPage
 
@@ -17,14 +17,14 @@ def _expected_open_account_url(base_url: str) -> str:
 
 @pytest.mark.flaky
 def test_open_checking_account(
-    user_login: None,
+    seeded_login: SeededCustomer,
     payment_services_tab: PaymentServicesTab,
     open_account_page: OpenAccountPage,
     page: Page,
     base_url: str,
 ) -> None:
     """Open a new CHECKING account from an existing account."""
-    safe_click(payment_services_tab.open_new_account_link)
+    payment_services_tab.navigate_to("open_new_account")
 
     page.wait_for_url("**/openaccount.htm", timeout=10000)
     page.wait_for_load_state("networkidle", timeout=5000)
@@ -46,14 +46,14 @@ def test_open_checking_account(
 
 @pytest.mark.flaky
 def test_open_savings_account(
-    user_login: None,
+    seeded_login: SeededCustomer,
     payment_services_tab: PaymentServicesTab,
     open_account_page: OpenAccountPage,
     page: Page,
     base_url: str,
 ) -> None:
     """Open a new SAVING/SAVINGS account from an existing account."""
-    safe_click(payment_services_tab.open_new_account_link)
+    payment_services_tab.navigate_to("open_new_account")
 
     page.wait_for_url("**/openaccount.htm", timeout=10000)
     page.wait_for_load_state("networkidle", timeout=5000)
@@ -75,12 +75,12 @@ def test_open_savings_account(
 
 @pytest.mark.flaky
 def test_open_account_type_options(
-    user_login: None,
+    seeded_login: SeededCustomer,
     payment_services_tab: PaymentServicesTab,
     open_account_page: OpenAccountPage,
 ) -> None:
     """Verify that both Checking and Savings account types are available."""
-    safe_click(payment_services_tab.open_new_account_link)
+    payment_services_tab.navigate_to("open_new_account")
     options = open_account_page.account_type_select.locator("option").all_inner_texts()
     assert "CHECKING" in [o.upper() for o in options]
     assert any("SAVING" in o.upper() for o in options)
@@ -19,7 +19,7 @@ class TestRequestLoan:
     ) -> None:
         """Verify that a loan is denied when there are insufficient funds for down payment."""
         # Navigate to Request Loan
-        payment_services_tab.request_loan_link.click()
+        payment_services_tab.navigate_to("request_loan")
 
         # Apply for a loan with a high down payment
         request_loan_page.apply_for_loan(amount="10000", down_payment="5000")
@@ -33,7 +33,7 @@ class TestRequestLoan:
     @pytest.mark.flaky
     def test_request_loan_navigation(self, payment_services_tab: PaymentServicesTab) -> None:
         """Verify navigation to the request loan page."""
-        payment_services_tab.request_loan_link.click()
+        payment_services_tab.navigate_to("request_loan", click_through=True)
         expect(payment_services_tab.page.locator("#rightPanel h1.title").first).to_have_text(
             "Apply for a Loan"
         )
@@ -45,7 +45,7 @@ class TestRequestLoan:
         payment_services_tab: PaymentServicesTab,
     ) -> None:
         """Verify validation when loan fields are empty."""
-        payment_services_tab.request_loan_link.click()
+        payment_services_tab.navigate_to("request_loan")
 
         # Click Apply without filling anything
         request_loan_page.apply_button.click()
@@ -60,7 +60,7 @@ class TestRequestLoan:
         payment_services_tab: PaymentServicesTab,
     ) -> None:
         """Verify presence of all elements in the loan request form."""
-        payment_services_tab.request_loan_link.click()
+        payment_services_tab.navigate_to("request_loan")
 
         expect(request_loan_page.amount_input).to_be_visible()
         expect(request_loan_page.down_payment_input).to_be_visible()
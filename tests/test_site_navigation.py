@@ -1,58 +1,55 @@
-"""Tests for general site navigation and footer links."""
+"""Tests for general site navigation and footer links.
+
+The header and footer links are plain anchors to server-rendered pages, so these
+run in the browserless tier and only open a browser if a query is ambiguous.
+"""
 import pytest
-from playwright.sync_api import Page, expect
 
-from tests.pages.home_login_page import HomePage
+from src.utils.http_tier import StaticPage, assert_text, assert_url
 
-pytestmark = pytest.mark.usefixtures("user_login")
+pytestmark = pytest.mark.browserless(authenticated=True)
 
 
-def test_footer_about_us_navigation(page: Page, base_url: str) -> None:
+def test_footer_about_us_navigation(static_page: StaticPage, base_url: str) -> None:
     """Verify navigation to About Us via footer link."""
-    home_page = HomePage(page)
-    home_page.load(base_url)
-    page.locator("#footerPanel").get_by_role("link", name="About Us").click()
-    expect(page.locator("h1.title")).to_have_text("ParaSoft Demo Website", timeout=10000)
+    static_page.goto(base_url)
+    static_page.locator("#footerPanel").get_by_role("link", name="About Us").click()
+    assert_text(static_page.locator("h1.title"), "ParaSoft Demo Website")
 
 
-def test_footer_services_navigation(page: Page, base_url: str) -> None:
+def test_footer_services_navigation(static_page: StaticPage, base_url: str) -> None:
     """Verify navigation to Services via footer link."""
-    home_page = HomePage(page)
-    home_page.load(base_url)
-    page.locator("#footerPanel").get_by_role("link", name="Services").last.click()
-    expect(page.locator("span.heading").first).to_contain_text("services", timeout=10000)
+    static_page.goto(base_url)
+    static_page.locator("#footerPanel").get_by_role("link", name="Services").last.click()
+    assert_text(static_page.locator("span.heading").first, "services", contains=True)
 
 
-def test_home_page_logo_navigation(page: Page, base_url: str) -> None:
+def test_home_page_logo_navigation(static_page: StaticPage, base_url: str) -> None:
     """Verify that clicking the logo returns to the home page."""
-    home_page = HomePage(page)
-    home_page.load(base_url)
+    static_page.goto(base_url)
     # Go to about us first
-    page.locator("ul.leftmenu").get_by_role("link", name="About Us").click()
+    static_page.locator("ul.leftmenu").get_by_role("link", name="About Us").click()
     # Click logo
-    page.locator("img[title='ParaBank']").click()
-    expect(page).to_have_url(f"{base_url.rstrip('/')}/index.htm", timeout=10000)
+    static_page.locator("img[title='ParaBank']").click()
+    assert_url(static_page, f"{base_url.rstrip('/')}/index.htm")
 
 
-def test_header_home_link(page: Page, base_url: str) -> None:
+def test_header_home_link(static_page: StaticPage, base_url: str) -> None:
     """Verify the 'home' icon link in the header."""
-    home_page = HomePage(page)
-    home_page.load(base_url)
-    page.locator("ul.button").get_by_role("link", name="home").click()
-    expect(page).to_have_url(f"{base_url.rstrip('/')}/index.htm", timeout=10000)
+    static_page.goto(base_url)
+    static_page.locator("ul.button").get_by_role("link", name="home").click()
+    assert_url(static_page, f"{base_url.rstrip('/')}/index.htm")
 
 
-def test_header_contact_link(page: Page, base_url: str) -> None:
+def test_header_contact_link(static_page: StaticPage, base_url: str) -> None:
     """Verify the 'contact' icon link in the header."""
-    home_page = HomePage(page)
-    home_page.load(base_url)
-    page.locator("ul.button").get_by_role("link", name="contact").click()
-    expect(page.locator("h1.title")).to_have_text("Customer Care", timeout=10000)
+    static_page.goto(base_url)
+    static_page.locator("ul.button").get_by_role("link", name="contact").click()
+    assert_text(static_page.locator("h1.title"), "Customer Care")
 
 
-def test_header_about_link(page: Page, base_url: str) -> None:
+def test_header_about_link(static_page: StaticPage, base_url: str) -> None:
     """Verify the 'about' icon link in the header."""
-    home_page = HomePage(page)
-    home_page.load(base_url)
-    page.locator("ul.button").get_by_role("link", name="about").click()
-    expect(page.locator("h1.title")).to_have_text("ParaSoft Demo Website", timeout=10000)
+    static_page.goto(base_url)
+    static_page.locator("ul.button").get_by_role("link", name="about").click()
+    assert_text(static_page.locator("h1.title"), "ParaSoft Demo Website")
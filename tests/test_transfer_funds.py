@@ -1,12 +1,12 @@
 """Test transfer funds functionality."""
 
 import logging
-import re
 
 import pytest
 from playwright.sync_api import Page, expect
 
-from src.utils.stability import safe_click
+from tests.api.parabank_api import SeededCustomer
+from tests.pages.helper_pom.payment_services_tab import PaymentServicesTab
 from tests.pages.transfer_funds_page import TransferFundsPage
 
 logger = logging.getLogger("parabank")
@@ -14,44 +14,34 @@ logger = logging.getLogger("parabank")
 
 @pytest.mark.flaky
 def test_transfer_funds_success(
-    user_login: None,
-    payment_services_tab: object,
+    seeded_account: int,
+    seeded_login: SeededCustomer,
+    payment_services_tab: PaymentServicesTab,
     page: Page,
-    base_url: str,
 ) -> None:
-    safe_click(payment_services_tab.transfer_funds_link)
+    """Transfer between the two accounts of a freshly seeded customer."""
+    from_account = str(seeded_login.account_ids[0])
+    to_account = str(seeded_account)
+    payment_services_tab.navigate_to("transfer_funds")
     page.wait_for_url("**/transfer.htm")
 
     transfer_page = TransferFundsPage(page)
-    page.wait_for_selector("input#amount")
-
-    transfer_page.amount_input.fill("100.00")
-
-    # Wait for options to be populated with numeric account IDs
-    expect(transfer_page.from_account_select.locator("option").first).to_contain_text(
-        re.compile(r"\d+")
-    )
-    transfer_page.from_account_select.select_option(index=0)
-
-    expect(transfer_page.to_account_select.locator("option").first).to_contain_text(
-        re.compile(r"\d+")
-    )
-    transfer_page.to_account_select.select_option(index=0)
-
-    transfer_page.transfer_button.click()
+    transfer_page.submit_transfer("100.00", from_account, to_account)
 
     transfer_page.verify_success()
     expect(page.locator("h1.title:visible")).not_to_have_text("Transfer Funds")
+    expect(page.locator("#fromAccountIdResult")).to_have_text(from_account)
+    expect(page.locator("#toAccountIdResult")).to_have_text(to_account)
 
 
 @pytest.mark.flaky
 def test_transfer_funds_empty_amount(
-    user_login: None,
-    payment_services_tab: object,
+    seeded_login: SeededCustomer,
+    payment_services_tab: PaymentServicesTab,
     page: Page,
 ) -> None:
     """Test fund transfer with an empty amount."""
-    payment_services_tab.transfer_funds_link.click()
+    payment_services_tab.navigate_to("transfer_funds")
     transfer_page = TransferFundsPage(page)
     page.wait_for_selector("input#amount")
 
@@ -64,12 +54,12 @@ def test_transfer_funds_empty_amount(
 
 @pytest.mark.flaky
 def test_transfer_funds_navigation_and_fields(
-    user_login: None,
-    payment_services_tab: object,
+    seeded_login: SeededCustomer,
+    payment_services_tab: PaymentServicesTab,
     page: Page,
 ) -> None:
     """Test navigation to transfer funds and presence of necessary fields."""
-    safe_click(payment_services_tab.transfer_funds_link)
+    payment_services_tab.navigate_to("transfer_funds", click_through=True)
     transfer_page = TransferFundsPage(page)
 
     expect(transfer_page.amount_input).to_be_visible()
@@ -0,0 +1,116 @@
+import time
+from pathlib import Path
+
+import pytest
+
+from src.utils.stability import CircuitBreaker, EnvironmentBlockedException
+
+BASE_URL = "http://127.0.0.1/parabank"
+
+
+def trip(breaker: CircuitBreaker) -> None:
+    for _ in range(CircuitBreaker.THRESHOLD):
+        breaker.record(f"{BASE_URL}/overview.htm", 500, BASE_URL)
+
+
+def test_opens_on_failure_rate_only() -> None:
+    """The breaker needs THRESHOLD failures that are also FAILURE_RATE of the window."""
+    breaker = CircuitBreaker()
+    for _ in range(7):
+        breaker.record(f"{BASE_URL}/overview.htm", 200, BASE_URL)
+    for _ in range(3):
+        breaker.record(f"{BASE_URL}/overview.htm", 500, BASE_URL)
+    # 3 of 10 is below the rate, and other hosts and 4xx responses do not count
+    breaker.record("https://cdn.example.com/lib.js", 500, BASE_URL)
+    breaker.record(f"{BASE_URL}/login.htm", 404, BASE_URL)
+    assert breaker.state == "closed"
+
+    breaker.record(f"{BASE_URL}/overview.htm", 429, BASE_URL)
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert breaker.stats()["trips"] == 1
+
+
+def test_successful_probe_closes_and_clears_window(monkeypatch: pytest.MonkeyPatch) -> None:
+    """After the cooldown one probe moves open -> half-open -> closed."""
+    breaker = CircuitBreaker(cooldown=0.0)
+    probed = []
+
+    def probe() -> bool:
+        probed.append(breaker.state)
+        return True
+
+    monkeypatch.setattr(breaker, "_probe", probe)
+    trip(breaker)
+
+    breaker.wait_until_closed()
+
+    assert probed == ["half-open"]
+    assert breaker.state == "closed"
+    # The old failures are gone: one more failure does not reopen it
+    breaker.record_failure()
+    assert breaker.state == "closed"
+
+
+def test_failed_probe_reopens_with_doubled_cooldown(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A failed probe reopens the breaker for twice the previous cooldown."""
+    breaker = CircuitBreaker(cooldown=0.05)
+    outcomes = iter([False, True])
+    monkeypatch.setattr(breaker, "_probe", lambda: next(outcomes))
+    cooldowns = []
+    run_probe = breaker._run_probe
+
+    def recording_probe() -> None:
+        run_probe()
+        with breaker._shared.locked() as shared:
+            cooldowns.append((shared["state"], shared["cooldown"]))
+
+    monkeypatch.setattr(breaker, "_run_probe", recording_probe)
+    trip(breaker)
+
+    waited = breaker.wait_until_closed()
+
+    assert cooldowns == [(CircuitBreaker.OPEN, 0.1), (CircuitBreaker.CLOSED, 0.1)]
+    assert breaker.stats()["trips"] == 2
+    assert waited >= 0.1
+    assert breaker.stats()["paused_seconds"] == pytest.approx(waited)
+
+
+def test_state_is_shared_through_the_state_file(tmp_path: Path) -> None:
+    """Breakers on one file (one per worker) see each other's trips; fresh clears it."""
+    path = tmp_path / "circuit_breaker.bin"
+    controller = CircuitBreaker(path, fresh=True)
+    worker = CircuitBreaker(path)
+    trip(worker)
+    assert controller.state == "open"
+
+    assert CircuitBreaker(path, fresh=True).state == "closed"
+    assert worker.state == "closed"
+
+
+def test_lost_half_open_probe_is_retaken(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """A probe whose worker died is taken over once PROBE_TIMEOUT_SECONDS pass."""
+    path = tmp_path / "circuit_breaker.bin"
+    lost = CircuitBreaker(path, fresh=True)
+    trip(lost)
+    with lost._shared.locked() as shared:
+        shared.update(
+            state=CircuitBreaker.HALF_OPEN,
+            probe_started=time.time() - CircuitBreaker.PROBE_TIMEOUT_SECONDS - 1,
+        )
+
+    survivor = CircuitBreaker(path)
+    monkeypatch.setattr(survivor, "_probe", lambda: True)
+    survivor.wait_until_closed()
+    assert lost.state == "closed"
+
+
+def test_blocks_no_longer_than_max_wait() -> None:
+    """A breaker that stays open past ``max_wait`` fails the waiting test."""
+    breaker = CircuitBreaker(cooldown=60.0, max_wait=0.1)
+    trip(breaker)
+
+    with pytest.raises(EnvironmentBlockedException):
+        breaker.wait_until_closed()
+    assert breaker.state == "open"
+    assert breaker.stats()["paused_seconds"] > 0.1
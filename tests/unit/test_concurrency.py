@@ -0,0 +1,107 @@
+import os
+import subprocess  # nosec B404 - only used to get the pid of an exited process
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.utils.concurrency import _HOLDER, AdaptiveConcurrency
+
+URL = "http://127.0.0.1/parabank/overview.htm"
+
+
+def healthy(controller: AdaptiveConcurrency, responses: int, latency_ms: float = 100.0) -> None:
+    for _ in range(responses):
+        controller.observe(URL, 200, latency_ms)
+
+
+def test_starts_halfway_between_bounds() -> None:
+    """The limit starts at half the maximum and never below the minimum."""
+    assert AdaptiveConcurrency(max_limit=8).limit == 4
+    assert AdaptiveConcurrency(max_limit=5).limit == 3
+    assert AdaptiveConcurrency(max_limit=8, min_limit=6).limit == 6
+
+
+def test_additive_increase_up_to_max() -> None:
+    """Every ADJUST_EVERY fast, healthy responses raise the limit by one."""
+    controller = AdaptiveConcurrency(max_limit=6)
+    healthy(controller, AdaptiveConcurrency.ADJUST_EVERY - 1)
+    assert controller.limit == 3
+    healthy(controller, 1)
+    assert controller.limit == 4
+
+    healthy(controller, AdaptiveConcurrency.ADJUST_EVERY * 5)
+    assert controller.limit == 6
+    assert controller.stats()["increases"] == 3
+    assert controller.stats()["peak"] == 6
+
+
+def test_error_halves_limit_once_per_holdoff(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A 5xx or 429 halves the limit; a burst inside the holdoff counts once."""
+    clock = [1000.0]
+    monkeypatch.setattr("src.utils.concurrency.time.time", lambda: clock[0])
+    controller = AdaptiveConcurrency(max_limit=16, min_limit=2)
+    assert controller.limit == 8
+
+    controller.observe(URL, 500, 100.0)
+    controller.observe(URL, 429, 100.0)
+    controller.observe(URL, 503, 100.0)
+    assert controller.limit == 4
+
+    clock[0] += AdaptiveConcurrency.DECREASE_HOLDOFF_SECONDS
+    controller.observe(URL, 500, 100.0)
+    assert controller.limit == 2
+
+    clock[0] += AdaptiveConcurrency.DECREASE_HOLDOFF_SECONDS
+    controller.observe(URL, 500, 100.0)
+    assert controller.limit == 2
+    assert controller.stats() == {
+        "limit": 2,
+        "peak": 8,
+        "lowest": 2,
+        "increases": 0,
+        "decreases": 3,
+        "waited_seconds": 0.0,
+    }
+
+
+def test_slow_p95_trims_limit_by_a_fifth() -> None:
+    """A window whose p95 exceeds the target cuts the limit by LATENCY_DECREASE."""
+    controller = AdaptiveConcurrency(max_limit=20, p95_target_ms=500.0)
+    healthy(controller, AdaptiveConcurrency.ADJUST_EVERY, latency_ms=800.0)
+    assert controller.limit == 8
+    assert controller.stats()["decreases"] == 1
+
+
+def test_tokens_are_reentrant_and_released() -> None:
+    """A process holds at most one token and returns it on release."""
+    controller = AdaptiveConcurrency(max_limit=1)
+    assert controller.acquire() < 1.0
+    # Already holding the only token: no second slot, no wait
+    assert controller.acquire() == 0.0
+    with controller._shared.locked() as shared:
+        assert len(controller._holders(shared)) == 1
+    controller.release()
+    with controller._shared.locked() as shared:
+        assert controller._holders(shared) == {}
+
+
+def test_token_of_exited_worker_is_reclaimed(tmp_path: Path) -> None:
+    """A token left behind by a dead worker is freed for the next test."""
+    exited = subprocess.run(  # nosec B603 - runs this interpreter
+        [sys.executable, "-c", "import os; print(os.getpid())"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    dead_pid = int(exited.stdout)
+    path = tmp_path / "concurrency.state"
+    controller = AdaptiveConcurrency(max_limit=1, state_path=path, fresh=True)
+    with controller._shared.locked() as shared:
+        _HOLDER.pack_into(shared["payload"], controller._holder_offset(0), dead_pid, 0.0)
+
+    controller.acquire()
+
+    with AdaptiveConcurrency(max_limit=1, state_path=path)._shared.locked() as shared:
+        holders = controller._holders(shared)
+    assert [pid for pid, _ in holders.values()] == [os.getpid()]
@@ -0,0 +1,184 @@
+import re
+from typing import Any, Dict, List, Tuple
+
+import pytest
+from urllib3 import HTTPResponse
+from urllib3._collections import HTTPHeaderDict
+
+from src.utils.http_tier import (
+    AmbiguousQueryError,
+    HtmlPage,
+    accessible_name,
+    assert_text,
+    assert_url,
+    parse_html,
+    select,
+)
+
+BASE_URL = "http://127.0.0.1/parabank"
+
+HOME = """
+<html><head><title> ParaBank | Welcome </title><script>var x = "<p>";</script></head>
+<body>
+  <div id="headerPanel">
+    <ul class="leftmenu">
+      <li class="Solutions">Solutions</li>
+      <li><a href="about.htm">About Us</a></li>
+      <li><a href="services.htm" target="_blank">Services</a></li>
+    </ul>
+    <ul class="button">
+      <li class="home"><a href="index.htm">home</a></li>
+      <li class="contact"><a href="contact.htm" onclick="track()">contact</a></li>
+    </ul>
+  </div>
+  <div id="loginPanel">
+    <p><b>Username</b></p><input type="text" name="username" class="input">
+    <p><b>Password</b><p><input type="password" name="password" class="input"/>
+    <input type="submit" class="button" value="Log In">
+    <a href="#" id="js-link">Forgot?</a>
+    <img src="logo.gif" alt="ParaBank logo">
+    <h2 hidden>Hidden heading</h2>
+  </div>
+</body></html>
+"""
+
+
+class FakePool:
+    """Serves canned responses by URL and records the requests made."""
+
+    def __init__(self, pages: Dict[str, Tuple[int, Dict[str, Any], str]]) -> None:
+        self.pages = pages
+        self.sent: List[Tuple[str, Dict[str, str]]] = []
+
+    def request(self, method: str, url: str, headers: Dict[str, str], **_: Any) -> HTTPResponse:
+        self.sent.append((url, headers))
+        status, response_headers, body = self.pages[url]
+        header_dict = HTTPHeaderDict()
+        for name, value in response_headers.items():
+            for item in value if isinstance(value, list) else [value]:
+                header_dict.add(name, item)
+        return HTTPResponse(body=body.encode(), headers=header_dict, status=status)
+
+
+@pytest.fixture
+def root() -> Any:
+    return parse_html(HOME)
+
+
+def texts(elements: List[Any]) -> List[str]:
+    return [el.text().strip() for el in elements]
+
+
+@pytest.mark.parametrize(
+    "selector, expected",
+    [
+        ("ul.leftmenu a", ["About Us", "Services"]),
+        ("#headerPanel > ul > li.home", ["home"]),
+        ("#headerPanel > li", []),
+        ("a[href$='.htm']", ["About Us", "Services", "home", "contact"]),
+        ("a[href^=contact]", ["contact"]),
+        ('a[href*="vice"]', ["Services"]),
+        ("ul.button li:first-child, ul.leftmenu li:last-child", ["Services", "home"]),
+        ("ul.leftmenu li:nth-child(2)", ["About Us"]),
+        ("[class~=Solutions]", ["Solutions"]),
+    ],
+)
+def test_css_selectors(root: Any, selector: str, expected: List[str]) -> None:
+    """The supported selector subset matches like ``querySelectorAll``."""
+    assert texts(select(root, selector)) == expected
+
+
+@pytest.mark.parametrize("selector", ["a:hover", "ul ~ p", "> a", "a,", "a >", "p:has(b)"])
+def test_unsupported_selectors_are_ambiguous(root: Any, selector: str) -> None:
+    """Anything outside the subset is left to the browser."""
+    with pytest.raises(AmbiguousQueryError):
+        select(root, selector)
+
+
+def test_lenient_parsing_and_rendered_text(root: Any) -> None:
+    """Unclosed and void elements nest like a browser; script text is not rendered."""
+    panel = select(root, "#loginPanel")[0]
+    assert [el.tag for el in select(panel, "p")] == ["p", "p", "p"]
+    assert select(panel, "input")[0].children == []
+    head = select(root, "head")[0]
+    assert '"<p>"' in head.text()
+    assert head.text(rendered=True).strip() == "ParaBank | Welcome"
+
+
+def test_roles_and_accessible_names(root: Any) -> None:
+    """Implicit roles and names come from content, ``alt``, ``value`` and ``aria-label``."""
+    button = select(root, "input[type=submit]")[0]
+    image = select(root, "img")[0]
+    link = select(root, "li.home a")[0]
+    assert accessible_name(button) == "Log In"
+    assert accessible_name(image) == "ParaBank logo"
+    assert accessible_name(link) == "home"
+
+    page = HtmlPage(FakePool({}))  # type: ignore[arg-type]
+    page._root = root
+    assert page.get_by_role("button", name="log in").count() == 1
+    assert page.get_by_role("button", name="log in", exact=True).count() == 0
+    assert page.get_by_role("link", name=re.compile("^(home|contact)$")).count() == 2
+    assert page.get_by_role("heading").count() == 0
+    assert page.get_by_role("textbox").count() == 2
+    with pytest.raises(AmbiguousQueryError):
+        page.get_by_role("checkbox").count()
+
+
+def test_single_element_calls_need_exactly_one_match() -> None:
+    """Strict-mode calls with zero or several matches fall back to the browser."""
+    page = HtmlPage(FakePool({BASE_URL: (200, {}, HOME)}))  # type: ignore[arg-type]
+    page.goto(BASE_URL)
+    links = page.locator("#headerPanel").locator("a")
+    assert links.count() == 4
+    assert links.first.text_content() == "About Us"
+    assert links.last.get_attribute("href") == "contact.htm"
+    assert links.filter(has_text="serv").inner_text() == "Services"
+    assert links.nth(9).count() == 0
+    with pytest.raises(AmbiguousQueryError):
+        links.text_content()
+    with pytest.raises(AmbiguousQueryError):
+        links.nth(9).get_attribute("href")
+    with pytest.raises(AmbiguousQueryError):
+        links.first.is_visible()
+
+
+def test_goto_follows_redirects_and_keeps_cookies() -> None:
+    """Redirects are followed, cookies are sent back, and relative URLs resolve."""
+    pool = FakePool(
+        {
+            f"{BASE_URL}/": (
+                302,
+                {"Location": "index.htm", "Set-Cookie": "JSESSIONID=abc; Path=/parabank"},
+                "",
+            ),
+            f"{BASE_URL}/index.htm": (200, {}, HOME),
+            f"{BASE_URL}/about.htm": (200, {}, "<title>About</title><h1>About Us</h1>"),
+        }
+    )
+    page = HtmlPage(pool, cookies={"theme": "dark"})  # type: ignore[arg-type]
+    page.goto(f"{BASE_URL}/")
+
+    assert page.url == f"{BASE_URL}/index.htm"
+    assert page.status == 200
+    assert page.title() == "ParaBank | Welcome"
+    assert pool.sent[1][1]["Cookie"] == "theme=dark; JSESSIONID=abc"
+
+    page.get_by_role("link", name="About Us").click()
+    assert_url(page, f"{BASE_URL}/about.htm")
+    assert_text(page.locator("h1"), "About Us")
+    assert_text(page.get_by_role("heading"), "About", contains=True)
+    with pytest.raises(AssertionError):
+        assert_text(page.locator("h1"), "About")
+    assert page.requests == 3
+
+
+@pytest.mark.parametrize(
+    "selector", ["a[target=_blank]", "li.contact a", "#js-link", "li.Solutions"]
+)
+def test_only_plain_links_are_clicked(selector: str) -> None:
+    """New windows, scripted handlers, fragment links and non-links are ambiguous."""
+    page = HtmlPage(FakePool({BASE_URL: (200, {}, HOME)}))  # type: ignore[arg-type]
+    page.goto(BASE_URL)
+    with pytest.raises(AmbiguousQueryError):
+        page.locator(selector).click()
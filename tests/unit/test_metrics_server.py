@@ -0,0 +1,86 @@
+import json
+from typing import Tuple
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram
+
+from src.utils.metrics_server import MetricDeltaTracker, MetricsAggregator
+
+
+class Worker:
+    """One xdist worker's registry and the tracker that reports it."""
+
+    def __init__(self) -> None:
+        self.registry = CollectorRegistry()
+        self.tests = Counter(
+            "tests_total", "Tests run", ["status"], registry=self.registry
+        )
+        self.active = Gauge("active_browsers", "Open browsers", registry=self.registry)
+        self.duration = Histogram(
+            "test_duration_seconds", "Test duration", buckets=(1, 5), registry=self.registry
+        )
+        self.tracker = MetricDeltaTracker(self.registry)
+
+
+def aggregated() -> Tuple[MetricsAggregator, CollectorRegistry]:
+    aggregator = MetricsAggregator()
+    served = CollectorRegistry()
+    served.register(aggregator)
+    return aggregator, served
+
+
+def test_unchanged_registry_sends_nothing() -> None:
+    """After the first report only changed samples are sent; no change is an empty delta."""
+    worker = Worker()
+    worker.tests.labels("passed").inc()
+    first = worker.tracker.delta()
+    assert set(first["families"]) == {"tests", "active_browsers", "test_duration_seconds"}
+    assert worker.tracker.delta() == {}
+
+    worker.tests.labels("passed").inc(2)
+    second = worker.tracker.delta()
+    assert second == {
+        "families": {},
+        "counters": [["tests", "tests_total", [("status", "passed")], 2.0]],
+        "gauges": [],
+    }
+    # Deltas travel through execnet, which only ships builtin types
+    json.dumps(first)
+
+
+def test_counters_and_histograms_are_summed_across_workers() -> None:
+    """Increases from every worker add up, however the reports interleave."""
+    aggregator, served = aggregated()
+    gw0, gw1 = Worker(), Worker()
+    gw0.tests.labels("passed").inc()
+    gw0.duration.observe(0.5)
+    aggregator.apply("gw0", gw0.tracker.delta())
+    gw1.tests.labels("passed").inc(3)
+    gw1.tests.labels("failed").inc()
+    gw1.duration.observe(4.0)
+    aggregator.apply("gw1", gw1.tracker.delta())
+    gw0.tests.labels("passed").inc()
+    aggregator.apply("gw0", gw0.tracker.delta())
+
+    assert served.get_sample_value("tests_total", {"status": "passed"}) == 5.0
+    assert served.get_sample_value("tests_total", {"status": "failed"}) == 1.0
+    assert served.get_sample_value("test_duration_seconds_count") == 2.0
+    assert served.get_sample_value("test_duration_seconds_bucket", {"le": "1.0"}) == 1.0
+    assert served.get_sample_value("test_duration_seconds_sum") == 4.5
+    assert served.get_sample_value("tests_created", {"status": "passed"}) is None
+    assert aggregator.deltas_applied == 3
+
+
+def test_gauges_keep_one_series_per_worker() -> None:
+    """Gauges are current values, so each worker's latest value is kept under its label."""
+    aggregator, served = aggregated()
+    gw0, gw1 = Worker(), Worker()
+    gw0.active.set(2)
+    gw1.active.set(1)
+    aggregator.apply("gw0", gw0.tracker.delta())
+    aggregator.apply("gw1", gw1.tracker.delta())
+    gw0.active.set(0)
+    aggregator.apply("gw0", gw0.tracker.delta())
+
+    assert served.get_sample_value("active_browsers", {"worker": "gw0"}) == 0.0
+    assert served.get_sample_value("active_browsers", {"worker": "gw1"}) == 1.0
+    assert served.get_sample_value("active_browsers") is None
@@ -0,0 +1,142 @@
+from typing import Any, List
+
+import pytest
+
+from src.utils import navigation
+from src.utils.navigation import (
+    ACCOUNT_MENU,
+    AUTH,
+    SELECTED_ACCOUNT,
+    Navigator,
+    NavigationError,
+    NavStep,
+    route,
+)
+
+BASE_URL = "http://127.0.0.1/parabank"
+
+
+class FakePage:
+    """Just the URL a Navigator plans from, and the loads it makes."""
+
+    def __init__(self, url: str = "about:blank") -> None:
+        self.url = url
+        self.loaded: List[str] = []
+
+    def goto(self, url: str, **_: Any) -> None:
+        self.loaded.append(url)
+        self.url = url
+
+
+@pytest.fixture(autouse=True)
+def routes(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A small site graph, registered in place of the page objects' routes."""
+    monkeypatch.setattr(navigation, "ROUTES", {})
+
+    @route("index.htm", link="ul.button li.home a")
+    class Home:
+        pass
+
+    @route("register.htm", link="#loginPanel a.register", link_on=Home)
+    class Register:
+        pass
+
+    @route("overview.htm", requires=[AUTH], link="#leftPanel a.overview", link_on=ACCOUNT_MENU)
+    class Overview:
+        pass
+
+    @route(
+        "activity.htm?id={account_id}",
+        requires=[AUTH, SELECTED_ACCOUNT],
+        link="#accountTable a",
+        link_on=Overview,
+    )
+    class Activity:
+        pass
+
+
+def steps(*pairs: str) -> List[NavStep]:
+    """``steps("goto", "Home", "index.htm", ...)`` as NavSteps."""
+    return [NavStep(*pairs[i : i + 3]) for i in range(0, len(pairs), 3)]
+
+
+def test_direct_load_is_cheapest() -> None:
+    """A page without unmet preconditions is one ``goto`` away from anywhere."""
+    navigator = Navigator(FakePage(), BASE_URL)  # type: ignore[arg-type]
+    assert navigator.plan("Register") == steps("goto", "Register", "register.htm")
+    assert navigator.plan("Activity", account_id=7) == steps(
+        "goto", "Activity", "activity.htm?id=7"
+    )
+
+
+def test_no_steps_when_already_there() -> None:
+    """The current page needs no navigation unless its parameters differ."""
+    page = FakePage(f"{BASE_URL}/activity.htm?id=7")
+    navigator = Navigator(page, BASE_URL)  # type: ignore[arg-type]
+    assert navigator.current() == "Activity"
+    assert navigator.plan("Activity", account_id=7) == []
+    assert navigator.plan("Activity", account_id=8) == steps(
+        "goto", "Activity", "activity.htm?id=8"
+    )
+    elsewhere = FakePage("https://example.com/index.htm")
+    assert Navigator(elsewhere, BASE_URL).current() is None  # type: ignore[arg-type]
+
+
+def test_missing_parameter_is_met_by_a_click() -> None:
+    """Without an ``account_id`` the account page is reached through the overview link."""
+    navigator = Navigator(FakePage(), BASE_URL)  # type: ignore[arg-type]
+    assert navigator.plan("Activity") == steps(
+        "goto", "Overview", "overview.htm", "click", "Activity", "#accountTable a"
+    )
+
+
+def test_click_through_forces_the_last_hop() -> None:
+    """With ``click_through`` the goal is entered through its link, never a deep link."""
+    home = Navigator(FakePage(f"{BASE_URL}/index.htm"), BASE_URL)  # type: ignore[arg-type]
+    assert home.plan("Register", click_through=True) == steps(
+        "click", "Register", "#loginPanel a.register"
+    )
+    assert home.plan("Home", click_through=True) == steps("click", "Home", "ul.button li.home a")
+
+    blank = Navigator(FakePage(), BASE_URL, click_through=True)  # type: ignore[arg-type]
+    assert blank.plan("Register") == steps(
+        "goto", "Home", "index.htm", "click", "Register", "#loginPanel a.register"
+    )
+
+
+def test_logged_out_session_cannot_reach_auth_pages() -> None:
+    """``authenticated=False`` rules out AUTH pages as goals and as stepping stones."""
+    navigator = Navigator(FakePage(), BASE_URL, authenticated=False)  # type: ignore[arg-type]
+    with pytest.raises(NavigationError, match="requires a logged-in session"):
+        navigator.plan("Overview")
+    assert navigator.plan("Register") == steps("goto", "Register", "register.htm")
+
+    # The account menu is only on logged-in pages, and the goal itself cannot be
+    # deep-linked when its link must be clicked
+    on_home = Navigator(FakePage(f"{BASE_URL}/index.htm"), BASE_URL)  # type: ignore[arg-type]
+    with pytest.raises(NavigationError, match="by clicking a link"):
+        on_home.plan("Overview", click_through=True)
+    on_page = FakePage(f"{BASE_URL}/activity.htm?id=1")
+    on_activity = Navigator(on_page, BASE_URL)  # type: ignore[arg-type]
+    assert on_activity.plan("Overview", click_through=True) == steps(
+        "click", "Overview", "#leftPanel a.overview"
+    )
+
+
+def test_unroutable_targets() -> None:
+    """Unknown pages and preconditions are reported, not guessed."""
+    navigator = Navigator(FakePage(), BASE_URL)  # type: ignore[arg-type]
+    with pytest.raises(NavigationError, match="does not declare a route"):
+        navigator.plan("Nowhere")
+    with pytest.raises(ValueError, match="Unknown navigation preconditions"):
+        route("x.htm", requires=["admin"])
+
+
+def test_goto_loads_the_planned_urls() -> None:
+    """``goto`` walks the plan and leaves the page on the target."""
+    page = FakePage()
+    navigator = Navigator(page, BASE_URL)  # type: ignore[arg-type]
+    taken = navigator.goto("Activity", account_id=3)
+    assert page.loaded == [f"{BASE_URL}/activity.htm?id=3"]
+    assert taken == steps("goto", "Activity", "activity.htm?id=3")
+    assert navigator.goto("Activity", account_id=3) == []
@@ -0,0 +1,63 @@
+import pytest
+
+from src.utils import stability
+from src.utils.stability import normalize_endpoint
+
+BASE_URL = "https://parabank.parasoft.com/parabank"
+
+
+@pytest.fixture(autouse=True)
+def fresh_labels(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Give every test its own set of seen endpoint labels."""
+    monkeypatch.setattr(stability, "_seen_endpoints", set())
+
+
+@pytest.mark.parametrize(
+    "url, endpoint",
+    [
+        (f"{BASE_URL}/overview.htm", "/overview.htm"),
+        (f"{BASE_URL}/activity.htm?id=13344", "/activity.htm"),
+        (
+            f"{BASE_URL}/services_proxy/bank/accounts/13344/transactions",
+            "/services_proxy/bank/accounts/{id}/transactions",
+        ),
+        (
+            f"{BASE_URL}/services_proxy/bank/accounts/13344/transactions/month/All/type/All",
+            "/services_proxy/bank/accounts/{id}/transactions/month/All/type/All",
+        ),
+        (
+            f"{BASE_URL}/services_proxy/bank/accounts/13344/transactions/amount/100.00",
+            "/services_proxy/bank/accounts/{id}/transactions/amount/{id}",
+        ),
+        (
+            f"{BASE_URL}/services_proxy/bank/transactions/onDate/12-01-2024",
+            "/services_proxy/bank/transactions/onDate/{id}",
+        ),
+        (f"{BASE_URL}/services/bank/login/john/demo", "/services/bank/login/{username}/{password}"),
+        (f"{BASE_URL}/services/bank/login", "/services/bank/login"),
+        (f"{BASE_URL}/style.CSS", "/static/*.css"),
+        (f"{BASE_URL}/images/logo.gif?v=2", "/static/*.gif"),
+        (BASE_URL, "/"),
+        (f"{BASE_URL}/", "/"),
+    ],
+)
+def test_endpoint_labels(url: str, endpoint: str) -> None:
+    """Ids, credentials, query strings and static assets are folded away."""
+    assert normalize_endpoint(url, BASE_URL) == endpoint
+
+
+def test_base_path_is_stripped_only_at_a_segment_boundary() -> None:
+    """A sibling path that merely starts with the base path keeps its prefix."""
+    sibling = "https://host/parabankx/index.htm"
+    assert normalize_endpoint(sibling, BASE_URL) == "/parabankx/index.htm"
+    assert normalize_endpoint("https://host/parabank/index.htm", f"{BASE_URL}/") == "/index.htm"
+    assert normalize_endpoint("https://host/parabank/index.htm") == "/parabank/index.htm"
+
+
+def test_labels_are_capped(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Past MAX_ENDPOINT_LABELS new endpoints report as ``other``; known ones still match."""
+    monkeypatch.setattr(stability, "MAX_ENDPOINT_LABELS", 2)
+    assert normalize_endpoint(f"{BASE_URL}/a.htm", BASE_URL) == "/a.htm"
+    assert normalize_endpoint(f"{BASE_URL}/b.htm", BASE_URL) == "/b.htm"
+    assert normalize_endpoint(f"{BASE_URL}/c.htm", BASE_URL) == "other"
+    assert normalize_endpoint(f"{BASE_URL}/a.htm?x=1", BASE_URL) == "/a.htm"
@@ -0,0 +1,136 @@
+import json
+from typing import Any, Dict, Generator, Optional, Tuple
+from urllib.parse import urlencode
+
+import pytest
+import urllib3
+
+from src.utils.parabank_emulator import INITIAL_BALANCE, ParaBankEmulator
+
+
+@pytest.fixture
+def emulator() -> Generator[ParaBankEmulator, None, None]:
+    server = ParaBankEmulator().start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def http() -> Generator[urllib3.PoolManager, None, None]:
+    with urllib3.PoolManager(retries=False) as pool:
+        yield pool
+
+
+def call(
+    http: urllib3.PoolManager,
+    method: str,
+    url: str,
+    fields: Optional[Dict[str, str]] = None,
+    body: Optional[Dict[str, Any]] = None,
+    cookie: str = "",
+) -> Tuple[int, Any, urllib3.BaseHTTPResponse]:
+    """Send one request without following redirects; JSON bodies are decoded."""
+    headers = {"Cookie": cookie} if cookie else {}
+    data = None
+    if fields is not None:
+        data = urlencode(fields)
+        headers["Content-Type"] = "application/x-www-form-urlencoded"
+    elif body is not None:
+        data = json.dumps(body)
+        headers["Content-Type"] = "application/json"
+    response = http.request(method, url, body=data, headers=headers, redirect=False)
+    text = response.data.decode("utf-8")
+    if response.headers.get("Content-Type", "").startswith("application/json"):
+        return response.status, json.loads(text), response
+    return response.status, text, response
+
+
+def new_customer(username: str) -> Dict[str, Any]:
+    return {
+        "firstName": "Ada",
+        "lastName": "Lovelace",
+        "address": {"street": "1 Analytical Way", "city": "London", "state": "LN"},
+        "phoneNumber": "555-0100",
+        "ssn": "123-45-6789",
+        "username": username,
+        "password": "secret",
+    }
+
+
+def test_context_root_and_unknown_paths(emulator: ParaBankEmulator, http: Any) -> None:
+    """The context root redirects to the home page; other paths are 404s."""
+    status, _, response = call(http, "GET", emulator.base_url)
+    assert status == 302
+    assert response.headers["Location"] == "/parabank/index.htm"
+
+    status, html, _ = call(http, "GET", f"{emulator.base_url}/index.htm")
+    assert status == 200
+    assert "<title>ParaBank | Welcome | Online Banking</title>" in html
+    assert call(http, "GET", f"{emulator.base_url}/missing.htm")[0] == 404
+    assert call(http, "GET", emulator.base_url.replace("/parabank", "/other"))[0] == 404
+
+
+def test_form_login_sets_a_session(emulator: ParaBankEmulator, http: Any) -> None:
+    """Logging in redirects to the overview and the cookie opens logged-in pages."""
+    overview = f"{emulator.base_url}/overview.htm"
+    assert "An internal error has occurred" in call(http, "GET", overview)[1]
+
+    status, _, response = call(
+        http, "POST", f"{emulator.base_url}/login.htm", {"username": "john", "password": "demo"}
+    )
+    assert status == 302
+    assert response.headers["Location"] == "/parabank/overview.htm"
+    cookie = response.headers["Set-Cookie"].split(";", 1)[0]
+    assert cookie.startswith("JSESSIONID=")
+
+    status, html, _ = call(http, "GET", overview, cookie=cookie)
+    assert status == 200
+    assert "Accounts Overview" in html
+
+    wrong = {"username": "john", "password": "nope"}
+    assert "could not be verified" in call(http, "POST", f"{emulator.base_url}/login.htm", wrong)[1]
+
+
+def test_rest_login(emulator: ParaBankEmulator, http: Any) -> None:
+    """``login/<user>/<password>`` returns the customer or a 400."""
+    status, customer, _ = call(http, "GET", f"{emulator.base_url}/services/bank/login/john/demo")
+    assert status == 200
+    assert customer["firstName"] == "John"
+    assert call(http, "GET", f"{emulator.base_url}/services/bank/login/john/x")[0] == 400
+
+
+def test_customer_creation_route(emulator: ParaBankEmulator, http: Any) -> None:
+    """Only POST creates customers; duplicates are rejected and bad ids are a 500."""
+    customers = f"{emulator.base_url}/services/bank/customers"
+    assert call(http, "GET", customers)[0] == 404
+
+    status, customer, _ = call(http, "POST", customers, body=new_customer("ada"))
+    assert status == 200
+    assert customer["address"]["city"] == "London"
+    status, accounts, _ = call(http, "GET", f"{customers}/{customer['id']}/accounts")
+    assert status == 200
+    assert [a["balance"] for a in accounts] == [INITIAL_BALANCE]
+
+    assert call(http, "POST", customers, body=new_customer("ada"))[0] == 400
+    assert call(http, "GET", f"{customers}/999999")[0] == 500
+
+
+def test_transfer_and_transaction_search(emulator: ParaBankEmulator, http: Any) -> None:
+    """A transfer moves money between accounts and is found by amount."""
+    api = f"{emulator.base_url}/services_proxy/bank"
+    customer = call(http, "POST", f"{api}/customers", body=new_customer("grace"))[1]
+    source = call(http, "GET", f"{api}/customers/{customer['id']}/accounts")[1][0]["id"]
+    query = urlencode({"customerId": customer["id"], "newAccountType": 1, "fromAccountId": source})
+    target = call(http, "POST", f"{api}/createAccount?{query}")[1]
+    assert target["type"] == "SAVINGS"
+
+    query = urlencode({"fromAccountId": source, "toAccountId": target["id"], "amount": "25.00"})
+    status, message, _ = call(http, "POST", f"{api}/transfer?{query}")
+    assert status == 200
+    assert message == (
+        f"Successfully transferred $25.00 from account #{source} to account #{target['id']}"
+    )
+
+    assert call(http, "GET", f"{api}/accounts/{target['id']}")[1]["balance"] == 125.0
+    found = call(http, "GET", f"{api}/accounts/{source}/transactions/amount/25.00")[1]
+    assert [(t["type"], t["amount"]) for t in found] == [("Debit", 25.0)]
@@ -0,0 +1,144 @@
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from src.utils.scheduling import (
+    DEFAULT_ESTIMATE_SECONDS,
+    DurationHistory,
+    LPTScheduling,
+    chunked_makespan,
+    lpt_makespan,
+    scheduling_unit,
+)
+
+
+class FakeConfig:
+    """The parts of ``pytest.Config`` xdist's ``LoadScheduling`` reads."""
+
+    def __init__(self, workers: int) -> None:
+        self.workers = workers
+
+    def getvalue(self, name: str) -> List[str]:
+        return [f"{self.workers}*popen"]
+
+    def getoption(self, name: str, default: Any = None) -> Any:
+        return None
+
+
+class FakeNode:
+    """Records the test indexes a worker is sent."""
+
+    def __init__(self, name: str) -> None:
+        self.gateway = type("Gateway", (), {"id": name})()
+        self.shutting_down = False
+        self.received: List[int] = []
+
+    def send_runtest_some(self, indices: List[int]) -> None:
+        self.received.extend(indices)
+
+    def shutdown(self) -> None:
+        self.shutting_down = True
+
+
+def make_history(tmp_path: Path, entries: Dict[str, Dict[str, float]]) -> DurationHistory:
+    path = tmp_path / "durations.json"
+    path.write_text(json.dumps(entries), encoding="utf-8")
+    return DurationHistory(path).load()
+
+
+def test_missing_or_corrupt_history_is_empty(tmp_path: Path) -> None:
+    """An absent or unparsable history file falls back to the default estimate."""
+    assert DurationHistory(tmp_path / "missing.json").load().estimate("t") is None
+
+    corrupt = tmp_path / "corrupt.json"
+    corrupt.write_text("{not json", encoding="utf-8")
+    history = DurationHistory(corrupt).load()
+    assert history.estimates(["t"]) == {"t": DEFAULT_ESTIMATE_SECONDS}
+
+
+def test_estimates_fill_unknown_tests_with_median(tmp_path: Path) -> None:
+    """Tests that never ran are predicted at the median of the known ones."""
+    history = make_history(
+        tmp_path,
+        {
+            "a": {"setup": 1.0, "call": 1.0},
+            "b": {"setup": 0.0, "call": 4.0},
+            "c": {"setup": 2.0, "call": 8.0},
+        },
+    )
+    assert history.estimates(["a", "b", "c", "new"]) == {"a": 2.0, "b": 4.0, "c": 10.0, "new": 4.0}
+
+
+def test_save_blends_runs_with_ewma(tmp_path: Path) -> None:
+    """Reruns add up within a run, and the run is averaged into the stored entry."""
+    history = make_history(tmp_path, {"a": {"setup": 2.0, "call": 10.0, "runs": 1}})
+    history.record("a", "setup", 1.0)
+    history.record("a", "call", 3.0)
+    history.record("a", "call", 3.0)
+    history.record("a", "teardown", 100.0)
+    history.record("b", "call", 5.0)
+    history.save()
+
+    saved = json.loads(history.path.read_text(encoding="utf-8"))
+    assert saved["a"] == {"setup": 1.5, "call": 8.0, "runs": 2}
+    assert saved["b"] == {"setup": 0.0, "call": 5.0, "runs": 1}
+    assert DurationHistory(history.path).load().estimate("a") == 9.5
+
+
+@pytest.mark.parametrize(
+    "nodeid, unit",
+    [
+        ("tests/test_a.py::test_one", "tests/test_a.py::test_one"),
+        ("tests/test_a.py::TestLinks::test_one", "tests/test_a.py::TestLinks"),
+        ("tests/test_a.py::TestLinks::test_one[a::b]", "tests/test_a.py::TestLinks"),
+        ("tests/test_a.py::test_one[a::b]", "tests/test_a.py::test_one[a::b]"),
+    ],
+)
+def test_scheduling_unit(nodeid: str, unit: str) -> None:
+    """Class tests are grouped by class; module-level tests stand alone."""
+    assert scheduling_unit(nodeid) == unit
+
+
+def test_lpt_beats_collection_order() -> None:
+    """Longest-first packing avoids the long tail of contiguous chunks."""
+    durations = [10.0, 9.0, 1.0, 1.0, 1.0, 1.0]
+    assert chunked_makespan(durations, 2) == 20.0
+    assert lpt_makespan(durations, 2) == 12.0
+    assert lpt_makespan([], 2) == 0.0
+    assert chunked_makespan(durations, 0) == 0.0
+
+
+def test_scheduler_sends_longest_units_first_and_keeps_classes_together(tmp_path: Path) -> None:
+    """The initial deal starts every worker on a long unit and never splits a class."""
+    collection = [
+        "tests/test_a.py::test_short",
+        "tests/test_b.py::TestLinks::test_one",
+        "tests/test_b.py::TestLinks::test_two",
+        "tests/test_c.py::test_long",
+        "tests/test_d.py::test_medium",
+    ]
+    history = make_history(
+        tmp_path,
+        {
+            collection[0]: {"setup": 0.0, "call": 1.0},
+            collection[1]: {"setup": 0.0, "call": 3.0},
+            collection[2]: {"setup": 0.0, "call": 3.0},
+            collection[3]: {"setup": 0.0, "call": 20.0},
+            collection[4]: {"setup": 0.0, "call": 4.0},
+        },
+    )
+    scheduler = LPTScheduling(FakeConfig(workers=2), history)  # type: ignore[arg-type]
+    first, second = FakeNode("gw0"), FakeNode("gw1")
+    for node in (first, second):
+        scheduler.add_node(node)
+        scheduler.add_node_collection(node, collection)
+
+    scheduler.schedule()
+
+    # Units by total: test_long (20), TestLinks (6), test_medium (4), test_short (1)
+    assert first.received == [3, 4]
+    assert second.received == [1, 2, 0]
+    assert scheduler.pending == []
+    assert first.shutting_down and second.shutting_down